@@ -0,0 +1,99 @@
+"""
+Calibrage du seuil de la cascade de sentiment face aux labels de BERT.
+
+Analyse un corpus avec BERT (référence) et avec le lexique, puis, pour
+chaque seuil de confiance candidat, affiche :
+- couverture : part des textes tranchés par le lexique (appels BERT évités)
+- accord lexique : labels identiques à BERT parmi ces textes
+- accord cascade : labels identiques à BERT sur tout le corpus
+
+Le seuil conseillé est le plus bas dont l'accord cascade atteint
+TARGET_AGREEMENT ; le reporter dans NEXIS_SENTIMENT_CASCADE_THRESHOLD.
+
+Le raccourci neutre (textes sans mot du lexique) est mesuré à part, au
+seuil conseillé : ne l'activer (NEXIS_SENTIMENT_CASCADE_NEUTRAL=1) que si
+BERT juge lui aussi ces textes neutres dans TARGET_AGREEMENT des cas.
+
+Corpus : le texte réellement envoyé à l'analyse par le scraper (description
+NewsAPI, à défaut titre, voir sentiment_text) des CORPUS_SIZE derniers
+articles des réponses NewsAPI en cache (nexis_cache.db ; nexis.db ne garde
+pas les descriptions), ou un fichier JSONL passé en argument (un objet
+{"text": ...} par ligne).
+
+Usage (depuis backend/) : python calibrate_sentiment.py [corpus.jsonl]
+"""
+import sys
+import json
+from src.services.sentiment_cascade import lexicon_score, sentiment_text
+
+CORPUS_SIZE = 500
+TARGET_AGREEMENT = 0.95
+THRESHOLDS = [round(0.05 * step, 2) for step in range(6, 21)]
+
+
+def load_corpus(path: str = None) -> list:
+    if path:
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line)["text"] for line in f if line.strip()]
+
+    from src.services.news_api_service import CACHE_MAX_ENTRIES, CACHE_TTL
+    from src.services.disk_cache import DiskCache
+    texts = {}
+    for response in DiskCache("newsapi", ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES).values():
+        for art_data in response:
+            # Un même article revient dans plusieurs recherches : une fois par URL
+            text = sentiment_text(art_data)
+            if text and len(texts) < CORPUS_SIZE:
+                texts.setdefault(art_data.get('url') or text, text)
+    return list(texts.values())
+
+
+def calibrate(texts: list, reference: list) -> list:
+    """Une ligne (seuil, couverture, accord lexique, accord cascade) par seuil"""
+    lexicon = [lexicon_score(text, neutral_shortcut=False) for text in texts]
+    rows = []
+    for threshold in THRESHOLDS:
+        covered = [i for i, (_, _, confidence) in enumerate(lexicon) if confidence >= threshold]
+        agree = sum(lexicon[i][1] == reference[i] for i in covered)
+        # Hors couverture, la cascade renvoie le label de BERT lui-même
+        overall = (agree + len(texts) - len(covered)) / len(texts)
+        rows.append((threshold, len(covered) / len(texts), agree / len(covered) if covered else 1.0, overall))
+    return rows
+
+
+def neutral_shortcut(texts: list, reference: list, threshold: float) -> tuple:
+    """(textes tranchés en plus par le raccourci neutre, part jugée neutre par BERT)"""
+    extra = [
+        i for i, text in enumerate(texts)
+        if lexicon_score(text, neutral_shortcut=True)[2] >= threshold
+        > lexicon_score(text, neutral_shortcut=False)[2]
+    ]
+    agree = sum(reference[i] == "neutre" for i in extra)
+    return len(extra), agree / len(extra) if extra else 1.0
+
+
+if __name__ == "__main__":
+    texts = load_corpus(sys.argv[1] if len(sys.argv) > 1 else None)
+    if not texts:
+        print("❌ Corpus vide (aucune réponse NewsAPI en cache : lancer d'abord un scraping)")
+        sys.exit(1)
+
+    from src.services.sentiment_analyzer import SentimentAnalyzer
+    print(f"⏳ Labels BERT de {len(texts)} textes...")
+    reference = [label for _, label in SentimentAnalyzer().analyze_batch(texts)]
+
+    rows = calibrate(texts, reference)
+    print("seuil  couverture  accord lexique  accord cascade")
+    for threshold, coverage, lexicon_agreement, overall in rows:
+        print(f"{threshold:5.2f}  {coverage:10.1%}  {lexicon_agreement:14.1%}  {overall:14.1%}")
+
+    valid = [row for row in rows if row[3] >= TARGET_AGREEMENT]
+    if not valid:
+        print(f"❌ Aucun seuil n'atteint {TARGET_AGREEMENT:.0%} d'accord avec BERT")
+        sys.exit(1)
+    threshold, coverage, _, overall = valid[0]
+    print(f"✅ Seuil conseillé : {threshold:.2f} ({coverage:.0%} d'appels BERT évités, {overall:.1%} d'accord)")
+
+    extra, agreement = neutral_shortcut(texts, reference, threshold)
+    verdict = "activable" if agreement >= TARGET_AGREEMENT else "à laisser désactivé"
+    print(f"   Raccourci neutre : {extra} texte(s) de plus, {agreement:.1%} neutres pour BERT ({verdict})")
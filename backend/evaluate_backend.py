@@ -0,0 +1,165 @@
+"""
+Parité d'un moteur d'inférence (int8, onnx) avec le moteur fp32 d'origine.
+
+Analyse le même corpus avec chaque moteur, chacun dans son propre
+processus (mémoire mesurée séparément), puis compare au fp32 :
+- accord des labels de sentiment et écart moyen des scores
+- ROUGE-1 (F1 des mots) entre résumés fp32 et résumés du moteur testé
+- durée d'inférence et mémoire maximale du processus (resource sous
+  Unix, psutil ailleurs s'il est installé ; sinon non mesurée)
+
+Corpus : fixtures/evaluation_corpus.jsonl par défaut (dépêches courtes,
+résultats reproductibles), un fichier JSONL passé en second argument (un
+objet {"text": ...} par ligne), ou "db" pour les CORPUS_SIZE derniers
+articles de nexis.db.
+
+Le cache d'inférence est désactivé : chaque moteur calcule tout le corpus,
+et rien n'est écrit dans le cache de production.
+
+Usage (depuis backend/) : python evaluate_backend.py int8 [corpus.jsonl | db]
+Code de sortie 1 si l'écart dépasse MIN_LABEL_AGREEMENT / MIN_SUMMARY_ROUGE.
+"""
+import os
+import sys
+import json
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Optional
+from src.services.inference_backend import BACKENDS
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "evaluation_corpus.jsonl")
+CORPUS_SIZE = 50
+MIN_LABEL_AGREEMENT = 0.9
+MIN_SUMMARY_ROUGE = 0.6
+
+
+def load_corpus(path: str = DEFAULT_CORPUS) -> list:
+    if path != "db":
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line)["text"] for line in f if line.strip()]
+
+    from src.database import session_scope
+    from src.models import Article
+    with session_scope() as db:
+        rows = (
+            db.query(Article.content)
+            .filter(Article.content.isnot(None))
+            .order_by(Article.created_at.desc())
+            .limit(CORPUS_SIZE)
+            .all()
+        )
+    return [content for (content,) in rows if content]
+
+
+def max_rss_mb() -> Optional[float]:
+    """Mémoire maximale du processus en Mo, ou None si elle n'est pas mesurable"""
+    if resource is not None:
+        # ru_maxrss est en Ko sous Linux, en octets sous macOS
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss / 1024 / (1024 if sys.platform == "darwin" else 1)
+    try:
+        import psutil
+    except ImportError:
+        return None
+    info = psutil.Process().memory_info()
+    # peak_wset : pic de mémoire sous Windows
+    return getattr(info, "peak_wset", info.rss) / (1024 * 1024)
+
+
+def run_backend(backend: str, texts: list) -> dict:
+    """Exécuté dans un processus neuf : charge les modèles avec `backend` et analyse `texts`"""
+    from src.services import inference_cache
+    from src.services.sentiment_analyzer import SentimentAnalyzer
+    from src.services.llm_processor import LLMProcessor
+
+    # Ni lecture (mesure faussée) ni écriture (résumés de morceaux) du cache de production
+    inference_cache.CACHE_TTL = 0
+
+    analyzer = SentimentAnalyzer(backend=backend)
+    processor = LLMProcessor(backend=backend)
+    start = time.perf_counter()
+    sentiments = analyzer.analyze_batch(texts)
+    analyses = processor.analyze_many(texts)
+    return {
+        "backend": analyzer.backend,
+        "seconds": time.perf_counter() - start,
+        "max_rss_mb": max_rss_mb(),
+        "sentiments": sentiments,
+        "summaries": [analysis.summary if analysis else None for analysis in analyses],
+    }
+
+
+def in_process(backend: str, texts: list) -> dict:
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+        return pool.submit(run_backend, backend, texts).result()
+
+
+def rouge1(reference: str, candidate: str) -> float:
+    ref, cand = Counter(reference.lower().split()), Counter(candidate.lower().split())
+    overlap = sum((ref & cand).values())
+    if not overlap:
+        return 0.0
+    precision, recall = overlap / sum(cand.values()), overlap / sum(ref.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def compare(reference: dict, candidate: dict) -> dict:
+    pairs = list(zip(reference["sentiments"], candidate["sentiments"]))
+    summaries = [
+        (ref, cand) for ref, cand in zip(reference["summaries"], candidate["summaries"])
+        if ref and cand
+    ]
+    return {
+        "label_agreement": sum(r[1] == c[1] for r, c in pairs) / len(pairs) if pairs else 1.0,
+        "score_gap": sum(abs(r[0] - c[0]) for r, c in pairs) / len(pairs) if pairs else 0.0,
+        "summary_rouge1": sum(rouge1(r, c) for r, c in summaries) / len(summaries) if summaries else 1.0,
+        "speedup": reference["seconds"] / candidate["seconds"] if candidate["seconds"] else 0.0,
+        "memory_ratio": (
+            candidate["max_rss_mb"] / reference["max_rss_mb"]
+            if reference["max_rss_mb"] and candidate["max_rss_mb"] else None
+        ),
+    }
+
+
+if __name__ == "__main__":
+    backend = sys.argv[1] if len(sys.argv) > 1 else "int8"
+    if backend not in BACKENDS or backend == "torch":
+        print(f"❌ Moteur à comparer : {', '.join(b for b in BACKENDS if b != 'torch')}")
+        sys.exit(2)
+
+    texts = load_corpus(sys.argv[2] if len(sys.argv) > 2 else DEFAULT_CORPUS)
+    if not texts:
+        print("❌ Corpus vide")
+        sys.exit(2)
+
+    print(f"⏳ {len(texts)} textes : torch (fp32) puis {backend}...")
+    reference = in_process("torch", texts)
+    candidate = in_process(backend, texts)
+    if candidate["backend"] != backend:
+        print(f"❌ Moteur {backend} indisponible (repli sur {candidate['backend']})")
+        sys.exit(2)
+
+    results = compare(reference, candidate)
+    print(f"📊 {backend} face à fp32")
+    print(f"   labels identiques : {results['label_agreement']:.1%}")
+    print(f"   écart de score    : {results['score_gap']:.3f}")
+    print(f"   ROUGE-1 résumés   : {results['summary_rouge1']:.2f}")
+    print(f"   accélération      : x{results['speedup']:.1f} "
+          f"({reference['seconds']:.1f} s -> {candidate['seconds']:.1f} s)")
+    if results["memory_ratio"] is None:
+        print("   mémoire           : non mesurée (module resource ou psutil requis)")
+    else:
+        print(f"   mémoire           : {reference['max_rss_mb']:.0f} Mo -> {candidate['max_rss_mb']:.0f} Mo "
+              f"(x{results['memory_ratio']:.2f})")
+
+    if results["label_agreement"] < MIN_LABEL_AGREEMENT or results["summary_rouge1"] < MIN_SUMMARY_ROUGE:
+        print("❌ Écart trop important avec fp32")
+        sys.exit(1)
+    print("✅ Parité respectée")
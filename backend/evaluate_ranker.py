@@ -0,0 +1,95 @@
+"""
+Évaluation hors ligne du classement local face aux classements Gemini.
+
+Relit le journal NEXIS_RANKING_LOG (un lot d'articles + l'ordre choisi par
+Gemini par ligne), reclasse chaque lot avec LocalRanker et affiche :
+- precision@k : part du top k de Gemini retrouvée dans le top k local
+- ndcg@k      : qualité de l'ordre local, Gemini faisant référence
+- durée du classement local
+
+Usage (depuis backend/) : python evaluate_ranker.py [journal.jsonl]
+(par défaut, RANKING_LOG_PATH : le journal écrit par ImportanceRanker)
+"""
+import sys
+import json
+import time
+import math
+from datetime import datetime
+from src.services.article_record import ArticleRecord
+from src.services.importance_ranker import RANKING_LOG_PATH
+from src.services.local_ranker import LocalRanker
+
+
+def load_entries(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def to_records(entry: dict) -> list:
+    return [
+        ArticleRecord(
+            title=art["title"],
+            url=str(i),  # l'index dans le lot sert d'identifiant
+            source=art["source"],
+            topic="",
+            content=art.get("content") or "",
+            sentiment_score=art.get("sentiment_score") or 0.0,
+            published_date=datetime.fromisoformat(art["published_date"]) if art.get("published_date") else None,
+            source_count=art.get("source_count") or 1,
+        )
+        for i, art in enumerate(entry["articles"])
+    ]
+
+
+def precision_at_k(reference: list, predicted: list, k: int) -> float:
+    return len(set(reference[:k]) & set(predicted[:k])) / k if k else 0.0
+
+
+def ndcg_at_k(reference: list, predicted: list, k: int) -> float:
+    # Pertinence d'un article : k pour le premier de Gemini, 1 pour le k-ième
+    relevance = {item: k - rank for rank, item in enumerate(reference[:k])}
+    dcg = sum(relevance.get(item, 0) / math.log2(rank + 2) for rank, item in enumerate(predicted[:k]))
+    ideal = sum((k - rank) / math.log2(rank + 2) for rank in range(min(k, len(reference))))
+    return dcg / ideal if ideal else 0.0
+
+
+def evaluate(entries: list, ranker: LocalRanker = None) -> dict:
+    ranker = ranker or LocalRanker()
+    precisions, ndcgs, durations = [], [], []
+    for entry in entries:
+        records = to_records(entry)
+        k = min(entry["top_n"], len(entry["ranking"]))
+        if k == 0:
+            continue
+        start = time.perf_counter()
+        # Fraîcheur calculée au moment du classement Gemini, pas de l'évaluation
+        ranked = ranker.rank_articles(records, top_n=len(records),
+                                      now=datetime.fromisoformat(entry["ranked_at"]))
+        durations.append(time.perf_counter() - start)
+
+        predicted = [int(record.url) for record in ranked]
+        precisions.append(precision_at_k(entry["ranking"], predicted, k))
+        ndcgs.append(ndcg_at_k(entry["ranking"], predicted, k))
+
+    count = len(precisions)
+    return {
+        "batches": count,
+        "precision_at_k": sum(precisions) / count if count else 0.0,
+        "ndcg_at_k": sum(ndcgs) / count if count else 0.0,
+        "mean_ms": 1000 * sum(durations) / count if count else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else RANKING_LOG_PATH
+    try:
+        entries = load_entries(path)
+    except FileNotFoundError:
+        print(f"❌ Aucun classement Gemini enregistré ({path})")
+        sys.exit(1)
+
+    results = evaluate(entries)
+    print(f"📊 {results['batches']} lot(s) évalué(s)")
+    print(f"   precision@k : {results['precision_at_k']:.2f}")
+    print(f"   ndcg@k      : {results['ndcg_at_k']:.2f}")
+    print(f"   durée       : {results['mean_ms']:.1f} ms par lot")
@@ -1,6 +1,5 @@
-from src.database import engine, Base
-from src.models import Article
+from src.database import init_db
 
 print("🚧 Création de la base de données nexis.db en cours...")
-Base.metadata.create_all(bind=engine)
-print("✅ Base de données créée avec succès ! Le fichier 'nexis.db' est prêt.")
\ No newline at end of file
+init_db()
+print("✅ Base de données créée avec succès ! Le fichier 'nexis.db' est prêt.")
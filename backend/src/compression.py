@@ -0,0 +1,170 @@
+"""
+Compression transparente des textes longs stockés dans nexis.db.
+
+Le workflow quotidien versionne nexis.db : chaque octet de contenu d'article
+s'accumule dans l'historique git. Les colonnes `content` et `summary` sont
+donc stockées compressées (zlib brut + dictionnaire de presse française) via
+le type SQLAlchemy CompressedText ; le code applicatif lit et écrit toujours
+des chaînes.
+
+Les dictionnaires sont entraînés sur les articles réellement stockés
+(train_dictionary(), lancé par backend/train_dictionary.py) et versionnés
+dans src/dictionaries/nexis-N.zdict ; le plus récent sert aux nouvelles
+écritures, les autres restent nécessaires pour relire les anciennes lignes.
+
+Format d'une valeur compressée : b"NZ" + numéro de dictionnaire (1 octet) +
+flux deflate. Les textes trop courts pour y gagner, et les lignes écrites
+avant la compression, restent en TEXT et sont relus tels quels.
+
+Les fonctions SQL nexis_inflate / nexis_deflate sont enregistrées sur chaque
+connexion (voir database.py) pour l'index plein texte et les migrations.
+"""
+import os
+import re
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, Optional, Union
+from sqlalchemy.types import Text, TypeDecorator
+
+MAGIC = b"NZ"
+
+# Un dictionnaire amorce le compresseur avec des mots fréquents : sur des
+# textes de quelques centaines de caractères, c'est l'essentiel du gain.
+# Ne jamais modifier ni supprimer un dictionnaire publié : en ajouter un
+# nouveau numéro. Le n°1, écrit à la main, ne sert plus qu'à la relecture.
+DICTIONARIES: Dict[int, bytes] = {
+    1: (
+        "Selon l'Agence France-Presse (AFP), Reuters, Le Monde, Le Figaro, Libération, "
+        "Les Echos, franceinfo, BFMTV, Le Parisien, 20 Minutes, Ouest-France, L'Equipe. "
+        "Emmanuel Macron, le président de la République, le premier ministre, le gouvernement, "
+        "l'Assemblée nationale, le Sénat, les députés, le projet de loi, la réforme des retraites, "
+        "le budget de l'Etat, le Conseil constitutionnel, l'opposition, la majorité, les partis, "
+        "l'Union européenne, les Etats-Unis, Donald Trump, la Maison Blanche, la Russie, "
+        "Vladimir Poutine, l'Ukraine, la Chine, Israël, Gaza, le Proche-Orient, l'ONU, l'OTAN, "
+        "l'économie, la croissance, l'inflation, les entreprises, le marché, la Bourse, les prix, "
+        "milliards d'euros, millions d'euros, millions de dollars, le chômage, l'emploi, "
+        "les salaires, la dette publique, les taxes, les impôts, la Banque centrale européenne, "
+        "le climat, le réchauffement climatique, les émissions de gaz à effet de serre, "
+        "l'énergie, le pétrole, le gaz, le nucléaire, l'environnement, la biodiversité, "
+        "les températures, la sécheresse, les inondations, la tempête, Météo-France, "
+        "le football, le match, l'équipe de France, la Ligue 1, la Ligue des champions, "
+        "le championnat, la Coupe du monde, les Jeux olympiques, la victoire, l'entraîneur, "
+        "la police, la justice, le tribunal, l'enquête, le procès, la santé, l'hôpital, "
+        "lundi, mardi, mercredi, jeudi, vendredi, samedi, dimanche, janvier, février, mars, "
+        "avril, mai, juin, juillet, août, septembre, octobre, novembre, décembre, "
+        "a annoncé, a déclaré, a indiqué, a expliqué, a affirmé, a estimé, a réagi, "
+        "selon les informations, d'après, cette semaine, depuis plusieurs années, "
+        "plus de, moins de, au moins, près de, environ, notamment, toutefois, cependant, "
+        "qui a été, ont été, pour la première fois, dans le cadre de, à la suite de, "
+        "en raison de, au cours de, lors de la, alors que, tandis que, afin de, "
+        "avec les, sur les, dans les, pour les, par les, entre les, des personnes, "
+        "« Le Monde »\xa0; «\xa0\xa0»\xa0… [+ chars]\r\n"
+    ).encode("utf-8"),
+}
+
+# Dictionnaires entraînés (voir train_dictionary)
+DICTIONARY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dictionaries")
+DICTIONARY_FILE_RE = re.compile(r"^nexis-(\d+)\.zdict$")
+if os.path.isdir(DICTIONARY_DIR):
+    for _name in os.listdir(DICTIONARY_DIR):
+        _match = DICTIONARY_FILE_RE.match(_name)
+        if _match:
+            with open(os.path.join(DICTIONARY_DIR, _name), "rb") as _f:
+                DICTIONARIES[int(_match.group(1))] = _f.read()
+CURRENT_DICTIONARY = max(DICTIONARIES)
+
+# Taille visée d'un dictionnaire entraîné (deflate ne voit que 32 Ko en arrière)
+DICTIONARY_SIZE = 16 * 1024
+# Longueur des suites de mots candidates, et nombre minimal de textes qui les contiennent
+DICTIONARY_MAX_WORDS = 4
+DICTIONARY_MIN_TEXTS = 2
+
+# En dessous, l'en-tête et le flux deflate coûtent plus qu'ils ne rapportent
+MIN_LENGTH = 64
+
+
+def compress_text(value: Optional[str]) -> Union[bytes, str, None]:
+    """Compresse un texte, ou le laisse tel quel si la compression n'y gagne pas"""
+    if value is None or isinstance(value, bytes):
+        return value
+    raw = value.encode("utf-8")
+    if len(raw) < MIN_LENGTH:
+        return value
+
+    compressor = zlib.compressobj(
+        9, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=DICTIONARIES[CURRENT_DICTIONARY]
+    )
+    packed = MAGIC + bytes([CURRENT_DICTIONARY]) + compressor.compress(raw) + compressor.flush()
+    return packed if len(packed) < len(raw) else value
+
+
+def decompress_text(value: Union[bytes, str, None]) -> Optional[str]:
+    """Relit une valeur stockée, compressée ou non"""
+    if value is None or isinstance(value, str):
+        return value
+    if value[:len(MAGIC)] != MAGIC:
+        return value.decode("utf-8", errors="replace")
+
+    version = value[len(MAGIC)]
+    decompressor = zlib.decompressobj(-zlib.MAX_WBITS, zdict=DICTIONARIES[version])
+    raw = decompressor.decompress(value[len(MAGIC) + 1:]) + decompressor.flush()
+    return raw.decode("utf-8")
+
+
+def train_dictionary(texts: Iterable[str], size: int = DICTIONARY_SIZE, base: bytes = b"") -> bytes:
+    """
+    Construit un dictionnaire zlib à partir de textes réels.
+
+    Chaque suite de 1 à DICTIONARY_MAX_WORDS mots présente dans au moins
+    DICTIONARY_MIN_TEXTS textes est notée par les octets qu'elle ferait
+    économiser (nombre de textes x longueur). Les meilleures sont retenues
+    jusqu'à `size` octets, les plus rentables en fin de dictionnaire : deflate
+    y fait référence avec les distances les plus courtes. La place restante
+    est complétée, en tête, par la fin de `base` (le dictionnaire précédent) :
+    un petit corpus ne fait pas perdre le vocabulaire déjà connu.
+    """
+    counts = Counter()
+    for text in texts:
+        words = (text or "").split()
+        seen = set()
+        for n in range(1, DICTIONARY_MAX_WORDS + 1):
+            for i in range(len(words) - n + 1):
+                seen.add(" ".join(words[i:i + n]))
+        counts.update(phrase for phrase in seen if len(phrase) >= 4)
+
+    ranked = sorted(
+        (phrase for phrase, count in counts.items() if count >= DICTIONARY_MIN_TEXTS),
+        key=lambda phrase: (counts[phrase] * len(phrase), phrase), reverse=True,
+    )
+    chosen, total = [], 0
+    for phrase in ranked:
+        # Une suite déjà contenue dans une suite retenue n'apporte rien
+        if any(phrase in other for other in chosen):
+            continue
+        encoded = phrase.encode("utf-8")
+        if total + len(encoded) + 1 > size:
+            break
+        chosen.append(phrase)
+        total += len(encoded) + 1
+    trained = " ".join(reversed(chosen)).encode("utf-8")
+    room = size - len(trained)
+    return (base[-room:] if room > 0 and base else b"") + trained
+
+
+class CompressedText(TypeDecorator):
+    """Colonne texte stockée compressée (BLOB), lue et écrite comme une chaîne"""
+
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return compress_text(value)
+
+    def process_result_value(self, value, dialect):
+        return decompress_text(value)
+
+
+def register_sqlite_functions(dbapi_connection):
+    """Rend la (dé)compression disponible en SQL sur une connexion sqlite3"""
+    dbapi_connection.create_function("nexis_inflate", 1, decompress_text, deterministic=True)
+    dbapi_connection.create_function("nexis_deflate", 1, compress_text, deterministic=True)
@@ -1,13 +1,57 @@
-from sqlalchemy import create_engine
+import os
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker, declarative_base
+from src.compression import register_sqlite_functions
+from src.paths import data_path
+
+# On définit le nom du fichier de base de données (nexis.db à la racine du dépôt)
+DATABASE_URL = os.getenv("NEXIS_DATABASE_URL", f"sqlite:///{data_path('nexis.db')}")
+
+# Réglages SQLite (voir README, « Réglages de performance »)
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("NEXIS_SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_SIZE = int(os.getenv("NEXIS_SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("NEXIS_SQLITE_CACHE_SIZE_KB", "32768"))
+DB_POOL_SIZE = int(os.getenv("NEXIS_DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("NEXIS_DB_MAX_OVERFLOW", "10"))
+
+
+def _configure_sqlite(dbapi_connection, connection_record):
+    """
+    Pragmas appliqués à chaque nouvelle connexion.
+
+    En WAL, les lecteurs (interface Gradio) ne sont plus bloqués par
+    l'écriture d'un scraping en cours ; synchronous=NORMAL suffit en WAL
+    pour ne rien perdre en cas d'arrêt du processus.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+    # nexis_inflate / nexis_deflate, utilisées par l'index plein texte
+    register_sqlite_functions(dbapi_connection)
+
+
+def create_db_engine(url: str = DATABASE_URL, pool_size: int = DB_POOL_SIZE,
+                     max_overflow: int = DB_MAX_OVERFLOW):
+    """Crée un moteur SQLite réglé (WAL, pragmas, pool de connexions)"""
+    db_engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000},
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_pre_ping=True,
+    )
+    event.listen(db_engine, "connect", _configure_sqlite)
+    return db_engine
 
-# On définit le nom du fichier de base de données
-DATABASE_URL = "sqlite:///./nexis.db"
 
 # Création du moteur
-engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False}
-)
+engine = create_db_engine()
 
 # Création de la Session
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -23,9 +67,63 @@ def get_db():
     finally:
         db.close()
 
+
+@contextmanager
+def session_scope():
+    """
+    Session courte : commit à la sortie du bloc, rollback en cas d'erreur,
+    fermeture dans tous les cas.
+
+    Les objets chargés restent lisibles après le bloc (pas d'expiration au
+    commit) pour pouvoir être affichés ou envoyés par email.
+    """
+    db = SessionLocal(expire_on_commit=False)
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def close_db():
+    """
+    Reporte le journal WAL dans nexis.db puis ferme les connexions.
+
+    À appeler en fin de script : le workflow quotidien ne versionne que
+    nexis.db, pas les fichiers -wal / -shm.
+    """
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+    finally:
+        engine.dispose()
+
 # 👇 C'est cette fonction qui manquait !
-def init_db():
-    """Crée les tables de la base de données si elles n'existent pas."""
+def init_db(search_index: bool = True):
+    """
+    Crée les tables de la base de données si elles n'existent pas.
+
+    Args:
+        search_index: False pour la base versionnée par le workflow quotidien :
+            l'index plein texte en est retiré (voir search_service)
+    """
     # On importe le modèle ici pour être sûr qu'il est connu de SQLAlchemy
     from src.models import Article
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    from src.services.search_service import drop_search_index, ensure_search_index
+    from src.services.stats_service import ensure_stats_rollup
+    from src.migrations import migrate
+    Base.metadata.create_all(bind=engine)
+    # Évolutions de schéma des bases existantes (index, ...)
+    migrate(engine)
+    # Index plein texte (FTS5) et triggers de synchronisation
+    if search_index:
+        ensure_search_index(engine)
+    elif drop_search_index(engine):
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("VACUUM"))
+        print("🔎 Index de recherche plein texte retiré de la base versionnée")
+    # Cumuls statistiques tenus à jour à l'insertion
+    ensure_stats_rollup(engine)
@@ -0,0 +1,132 @@
+"""
+Migrations de schéma versionnées pour nexis.db.
+
+`create_all` crée les tables manquantes mais ne modifie jamais une table
+existante : la base versionnée par le workflow quotidien ne recevrait donc
+aucun nouvel index. Chaque migration est une liste d'instructions SQL
+appliquées une seule fois, dans l'ordre ; la version atteinte est stockée
+dans `PRAGMA user_version`.
+
+Ajouter une migration : l'ajouter en fin de MIGRATIONS avec le numéro
+suivant. Les instructions doivent rester rejouables (IF NOT EXISTS) car une
+base neuve a déjà reçu le schéma courant via `create_all`.
+
+Lancé directement (`python -m src.migrations` depuis backend/), le module
+applique les migrations puis vérifie par EXPLAIN QUERY PLAN que les
+principales lectures utilisent un index.
+"""
+import sys
+from typing import Dict, List, Tuple
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects import sqlite
+from src.models import Article, Subscriber
+
+# (version, description, instructions SQL)
+MIGRATIONS: List[Tuple[int, str, List[str]]] = [
+    (1, "Index de lecture des articles et des abonnés", [
+        "CREATE INDEX IF NOT EXISTS ix_articles_created_at ON articles (created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_articles_topic_created_at ON articles (topic, created_at)",
+        "CREATE INDEX IF NOT EXISTS ix_articles_sentiment_label ON articles (sentiment_label)",
+        "CREATE INDEX IF NOT EXISTS ix_subscribers_is_active ON subscribers (is_active)",
+    ]),
+    # L'index plein texte est supprimé puis, hors workflow quotidien, recréé par
+    # ensure_search_index (lecture à travers nexis_inflate) juste après les migrations
+    (2, "Compression du contenu et des résumés des articles", [
+        "DROP TRIGGER IF EXISTS articles_fts_insert",
+        "DROP TRIGGER IF EXISTS articles_fts_delete",
+        "DROP TRIGGER IF EXISTS articles_fts_update",
+        "DROP TABLE IF EXISTS articles_fts",
+        "UPDATE articles SET content = nexis_deflate(content), summary = nexis_deflate(summary)",
+        "VACUUM",
+    ]),
+]
+
+# Instructions impossibles dans une transaction : exécutées après son commit
+NON_TRANSACTIONAL = {"VACUUM"}
+
+# Lectures fréquentes de l'application, qui doivent toutes passer par un index
+READ_PATHS = {
+    "derniers articles": select(Article.id).order_by(Article.created_at.desc()).limit(10),
+    "derniers articles d'un sujet": (
+        select(Article.id).where(Article.topic == "sport").order_by(Article.created_at.desc()).limit(10)
+    ),
+    "articles par sentiment": (
+        select(func.count()).select_from(Article).where(Article.sentiment_label == "positif")
+    ),
+    "URLs déjà en base": select(Article.url).where(Article.url.in_(["https://exemple.fr"])),
+    "abonnés actifs": select(Subscriber.email).where(Subscriber.is_active == 1),
+}
+
+
+def current_version(conn) -> int:
+    return conn.execute(text("PRAGMA user_version")).scalar()
+
+
+def migrate(bind) -> int:
+    """
+    Applique les migrations manquantes, chacune dans sa propre transaction.
+
+    Returns:
+        Nombre de migrations appliquées
+    """
+    applied = 0
+    for version, description, statements in MIGRATIONS:
+        with bind.begin() as conn:
+            if current_version(conn) >= version:
+                continue
+            for statement in statements:
+                if statement not in NON_TRANSACTIONAL:
+                    conn.execute(text(statement))
+            # PRAGMA n'accepte pas de paramètre lié : version est un entier du code
+            conn.execute(text(f"PRAGMA user_version = {int(version)}"))
+        with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for statement in statements:
+                if statement in NON_TRANSACTIONAL:
+                    conn.execute(text(statement))
+        print(f"🧱 Migration {version} appliquée : {description}")
+        applied += 1
+    return applied
+
+
+def query_plan(conn, statement) -> List[str]:
+    """Détails de EXPLAIN QUERY PLAN pour une requête SQLAlchemy"""
+    sql = statement.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True})
+    return [row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+
+
+def uses_index(plan: List[str]) -> bool:
+    """Vrai si aucune table n'est parcourue en entier ni triée à la volée"""
+    for detail in plan:
+        if detail.startswith("SCAN") and "INDEX" not in detail:
+            return False
+        if "TEMP B-TREE" in detail:
+            return False
+    return True
+
+
+def verify_query_plans(bind) -> Dict[str, List[str]]:
+    """
+    Vérifie que chaque lecture de READ_PATHS utilise un index.
+
+    Returns:
+        Les lectures fautives et leur plan (dictionnaire vide si tout va bien)
+    """
+    failures = {}
+    with bind.connect() as conn:
+        for name, statement in READ_PATHS.items():
+            plan = query_plan(conn, statement)
+            if not uses_index(plan):
+                failures[name] = plan
+    return failures
+
+
+if __name__ == "__main__":
+    from src.database import engine, init_db
+
+    init_db()
+    failures = verify_query_plans(engine)
+    for name, plan in failures.items():
+        print(f"❌ {name} : {' / '.join(plan)}")
+    if failures:
+        sys.exit(1)
+    print(f"✅ {len(READ_PATHS)} lectures vérifiées : toutes passent par un index")
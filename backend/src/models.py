@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Index
 from sqlalchemy.sql import func
+from src.compression import CompressedText
 # 👇 C'est cette ligne qui change (ajout de 'src.')
 from src.database import Base 
 
@@ -13,17 +14,26 @@ class Article(Base):
     topic = Column(String)
     published_date = Column(DateTime, nullable=True)
     
-    content = Column(Text, nullable=True)
+    # Stockés compressés (voir src/compression.py), lus comme des chaînes
+    content = Column(CompressedText, nullable=True)
     
     sentiment_score = Column(Float)
     sentiment_label = Column(String)
     
-    summary = Column(Text, nullable=True)
+    # None = enrichissement en attente (voir services/enrichment_service.py)
+    summary = Column(CompressedText, nullable=True)
     reliability_score = Column(Integer, default=50)
     source_count = Column(Integer, default=0)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # Index des lectures fréquentes (ajoutés aux bases existantes par src/migrations.py)
+    __table_args__ = (
+        Index("ix_articles_created_at", "created_at"),
+        Index("ix_articles_topic_created_at", "topic", "created_at"),
+        Index("ix_articles_sentiment_label", "sentiment_label"),
+    )
+
 class Subscriber(Base):
     """Table des abonnés à la newsletter"""
     __tablename__ = "subscribers"
@@ -32,3 +42,35 @@ class Subscriber(Base):
     email = Column(String, unique=True, index=True, nullable=False)
     subscribed_at = Column(DateTime(timezone=True), server_default=func.now())
     is_active = Column(Integer, default=1)  # 1 = actif, 0 = désabonné
+
+    __table_args__ = (
+        Index("ix_subscribers_is_active", "is_active"),
+    )
+
+class StorySignature(Base):
+    """Empreintes SimHash des articles, pour regrouper les reprises d'une même histoire"""
+    __tablename__ = "story_signatures"
+
+    id = Column(Integer, primary_key=True, index=True)
+    url = Column(String, unique=True, index=True, nullable=False)
+    simhash = Column(Integer, nullable=False)  # 64 bits, stocké signé (SQLite)
+    cluster_id = Column(Integer, nullable=True, index=True)  # None = représentant de l'histoire
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+class ArticleStat(Base):
+    """Compteurs d'articles par jour × sujet × sentiment × source (tenus à jour par trigger)"""
+    __tablename__ = "article_stats"
+
+    day = Column(String, primary_key=True)  # 'AAAA-MM-JJ'
+    topic = Column(String, primary_key=True, default="")
+    sentiment_label = Column(String, primary_key=True, default="")
+    source = Column(String, primary_key=True, default="")
+    count = Column(Integer, nullable=False, default=0)
+
+class ArchivedUrl(Base):
+    """Empreintes des URLs déplacées vers les archives mensuelles (dédoublonnage)"""
+    __tablename__ = "archived_urls"
+
+    # 8 premiers octets de blake2b(url), stockés signés (SQLite)
+    url_hash = Column(Integer, primary_key=True, autoincrement=False)
+    month = Column(String, nullable=False)  # 'AAAA-MM' : fichier d'archive
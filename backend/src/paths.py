@@ -0,0 +1,18 @@
+"""
+Emplacement des fichiers de données (nexis.db, cache, archives, journaux).
+
+Les programmes se lancent depuis la racine du dépôt (python interface.py,
+workflow quotidien) ou depuis backend/ (python -m src.migrations, scripts
+d'évaluation) : un chemin relatif au dossier courant ouvrirait, selon le
+cas, une autre base vide. Les chemins relatifs sont donc résolus par
+rapport à la racine du dépôt.
+"""
+import os
+
+# Racine du dépôt (backend/src/paths.py -> ../..)
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def data_path(path: str) -> str:
+    """Chemin absolu : `path` tel quel s'il est absolu, sinon relatif à la racine du dépôt"""
+    return os.path.join(ROOT_DIR, os.path.expanduser(path)) if path else path
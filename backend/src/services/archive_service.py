@@ -0,0 +1,201 @@
+"""
+Archivage des anciens articles dans des bases SQLite mensuelles.
+
+nexis.db (versionnée chaque jour par le workflow) ne garde que les articles
+récents. Au-delà de ARCHIVE_AFTER_DAYS, les articles sont déplacés dans
+archives/nexis-AAAA-MM.db, un fichier par mois de création : un mois clos
+n'est plus modifié, son fichier ne change donc plus dans l'historique git.
+
+- Dédoublonnage : l'empreinte 64 bits de chaque URL archivée reste dans la
+  table archived_urls de la base chaude (8 octets par article), consultée
+  par le scraper en plus de la table articles.
+- Lecture : articles_between() interroge la base chaude puis, par ATTACH,
+  les seules archives des mois demandés. L'interface s'en sert pour
+  compléter les derniers articles ; la recherche plein texte, elle, ne
+  couvre que la base chaude.
+- Statistiques : la table de cumuls n'est pas touchée, elles restent
+  calculées sur tout l'historique.
+"""
+import os
+import re
+import hashlib
+import logging
+from datetime import datetime
+from typing import Iterable, List, Optional, Set
+from sqlalchemy import MetaData, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from src.database import engine
+from src.models import Article, ArchivedUrl
+from src.paths import data_path
+from src.services.article_queries import list_view
+
+logger = logging.getLogger(__name__)
+
+# Dossier des archives (versionné avec nexis.db)
+ARCHIVE_DIR = data_path(os.getenv("NEXIS_ARCHIVE_DIR", "archives"))
+# Âge (jours) à partir duquel un article quitte la base chaude
+ARCHIVE_AFTER_DAYS = int(os.getenv("NEXIS_ARCHIVE_AFTER_DAYS", "90"))
+
+ARCHIVE_FILE_RE = re.compile(r"^nexis-(\d{4}-\d{2})\.db$")
+# Empreintes insérées par requête (limite de paramètres SQLite)
+HASH_BATCH_SIZE = 5000
+COLUMNS = ", ".join(column.name for column in Article.__table__.columns)
+
+
+def url_hash(url: str) -> int:
+    """Empreinte 64 bits signée d'une URL (entier SQLite)"""
+    value = int.from_bytes(hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest(), "big")
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def archive_path(month: str) -> str:
+    return os.path.join(ARCHIVE_DIR, f"nexis-{month}.db")
+
+
+def archive_months() -> List[str]:
+    """Mois ('AAAA-MM') disposant d'un fichier d'archive, du plus ancien au plus récent"""
+    if not os.path.isdir(ARCHIVE_DIR):
+        return []
+    months = [m.group(1) for m in map(ARCHIVE_FILE_RE.match, os.listdir(ARCHIVE_DIR)) if m]
+    return sorted(months)
+
+
+def _schema(month: str) -> str:
+    """Nom sous lequel une archive est attachée"""
+    return "archive_" + month.replace("-", "_")
+
+
+def _archive_table(schema: str):
+    """Table articles (colonnes, types et index identiques) dans une base attachée"""
+    return Article.__table__.to_metadata(MetaData(), schema=schema)
+
+
+def archived_urls(db, urls: Iterable[str]) -> Set[str]:
+    """Parmi `urls`, celles qui ont déjà été archivées (une requête IN sur les empreintes)"""
+    by_hash = {url_hash(url): url for url in set(urls)}
+    if not by_hash:
+        return set()
+    rows = db.query(ArchivedUrl.url_hash).filter(ArchivedUrl.url_hash.in_(by_hash)).all()
+    return {by_hash[value] for (value,) in rows}
+
+
+def archive_old_articles(horizon_days: Optional[int] = None, bind=None) -> int:
+    """
+    Déplace les articles plus anciens que `horizon_days` vers leur archive mensuelle.
+
+    En WAL, une transaction sur deux bases attachées n'est pas atomique
+    d'une base à l'autre. Chaque mois est donc traité en deux temps : copie
+    validée dans l'archive, puis, dans une transaction de la seule base
+    chaude, empreintes et suppression des articles effectivement présents
+    dans l'archive. Une interruption entre les deux laisse au pire des
+    doublons, que la passe suivante résorbe (INSERT OR IGNORE).
+
+    Returns:
+        Nombre d'articles archivés
+    """
+    horizon_days = ARCHIVE_AFTER_DAYS if horizon_days is None else horizon_days
+    bind = bind or engine
+    cutoff = f"-{int(horizon_days)} days"
+    old = "created_at < datetime('now', :cutoff) AND strftime('%Y-%m', created_at) = :month"
+
+    with bind.connect() as conn:
+        months = [
+            month for (month,) in conn.execute(
+                text(
+                    "SELECT DISTINCT strftime('%Y-%m', created_at) FROM articles "
+                    "WHERE created_at < datetime('now', :cutoff)"
+                ),
+                {"cutoff": cutoff},
+            )
+        ]
+    if not months:
+        return 0
+
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    archived = 0
+    for month in months:
+        schema = _schema(month)
+        params = {"cutoff": cutoff, "month": month}
+        with bind.connect() as conn:
+            # ATTACH / DETACH hors transaction : avant le premier INSERT et après le commit
+            conn.execute(text("ATTACH DATABASE :path AS " + schema), {"path": archive_path(month)})
+            try:
+                _archive_table(schema).create(conn, checkfirst=True)
+                conn.execute(
+                    text(f"INSERT OR IGNORE INTO {schema}.articles ({COLUMNS}) "
+                         f"SELECT {COLUMNS} FROM main.articles WHERE {old}"),
+                    params,
+                )
+                conn.commit()
+
+                # Seuls les articles relus dans l'archive quittent la base chaude
+                copied = f"{old} AND url IN (SELECT url FROM {schema}.articles)"
+                urls = [url for (url,) in conn.execute(text(f"SELECT url FROM main.articles WHERE {copied}"), params)]
+                hashes = [{"url_hash": url_hash(url), "month": month} for url in urls if url]
+                for i in range(0, len(hashes), HASH_BATCH_SIZE):
+                    conn.execute(
+                        sqlite_insert(ArchivedUrl.__table__)
+                        .values(hashes[i:i + HASH_BATCH_SIZE])
+                        .on_conflict_do_nothing(index_elements=["url_hash"])
+                    )
+                conn.execute(text(f"DELETE FROM main.articles WHERE {copied}"), params)
+                conn.commit()
+                archived += len(urls)
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Archivage de {month} impossible : {e}")
+            finally:
+                conn.execute(text("DETACH DATABASE " + schema))
+
+    if archived:
+        # Rend à l'OS la place libérée dans la base chaude
+        with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("VACUUM"))
+        print(f"🗄️ {archived} article(s) archivé(s) ({', '.join(months)})")
+    return archived
+
+
+def articles_between(start: datetime, end: datetime, limit: int = 50,
+                     topic: Optional[str] = None, bind=None, hot: bool = True) -> List[Article]:
+    """
+    Articles créés entre `start` et `end`, base chaude et archives confondues
+    (archives seules avec hot=False, si l'appelant a déjà lu la base chaude).
+
+    Seules les archives des mois couverts par l'intervalle sont attachées,
+    une à la fois. Les articles sont chargés sans leur contenu.
+
+    Returns:
+        Au plus `limit` articles, du plus récent au plus ancien
+    """
+    bind = bind or engine
+    first, last = start.strftime("%Y-%m"), end.strftime("%Y-%m")
+    months = [month for month in archive_months() if first <= month <= last]
+
+    def query(db, schema=None):
+        q = db.query(Article).options(list_view())
+        if schema:
+            q = q.execution_options(schema_translate_map={None: schema})
+        q = q.filter(Article.created_at >= start, Article.created_at < end)
+        if topic:
+            q = q.filter(Article.topic == topic)
+        return q.order_by(Article.created_at.desc()).limit(limit).all()
+
+    articles = []
+    if hot:
+        with Session(bind=bind, expire_on_commit=False) as db:
+            articles = query(db)
+
+    for month in months:
+        schema = _schema(month)
+        with bind.connect() as conn:
+            conn.execute(text("ATTACH DATABASE :path AS " + schema), {"path": archive_path(month)})
+            try:
+                with Session(bind=conn, expire_on_commit=False) as db:
+                    articles.extend(query(db, schema))
+            finally:
+                conn.rollback()
+                conn.execute(text("DETACH DATABASE " + schema))
+
+    articles.sort(key=lambda art: art.created_at or datetime.min, reverse=True)
+    return articles[:limit]
@@ -0,0 +1,42 @@
+"""
+Requêtes de lecture légères sur les articles.
+
+Les listes (derniers articles, newsletter, résultats de recherche) n'affichent
+que le titre, la source, le sentiment et le résumé : on ne charge que ces
+colonnes. Le contenu (jusqu'à 5000 caractères par article) reste en base ;
+il n'est relu que par l'enrichissement différé.
+"""
+from typing import List
+from sqlalchemy.orm import load_only
+from src.models import Article
+
+# Colonnes suffisantes pour afficher un article dans une liste ou un email
+LIST_COLUMNS = (
+    Article.id,
+    Article.title,
+    Article.url,
+    Article.source,
+    Article.topic,
+    Article.sentiment_score,
+    Article.sentiment_label,
+    Article.summary,
+    Article.reliability_score,
+    Article.source_count,
+    Article.created_at,
+)
+
+
+def list_view():
+    """Option de requête : ne charge que les colonnes d'affichage"""
+    return load_only(*LIST_COLUMNS)
+
+
+def latest_articles(db, limit: int = 10) -> List[Article]:
+    """Derniers articles collectés, sans leur contenu"""
+    return (
+        db.query(Article)
+        .options(list_view())
+        .order_by(Article.created_at.desc())
+        .limit(limit)
+        .all()
+    )
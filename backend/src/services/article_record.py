@@ -0,0 +1,68 @@
+"""
+Article en cours de traitement (collecte -> analyse -> classement -> envoi).
+
+Un ArticleRecord est un simple objet à __slots__ : pas de __dict__ par
+instance ni d'instrumentation SQLAlchemy. Il n'est converti en ligne de la
+table articles qu'au moment de la sauvegarde (to_row). Il expose les mêmes
+attributs qu'un Article : le classement, l'email et l'interface acceptent
+indifféremment l'un ou l'autre.
+"""
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Optional
+
+# Taille maximale du contenu conservé par article
+MAX_CONTENT_LENGTH = 5000
+
+
+def parse_published_at(value: Optional[str]) -> Optional[datetime]:
+    """
+    Date de publication NewsAPI ("2026-01-12T08:30:00Z") en heure locale
+    naïve, comme datetime.now() ; None si absente ou illisible.
+    """
+    if not value:
+        return None
+    try:
+        published = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (TypeError, ValueError):
+        return None
+    if published.tzinfo is not None:
+        published = published.astimezone().replace(tzinfo=None)
+    return published
+
+
+@dataclass(slots=True)
+class ArticleRecord:
+    title: str
+    url: str
+    source: str
+    topic: str
+    content: str = ""
+    published_date: Optional[datetime] = None
+    sentiment_score: float = 0.0
+    sentiment_label: str = "neutre"
+    # None = enrichissement en attente (voir enrichment_service)
+    summary: Optional[str] = None
+    reliability_score: int = 50
+    source_count: int = 1
+    id: Optional[int] = None
+
+    @classmethod
+    def from_api(cls, art_data: dict, topic: str, source_count: int = 1) -> "ArticleRecord":
+        """Construit un record à partir d'un article renvoyé par NewsAPI"""
+        content = art_data.get('content', '') or art_data.get('description', '') or ""
+        # NewsAPIService renomme publishedAt en published_at
+        published = parse_published_at(art_data.get('published_at') or art_data.get('publishedAt'))
+        return cls(
+            title=art_data['title'],
+            url=art_data['url'],
+            source=art_data['source'],
+            topic=topic,
+            content=content[:MAX_CONTENT_LENGTH],
+            published_date=published or datetime.now(),
+            source_count=source_count,
+        )
+
+    def to_row(self) -> dict:
+        """Valeurs à insérer dans la table articles (sans l'id, attribué par SQLite)"""
+        return {f.name: getattr(self, f.name) for f in fields(self) if f.name != "id"}
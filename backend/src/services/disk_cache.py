@@ -0,0 +1,245 @@
+"""
+Cache persistant sur disque (fichier SQLite séparé de nexis.db).
+
+Les réponses d'API externes et les résultats d'inférence y sont stockés
+par espace de noms, avec une durée de vie (TTL), une taille maximale
+(éviction LRU) et des compteurs de succès / échecs. Le cache n'est jamais bloquant : en cas d'erreur SQLite,
+il se comporte comme un cache vide.
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+from src.paths import data_path
+
+logger = logging.getLogger(__name__)
+
+# Paramètres liés par requête IN (limite SQLite : 999 sur les anciennes versions)
+_BATCH = 500
+
+# Fichier du cache (hors de nexis.db, qui est versionné par le workflow quotidien)
+CACHE_PATH = data_path(os.getenv("NEXIS_CACHE_PATH", "nexis_cache.db"))
+
+
+class DiskCache:
+    """Cache clé -> valeur JSON avec TTL et éviction LRU"""
+
+    def __init__(self, namespace: str, ttl: float, max_entries: int, path: str = CACHE_PATH):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        if ttl <= 0 or max_entries <= 0:
+            # Cache désactivé : le fichier n'est ni ouvert ni créé
+            return
+        try:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                );
+                CREATE INDEX IF NOT EXISTS ix_cache_entries_lru
+                    ON cache_entries (namespace, accessed_at);
+            """)
+        except sqlite3.Error as e:
+            logger.error(f"Cache '{namespace}' désactivé : {e}")
+            self._conn = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._conn is not None and self.ttl > 0 and self.max_entries > 0
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """Construit une clé stable à partir d'éléments sérialisables en JSON"""
+        raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, *parts) -> Optional[Any]:
+        """Retourne la valeur en cache, ou None si absente ou expirée"""
+        if not self.enabled:
+            return None
+
+        key = self.make_key(*parts)
+        now = time.time()
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value, created_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                    (self.namespace, key),
+                ).fetchone()
+
+                if row is None or now - row[1] > self.ttl:
+                    self.misses += 1
+                    if row is not None:
+                        self._conn.execute(
+                            "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                            (self.namespace, key),
+                        )
+                        self._conn.commit()
+                    return None
+
+                self._conn.execute(
+                    "UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                    (now, self.namespace, key),
+                )
+                self._conn.commit()
+                self.hits += 1
+                return json.loads(row[0])
+        except sqlite3.Error as e:
+            logger.warning(f"Lecture du cache '{self.namespace}' impossible : {e}")
+            return None
+
+    def set(self, value: Any, *parts):
+        """Enregistre une valeur puis évince les entrées les moins récemment lues"""
+        if not self.enabled:
+            return
+
+        key = self.make_key(*parts)
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache_entries VALUES (?, ?, ?, ?, ?)",
+                    (self.namespace, key, json.dumps(value, ensure_ascii=False), now, now),
+                )
+                self._conn.execute(
+                    """
+                    DELETE FROM cache_entries WHERE namespace = ? AND key IN (
+                        SELECT key FROM cache_entries WHERE namespace = ?
+                        ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (self.namespace, self.namespace, self.max_entries),
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Écriture du cache '{self.namespace}' impossible : {e}")
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Valeurs en cache pour des clés déjà construites par make_key.
+
+        Une seule transaction pour tout le lot. Returns: clé -> valeur, pour
+        les seules clés présentes et non expirées.
+        """
+        if not self.enabled or not keys:
+            return {}
+
+        now = time.time()
+        found: Dict[str, Any] = {}
+        expired: List[str] = []
+        unique = list(dict.fromkeys(keys))
+        try:
+            with self._lock:
+                for start in range(0, len(unique), _BATCH):
+                    chunk = unique[start:start + _BATCH]
+                    rows = self._conn.execute(
+                        f"SELECT key, value, created_at FROM cache_entries WHERE namespace = ? "
+                        f"AND key IN ({', '.join('?' * len(chunk))})",
+                        (self.namespace, *chunk),
+                    ).fetchall()
+                    for key, value, created_at in rows:
+                        if now - created_at > self.ttl:
+                            expired.append(key)
+                        else:
+                            found[key] = json.loads(value)
+
+                self._conn.executemany(
+                    "UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                    [(now, self.namespace, key) for key in found],
+                )
+                self._conn.executemany(
+                    "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                    [(self.namespace, key) for key in expired],
+                )
+                self._conn.commit()
+                self.hits += len(found)
+                self.misses += len(unique) - len(found)
+                return found
+        except sqlite3.Error as e:
+            logger.warning(f"Lecture du cache '{self.namespace}' impossible : {e}")
+            return {}
+
+    def set_many(self, values: Dict[str, Any]):
+        """Enregistre des valeurs (clés de make_key) en une transaction, puis évince"""
+        if not self.enabled or not values:
+            return
+
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO cache_entries VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (self.namespace, key, json.dumps(value, ensure_ascii=False), now, now)
+                        for key, value in values.items()
+                    ],
+                )
+                self._conn.execute(
+                    """
+                    DELETE FROM cache_entries WHERE namespace = ? AND key IN (
+                        SELECT key FROM cache_entries WHERE namespace = ?
+                        ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (self.namespace, self.namespace, self.max_entries),
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Écriture du cache '{self.namespace}' impossible : {e}")
+
+    def values(self, limit: int = None) -> List[Any]:
+        """
+        Valeurs de cet espace de noms, expirées comprises, des plus récemment lues
+        aux plus anciennes. Sans effet sur l'éviction : sert aux scripts d'analyse.
+        """
+        if self._conn is None:
+            return []
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT value FROM cache_entries WHERE namespace = ? "
+                    "ORDER BY accessed_at DESC LIMIT ?",
+                    (self.namespace, -1 if limit is None else limit),
+                ).fetchall()
+            return [json.loads(value) for value, in rows]
+        except sqlite3.Error as e:
+            logger.warning(f"Lecture du cache '{self.namespace}' impossible : {e}")
+            return []
+
+    def clear(self):
+        """Vide toutes les entrées de cet espace de noms"""
+        if self._conn is None:
+            return
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,))
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        """Compteurs de succès / échecs et taille actuelle"""
+        size = 0
+        if self._conn is not None:
+            with self._lock:
+                size = self._conn.execute(
+                    "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?", (self.namespace,)
+                ).fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": size,
+        }
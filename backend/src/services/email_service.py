@@ -1,9 +1,12 @@
 import os
 import resend
-from typing import List
+from typing import List, Union
 from dotenv import load_dotenv
-from src.database import SessionLocal
+from src.database import session_scope
 from src.models import Article
+from src.services.article_record import ArticleRecord
+from src.services.enrichment_service import enrich_pending
+from src.services.article_queries import latest_articles
 
 load_dotenv()
 
@@ -13,9 +16,8 @@ class EmailService:
         if not api_key:
             print("⚠️ ATTENTION : Pas de clé API Resend trouvée dans le .env")
         resend.api_key = api_key
-        self.db = SessionLocal()
 
-    def generate_html(self, articles: List[Article]) -> str:
+    def generate_html(self, articles: List[Union[Article, ArticleRecord]]) -> str:
         """Crée le design HTML de la newsletter avec analyse de sentiment"""
         if not articles:
             return None
@@ -87,7 +89,7 @@ class EmailService:
         </html>
         """
 
-    def send_daily_newsletter(self, destinataires: List[str], specific_articles: List[Article] = None):
+    def send_daily_newsletter(self, destinataires: List[str], specific_articles: List[Union[Article, ArticleRecord]] = None):
         """Envoie la newsletter quotidienne avec analyse de sentiment"""
         # SI on a une liste spécifique (suite à une recherche), on prend ça
         if specific_articles:
@@ -96,12 +98,16 @@ class EmailService:
         # SINON, on prend les derniers en base
         else:
             print("📧 Récupération des derniers articles en base...")
-            articles = self.db.query(Article).order_by(Article.created_at.desc()).limit(50).all()
+            with session_scope() as db:
+                articles = latest_articles(db, limit=50)
 
         if not articles:
             print("❌ Aucun article à envoyer.")
             return
 
+        # Les articles non retenus au scraping n'ont pas encore de résumé
+        enrich_pending(articles)
+
         html_content = self.generate_html(articles)
 
         try:
@@ -0,0 +1,130 @@
+"""
+Enrichissement différé des articles.
+
+Le scraper ne résume que les articles retenus par le classement ; les autres
+sont stockés avec `summary` à None. Ce module les complète (résumé BART +
+sources SpaCy) au moment où ils sont réellement affichés ou envoyés.
+
+Lancé directement (`python -m src.services.enrichment_service` depuis
+backend/), il enrichit d'un coup tous les articles encore en attente de
+nexis.db, à la racine du dépôt (voir src/paths.py).
+"""
+import logging
+from typing import List, Union
+from sqlalchemy.orm import load_only
+from src.database import session_scope
+from src.models import Article
+from src.services.article_record import ArticleRecord
+from src.services import model_registry
+from src.services.inference_cache import cached_analyses
+
+logger = logging.getLogger(__name__)
+
+
+def is_pending(article) -> bool:
+    """Un article est en attente tant qu'il n'a pas de résumé (même 'Non disponible')"""
+    return article.summary is None and getattr(article, "id", None) is not None
+
+
+def enrichment_values(texts: List[str], llm_processor=None) -> List[dict]:
+    """
+    Calcule, en un seul lot, les colonnes d'enrichissement de chaque texte.
+
+    `source_count` n'est pas touché : il compte les médias ayant repris
+    l'histoire (voir story_clustering), pas les entités citées.
+
+    Returns:
+        Pour chaque texte : summary (+ reliability_score si le texte était
+        assez long pour être analysé)
+    """
+    llm_processor = llm_processor or model_registry.get_llm_processor()
+    values = [{"summary": "Non disponible"} for _ in texts]
+
+    to_summarize = [i for i, text in enumerate(texts) if text and len(text) > 200]
+    if not to_summarize:
+        return values
+
+    analyses = cached_analyses(llm_processor, [texts[i] for i in to_summarize])
+    for i, analysis in zip(to_summarize, analyses):
+        if analysis:
+            values[i] = {
+                "summary": analysis["summary"],
+                "reliability_score": analysis["reliability_score"],
+            }
+    return values
+
+
+def enrich_pending(articles: List[Union[Article, ArticleRecord]]) -> int:
+    """
+    Résume en un seul lot les articles en attente d'enrichissement.
+
+    Les lignes en base sont mises à jour et les objets passés en paramètre
+    sont complétés sur place, pour pouvoir être affichés directement.
+
+    Returns:
+        Nombre d'articles enrichis
+    """
+    pending = [art for art in articles if is_pending(art)]
+    if not pending:
+        return 0
+
+    print(f"🔄 Enrichissement de {len(pending)} article(s) en attente...")
+    try:
+        with session_scope() as db:
+            # Le contenu est relu en base : les listes n'ont pas besoin de le charger
+            contents = dict(
+                db.query(Article.id, Article.content)
+                .filter(Article.id.in_([art.id for art in pending]))
+                .all()
+            )
+            texts = [contents.get(art.id) or "" for art in pending]
+
+            for art, values in zip(pending, enrichment_values(texts)):
+                db.query(Article).filter(Article.id == art.id).update(values)
+                for key, value in values.items():
+                    setattr(art, key, value)
+        return len(pending)
+
+    except Exception as e:
+        logger.error(f"Erreur enrichissement différé : {e}")
+        return 0
+
+
+def backfill_pending(batch_size: int = 256, limit: int = None) -> int:
+    """
+    Enrichit tous les articles encore en attente, du plus récent au plus ancien.
+
+    Chaque lot est réparti entre les processus d'inférence quand
+    NEXIS_WORKER_PROCESSES > 0 (voir worker_pool).
+
+    Returns:
+        Nombre d'articles enrichis
+    """
+    done, last_id = 0, None
+    while limit is None or done < limit:
+        size = batch_size if limit is None else min(batch_size, limit - done)
+        with session_scope() as db:
+            query = db.query(Article).options(load_only(Article.id, Article.summary))
+            query = query.filter(Article.summary.is_(None))
+            if last_id is not None:
+                query = query.filter(Article.id < last_id)
+            batch = query.order_by(Article.id.desc()).limit(size).all()
+        if not batch:
+            break
+        last_id = batch[-1].id
+        enriched = enrich_pending(batch)
+        if not enriched:
+            break
+        done += enriched
+    return done
+
+
+if __name__ == "__main__":
+    import time
+    from src.database import engine, init_db
+
+    init_db()
+    print(f"📂 Base : {engine.url.database}")
+    start = time.perf_counter()
+    count = backfill_pending()
+    print(f"✅ {count} article(s) enrichi(s) en {time.perf_counter() - start:.1f} s")
@@ -1,30 +1,78 @@
 import os
+import json
+import logging
+import threading
+from datetime import datetime
 import google.generativeai as genai
-from typing import List
+from typing import Dict, List, Union
 from dotenv import load_dotenv
 from src.models import Article
+from src.services.article_record import ArticleRecord
+from src.services.disk_cache import DiskCache
+from src.paths import data_path
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Journal des classements Gemini (JSONL), relu par backend/evaluate_ranker.py ;
+# à la racine du dépôt quel que soit le dossier de lancement, vide pour désactiver
+RANKING_LOG_PATH = data_path(os.getenv("NEXIS_RANKING_LOG", "nexis_rankings.jsonl"))
+# Délai maximal (s) d'une réponse Gemini avant de basculer sur le classement de repli
+RANKING_DEADLINE = float(os.getenv("NEXIS_RANKING_DEADLINE", "20"))
+# Cache des classements par empreinte du lot de candidats
+RANKING_CACHE_TTL = float(os.getenv("NEXIS_RANKING_CACHE_TTL", "86400"))
+RANKING_CACHE_MAX_ENTRIES = int(os.getenv("NEXIS_RANKING_CACHE_MAX_ENTRIES", "200"))
+
+MODEL_NAME = 'gemini-2.0-flash-exp'
+
+CRITERIA = """**Critères de priorité :**
+1. Impact majeur sur la société (politique, économie, santé publique)
+2. Urgence de l'information (événements en cours)
+3. Portée large (national > local, international > national si majeur)
+4. Fiabilité de la source (grands médias > petits sites)
+5. Nouveauté réelle (pas des redites)"""
+
+
+class RankingTimeout(Exception):
+    """Gemini n'a pas répondu avant RANKING_DEADLINE"""
+
+
+def describe(articles: List[Union[Article, ArticleRecord]]) -> str:
+    """Liste numérotée des articles telle qu'envoyée à Gemini"""
+    return "\n".join([
+        f"{i+1}. [{art.source}] {art.title}"
+        + (f" (repris par {art.source_count} médias)" if (art.source_count or 0) > 1 else "")
+        + (f" — {art.content[:150]}" if art.content else "")
+        for i, art in enumerate(articles)
+    ])
+
 class ImportanceRanker:
     """Classe les articles par importance avec Gemini AI"""
     
-    def __init__(self):
+    def __init__(self, fallback=None):
+        # Classement utilisé sans clé Gemini ou en cas d'erreur (None = ordre d'arrivée)
+        self.fallback = fallback
         api_key = os.getenv("GEMINI_API_KEY")
         if not api_key:
             print("⚠️ GEMINI_API_KEY manquante dans .env")
             self.model = None
         else:
             genai.configure(api_key=api_key)
-            self.model = genai.GenerativeModel('gemini-2.0-flash-exp')
+            self.model = genai.GenerativeModel(MODEL_NAME)
             print("✅ Gemini AI initialisé")
+        self.cache = DiskCache(
+            "gemini_rankings", ttl=RANKING_CACHE_TTL, max_entries=RANKING_CACHE_MAX_ENTRIES
+        )
     
-    def rank_articles(self, articles: List[Article], top_n: int = 10) -> List[Article]:
+    def rank_articles(
+        self, articles: List[Union[Article, ArticleRecord]], top_n: int = 10
+    ) -> List[Union[Article, ArticleRecord]]:
         """
         Classe les articles par importance journalistique
         
         Args:
-            articles: Liste d'articles à classer
+            articles: Liste d'articles à classer (Article ou ArticleRecord)
             top_n: Nombre d'articles à retourner
             
         Returns:
@@ -32,29 +80,27 @@ class ImportanceRanker:
         """
         
         if not self.model:
-            print("❌ Gemini non disponible, tri par date")
-            return articles[:top_n]
+            print("❌ Gemini non disponible, classement de repli")
+            return self._fallback(articles, top_n)
         
         if len(articles) <= top_n:
             return articles
         
+        cache_key = self.cache_parts(articles, top_n)
+        cached = self.cache.get(*cache_key)
+        if cached is not None:
+            print("♻️ Classement Gemini déjà connu pour ces articles")
+            return [articles[i] for i in cached][:top_n]
+        
         try:
-            # Préparer les titres pour Gemini
-            titles_text = "\n".join([
-                f"{i+1}. [{art.source}] {art.title}"
-                for i, art in enumerate(articles)
-            ])
+            # Préparer les titres pour Gemini (+ début de description si dispo)
+            titles_text = describe(articles)
             
             prompt = f"""Tu es un rédacteur en chef expérimenté d'un journal français.
 
 Classe ces {len(articles)} articles par ordre d'IMPORTANCE JOURNALISTIQUE (du plus important au moins important).
 
-**Critères de priorité :**
-1. Impact majeur sur la société (politique, économie, santé publique)
-2. Urgence de l'information (événements en cours)
-3. Portée large (national > local, international > national si majeur)
-4. Fiabilité de la source (grands médias > petits sites)
-5. Nouveauté réelle (pas des redites)
+{CRITERIA}
 
 **Articles :**
 {titles_text}
@@ -64,22 +110,186 @@ Classe ces {len(articles)} articles par ordre d'IMPORTANCE JOURNALISTIQUE (du pl
 Exemple de réponse : 3,7,1,12,5,18,2,9,14,6"""
 
             print(f"🤖 Gemini analyse {len(articles)} articles...")
-            response = self.model.generate_content(prompt)
+            response_text = self.generate(prompt)
             
             # Parser la réponse
-            response_text = response.text.strip()
             rankings = [int(n.strip()) - 1 for n in response_text.split(",")]
+            rankings = [i for i in dict.fromkeys(rankings) if 0 <= i < len(articles)]
             
             # Retourner les articles dans l'ordre d'importance
-            selected = [articles[i] for i in rankings if 0 <= i < len(articles)]
+            self.log_ranking(articles, rankings, top_n)
+            if len(rankings) >= top_n:
+                # Une réponse incomplète n'est pas figée dans le cache
+                self.cache.set(rankings, *cache_key)
             
-            print(f"✅ Top {len(selected[:top_n])} articles sélectionnés par Gemini")
-            return selected[:top_n]
+            print(f"✅ Top {min(len(rankings), top_n)} articles sélectionnés par Gemini")
+            return self._complete(articles, rankings, top_n)
         
         except Exception as e:
             print(f"❌ Erreur Gemini : {e}")
-            print("⚠️ Fallback : tri par date")
+            print("⚠️ Fallback : classement de repli")
+            return self._fallback(articles, top_n)
+
+    def rank_topics(
+        self, candidates: Dict[str, List[Union[Article, ArticleRecord]]], top_n: int = 10
+    ) -> Dict[str, List[Union[Article, ArticleRecord]]]:
+        """
+        Classe les candidats de tous les sujets en un seul appel Gemini.
+
+        La réponse est un objet JSON {sujet: [numéros]}. Chaque sujet est mis
+        en cache par empreinte de ses candidats, et seulement si Gemini en a
+        classé top_n : relancer le job avec les mêmes articles ne redemande
+        que les sujets absents ou incomplets. Au-delà de RANKING_DEADLINE, ou
+        pour un sujet absent de la réponse, le classement de repli est
+        utilisé (il complète aussi un classement incomplet).
+
+        Returns:
+            Dictionnaire sujet -> top_n articles les plus importants
+        """
+        results = {topic: articles for topic, articles in candidates.items() if len(articles) <= top_n}
+        to_rank = {topic: articles for topic, articles in candidates.items() if len(articles) > top_n}
+        if not to_rank:
+            return results
+
+        if not self.model:
+            print("❌ Gemini non disponible, classement de repli")
+            return {**results, **{t: self._fallback(a, top_n) for t, a in to_rank.items()}}
+
+        keys = {
+            topic: DiskCache.make_key(*self.cache_parts(articles, top_n))
+            for topic, articles in to_rank.items()
+        }
+        known = self.cache.get_many(list(keys.values()))
+        rankings = {topic: known[key] for topic, key in keys.items() if key in known}
+        if rankings:
+            print(f"♻️ Classement Gemini déjà connu pour {len(rankings)}/{len(to_rank)} sujet(s)")
+
+        missing = {topic: articles for topic, articles in to_rank.items() if topic not in rankings}
+        if missing:
+            try:
+                fresh = self._rank_topics_remote(missing, top_n)
+            except Exception as e:
+                print(f"❌ Erreur Gemini : {e}")
+                print("⚠️ Fallback : classement de repli")
+                fresh = {}
+            # Un sujet absent ou incomplet sera redemandé au prochain passage
+            self.cache.set_many({keys[topic]: picks for topic, picks in fresh.items() if len(picks) >= top_n})
+            rankings.update(fresh)
+
+        for topic, articles in to_rank.items():
+            results[topic] = self._complete(articles, rankings.get(topic, []), top_n)
+        return results
+
+    def _rank_topics_remote(self, to_rank: Dict[str, list], top_n: int) -> Dict[str, List[int]]:
+        """Appel Gemini unique ; retourne, par sujet, les index (0-based) retenus"""
+        sections = "\n\n".join(
+            f"### {topic}\n{describe(articles)}" for topic, articles in to_rank.items()
+        )
+        example = json.dumps({topic: [3, 1, 2] for topic in to_rank}, ensure_ascii=False)
+        prompt = f"""Tu es un rédacteur en chef expérimenté d'un journal français.
+
+Pour CHAQUE sujet ci-dessous, classe ses articles par ordre d'IMPORTANCE JOURNALISTIQUE et garde les {top_n} plus importants.
+
+{CRITERIA}
+
+**Articles par sujet (numérotation propre à chaque sujet) :**
+{sections}
+
+**IMPORTANT :** Réponds UNIQUEMENT avec un objet JSON associant à chaque sujet la liste des numéros retenus, du plus important au moins important.
+
+Exemple de réponse : {example}"""
+
+        total = sum(len(articles) for articles in to_rank.values())
+        print(f"🤖 Gemini classe {total} articles sur {len(to_rank)} sujet(s) en un appel...")
+        data = json.loads(self.generate(prompt, json_output=True))
+
+        rankings = {}
+        for topic, articles in to_rank.items():
+            picks = [int(n) - 1 for n in data.get(topic) or []]
+            picks = [i for i in dict.fromkeys(picks) if 0 <= i < len(articles)]
+            if picks:
+                rankings[topic] = picks
+                self.log_ranking(articles, picks, top_n)
+        print(f"✅ Classement Gemini reçu pour {len(rankings)}/{len(to_rank)} sujet(s)")
+        return rankings
+
+    def generate(self, prompt: str, json_output: bool = False) -> str:
+        """
+        Appelle Gemini avec un délai maximal de RANKING_DEADLINE secondes.
+
+        L'appel tourne dans un thread démon : s'il ne revient pas à temps,
+        on lève RankingTimeout sans attendre (ni bloquer la fin du processus).
+        """
+        outcome = {}
+
+        def _call():
+            try:
+                config = {"response_mime_type": "application/json"} if json_output else None
+                response = self.model.generate_content(
+                    prompt, generation_config=config, request_options={"timeout": RANKING_DEADLINE}
+                )
+                outcome["text"] = response.text.strip()
+            except Exception as e:
+                outcome["error"] = e
+
+        thread = threading.Thread(target=_call, name="nexis-gemini", daemon=True)
+        thread.start()
+        thread.join(RANKING_DEADLINE)
+        if thread.is_alive():
+            raise RankingTimeout(f"pas de réponse de Gemini en {RANKING_DEADLINE:.0f} s")
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["text"]
+
+    @staticmethod
+    def fingerprint(articles: List[Union[Article, ArticleRecord]]) -> List[list]:
+        """Identité d'un lot de candidats (URL + titre, dans l'ordre)"""
+        return [[art.url, art.title] for art in articles]
+
+    @classmethod
+    def cache_parts(cls, articles: List[Union[Article, ArticleRecord]], top_n: int) -> tuple:
+        """Clé de cache du classement d'un lot, partagée par rank_articles et rank_topics"""
+        return ("articles", MODEL_NAME, top_n, cls.fingerprint(articles))
+
+    def _complete(self, articles: List[Union[Article, ArticleRecord]], picks: List[int], top_n: int):
+        """Articles choisis par Gemini, complétés par le classement de repli s'il en manque"""
+        selected = [articles[i] for i in picks][:top_n]
+        if len(selected) < top_n:
+            chosen = set(picks)
+            rest = [art for i, art in enumerate(articles) if i not in chosen]
+            selected += self._fallback(rest, top_n - len(selected))
+        return selected
+
+    def _fallback(self, articles: List[Union[Article, ArticleRecord]], top_n: int):
+        if self.fallback is None:
             return articles[:top_n]
+        return self.fallback.rank_articles(articles, top_n=top_n)
+
+    def log_ranking(self, articles: List[Union[Article, ArticleRecord]], rankings: List[int], top_n: int):
+        """Enregistre un classement Gemini pour évaluer le classement local hors ligne"""
+        if not RANKING_LOG_PATH:
+            return
+        entry = {
+            "ranked_at": datetime.now().isoformat(timespec="seconds"),
+            "top_n": top_n,
+            "ranking": [i for i in rankings if 0 <= i < len(articles)],
+            "articles": [
+                {
+                    "title": art.title,
+                    "source": art.source,
+                    "content": (art.content or "")[:300],
+                    "source_count": art.source_count,
+                    "sentiment_score": art.sentiment_score,
+                    "published_date": art.published_date.isoformat() if art.published_date else None,
+                }
+                for art in articles
+            ],
+        }
+        try:
+            with open(RANKING_LOG_PATH, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        except OSError as e:
+            logger.warning(f"Journal des classements indisponible : {e}")
 
 
 # Test rapide
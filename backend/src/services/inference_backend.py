@@ -0,0 +1,165 @@
+"""
+Moteurs d'inférence CPU pour les pipelines Hugging Face (BERT, BART).
+
+NEXIS_INFERENCE_BACKEND choisit comment SentimentAnalyzer et LLMProcessor
+chargent leurs modèles :
+
+- "torch" : modèle PyTorch fp32 d'origine (par défaut)
+- "int8"  : même modèle, couches linéaires quantifiées dynamiquement en
+            int8 au chargement (torch.quantization.quantize_dynamic) ;
+            aucune dépendance supplémentaire
+- "onnx"  : graphe ONNX exécuté par ONNX Runtime (paquet optimum[onnxruntime]).
+            Le modèle est exporté au premier chargement dans ONNX_MODEL_DIR
+            puis relu depuis ce dossier
+
+Les trois moteurs renvoient un pipeline transformers : le code appelant ne
+change pas. Si un moteur ne peut pas être chargé (dépendance absente,
+export impossible), on retombe sur "torch".
+
+Le moteur fait partie de l'identifiant de cache d'inférence : les résultats
+int8 / ONNX ne sont jamais servis à la place des résultats fp32. Voir
+backend/evaluate_backend.py pour mesurer l'écart avec fp32.
+
+Le module fournit aussi la troncature et le découpage des textes en tokens
+du modèle (et non en caractères) : la limite réelle est lue sur le
+tokenizer et la configuration du pipeline.
+"""
+import os
+import logging
+from typing import List
+from transformers import pipeline
+from src.paths import data_path
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("torch", "int8", "onnx")
+INFERENCE_BACKEND = os.getenv("NEXIS_INFERENCE_BACKEND", "torch")
+# Dossier des modèles exportés en ONNX (non versionné)
+ONNX_MODEL_DIR = data_path(os.getenv("NEXIS_ONNX_DIR", "onnx_models"))
+
+# Tâche du pipeline -> (classe transformers, classe optimum)
+_MODEL_CLASSES = {
+    "sentiment-analysis": ("AutoModelForSequenceClassification", "ORTModelForSequenceClassification"),
+    "summarization": ("AutoModelForSeq2SeqLM", "ORTModelForSeq2SeqLM"),
+}
+
+
+def cache_suffix(backend: str) -> str:
+    """Suffixe de cache_id : vide pour fp32, pour garder les résultats déjà en cache"""
+    return "" if backend == "torch" else f"+{backend}"
+
+
+def _int8_model(task: str, model_name: str):
+    import torch
+    import transformers
+    model_class = getattr(transformers, _MODEL_CLASSES[task][0])
+    model = model_class.from_pretrained(model_name)
+    model.eval()
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _onnx_model(task: str, model_name: str):
+    import optimum.onnxruntime
+    model_class = getattr(optimum.onnxruntime, _MODEL_CLASSES[task][1])
+    export_dir = os.path.join(ONNX_MODEL_DIR, model_name.replace("/", "--"))
+    if os.path.isdir(export_dir):
+        return model_class.from_pretrained(export_dir)
+
+    print(f"⏳ Export ONNX de {model_name} (une seule fois)...")
+    model = model_class.from_pretrained(model_name, export=True)
+    model.save_pretrained(export_dir)
+    return model
+
+
+def load_pipeline(task: str, model_name: str, backend: str = None):
+    """
+    Pipeline transformers `task` pour `model_name` avec le moteur demandé.
+
+    Returns:
+        (pipeline, moteur réellement utilisé)
+    """
+    backend = backend or INFERENCE_BACKEND
+    if backend not in BACKENDS:
+        logger.error(f"Moteur d'inférence inconnu '{backend}', utilisation de torch")
+        backend = "torch"
+
+    if backend != "torch":
+        try:
+            from transformers import AutoTokenizer
+            loader = _int8_model if backend == "int8" else _onnx_model
+            model = loader(task, model_name)
+            return pipeline(task, model=model, tokenizer=AutoTokenizer.from_pretrained(model_name)), backend
+        except Exception as e:
+            logger.error(f"Moteur {backend} indisponible pour {model_name} ({e}), utilisation de torch")
+
+    return pipeline(task, model=model_name), "torch"
+
+
+def max_input_tokens(pipe, default: int = 512) -> int:
+    """Longueur d'entrée maximale du modèle, en tokens (tokens spéciaux compris)"""
+    tokenizer = getattr(pipe, "tokenizer", None)
+    config = getattr(getattr(pipe, "model", None), "config", None)
+    limits = [
+        getattr(tokenizer, "model_max_length", None),
+        getattr(config, "max_position_embeddings", None),
+    ]
+    # model_max_length vaut un très grand entier quand le tokenizer ne la connaît pas
+    limits = [limit for limit in limits if limit and limit < 100_000]
+    return min(limits) if limits else default
+
+
+def token_budget(pipe) -> int:
+    """Tokens de texte utilisables, une fois les tokens spéciaux (<s>, [CLS]...) ajoutés"""
+    tokenizer = getattr(pipe, "tokenizer", None)
+    special = tokenizer.num_special_tokens_to_add() if tokenizer is not None else 2
+    return max_input_tokens(pipe) - special
+
+
+def _token_spans(pipe, text: str):
+    """(début, fin) en caractères de chaque token, ou None sans tokenizer rapide"""
+    tokenizer = getattr(pipe, "tokenizer", None)
+    if tokenizer is None or not getattr(tokenizer, "is_fast", False):
+        return None
+    encoding = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True, verbose=False)
+    return encoding["offset_mapping"]
+
+
+def truncate_to_tokens(pipe, text: str, max_tokens: int) -> str:
+    """
+    Coupe `text` après ses `max_tokens` premiers tokens, sans toucher au
+    reste du texte (pas de décodage). Sans tokenizer rapide, on compte
+    environ 4 caractères par token.
+    """
+    spans = _token_spans(pipe, text)
+    if spans is None:
+        return text[:max_tokens * 4]
+    if len(spans) <= max_tokens:
+        return text
+    return text[:spans[max_tokens - 1][1]]
+
+
+def split_by_tokens(pipe, text: str, max_tokens: int, chunk_tokens: int) -> List[str]:
+    """
+    Le texte entier s'il tient en `max_tokens`, sinon des morceaux d'au plus
+    `chunk_tokens` tokens, coupés de préférence après une fin de phrase :
+    un article complété à la fin garde ses premiers morceaux à l'identique.
+    """
+    spans = _token_spans(pipe, text)
+    if spans is None:
+        size = chunk_tokens * 4
+        return [text] if len(text) <= max_tokens * 4 else [text[i:i + size] for i in range(0, len(text), size)]
+    if len(spans) <= max_tokens:
+        return [text]
+
+    chunks: List[str] = []
+    first = 0
+    while first < len(spans):
+        last = min(first + chunk_tokens, len(spans))
+        if last < len(spans):
+            for k in range(last - 1, first + chunk_tokens // 2, -1):
+                if text[spans[k][1] - 1] in ".!?":
+                    last = k + 1
+                    break
+        chunks.append(text[spans[first][0]:spans[last - 1][1]])
+        first = last
+    return chunks
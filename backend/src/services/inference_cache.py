@@ -0,0 +1,141 @@
+"""
+Cache des résultats d'inférence, indexé par empreinte du contenu.
+
+Les dépêches AFP/Reuters reviennent sous des dizaines d'URLs différentes :
+on mémorise le résultat de BERT et de BART + SpaCy par sha256 du texte
+normalisé et du couple modèle@version. Un texte déjà vu coûte une lecture
+SQLite au lieu de plusieurs secondes de calcul.
+
+Les résultats vivent dans le cache disque (nexis_cache.db, non versionné,
+voir disk_cache) : nexis.db, commitée chaque jour, ne grossit pas avec les
+résumés des morceaux de longs articles.
+"""
+import os
+import threading
+import unicodedata
+from typing import Callable, Dict, List, Optional
+from src.services.disk_cache import DiskCache
+
+# Nombre maximal de résultats gardés (les moins récemment utilisés sont évincés)
+MAX_ENTRIES = int(os.getenv("NEXIS_INFERENCE_CACHE_MAX_ENTRIES", "20000"))
+# Durée de vie (s) d'un résultat ; 0 désactive le cache
+CACHE_TTL = float(os.getenv("NEXIS_INFERENCE_CACHE_TTL", str(30 * 24 * 3600)))
+
+_cache: Optional[DiskCache] = None
+_cache_lock = threading.Lock()
+
+
+def inference_cache() -> DiskCache:
+    """Cache partagé, ouvert au premier usage (jamais par un simple import)"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = DiskCache("inference", ttl=CACHE_TTL, max_entries=MAX_ENTRIES)
+        return _cache
+
+
+def normalize_text(text: str) -> str:
+    """Normalise un texte pour que deux copies d'une même dépêche aient la même empreinte"""
+    text = unicodedata.normalize("NFKC", text or "")
+    return " ".join(text.split())
+
+
+def content_key(model_id: str, text: str) -> str:
+    """Empreinte du texte normalisé pour un modèle donné"""
+    return DiskCache.make_key(model_id, normalize_text(text))
+
+
+def _first_occurrences(keys: List[str], known: dict) -> List[int]:
+    """Index des textes à calculer : inconnus du cache, une seule fois par empreinte"""
+    seen = set()
+    missing = []
+    for i, key in enumerate(keys):
+        if key not in known and key not in seen:
+            seen.add(key)
+            missing.append(i)
+    return missing
+
+
+def _fill_duplicates(keys: List[str], results: list) -> list:
+    """Recopie le résultat calculé sur les doublons d'un même lot"""
+    by_key = {key: result for key, result in zip(keys, results) if result is not None}
+    return [by_key.get(key) for key in keys]
+
+
+def cached_sentiments(analyzer, texts: List[str]) -> List[tuple[float, str]]:
+    """
+    analyzer.analyze_batch() avec cache : seuls les textes inconnus passent par BERT.
+
+    Returns:
+        Liste de (score, label), dans le même ordre que `texts`
+    """
+    cache = inference_cache()
+    keys = [content_key(analyzer.cache_id, text) for text in texts]
+    known = cache.get_many(keys)
+    results = [tuple(known[key]) if key in known else None for key in keys]
+    missing = _first_occurrences(keys, known)
+    print(f"   ♻️ Cache sentiment : {sum(key in known for key in keys)}/{len(texts)} déjà connus")
+
+    entries: Dict[str, list] = {}
+    computed = analyzer.analyze_batch([texts[i] for i in missing]) if missing else []
+    for i, (score, label) in zip(missing, computed):
+        results[i] = (score, label)
+        entries[keys[i]] = [score, label]
+    cache.set_many(entries)
+    return _fill_duplicates(keys, results)
+
+
+def cached_analyses(llm_processor, texts: List[str]) -> List[Optional[dict]]:
+    """
+    llm_processor.analyze_many() avec cache : seuls les textes inconnus passent par BART + SpaCy.
+
+    Returns:
+        Pour chaque texte, un dictionnaire summary / reliability_score /
+        entity_count (ou None si le texte n'a pas pu être analysé)
+    """
+    cache = inference_cache()
+    keys = [content_key(llm_processor.cache_id, text) for text in texts]
+    known = cache.get_many(keys)
+    results = [known.get(key) for key in keys]
+    missing = _first_occurrences(keys, known)
+    print(f"   ♻️ Cache résumés : {sum(key in known for key in keys)}/{len(texts)} déjà connus")
+
+    entries: Dict[str, dict] = {}
+    analyses = llm_processor.analyze_many([texts[i] for i in missing]) if missing else []
+    for i, analysis in zip(missing, analyses):
+        if not analysis:
+            continue
+        results[i] = {
+            "summary": analysis.summary,
+            "reliability_score": analysis.reliability_score,
+            "entity_count": len(analysis.sources),
+        }
+        # Un résumé en échec ne doit pas être figé dans le cache
+        if analysis.summary != "Non disponible":
+            entries[keys[i]] = results[i]
+    cache.set_many(entries)
+    return _fill_duplicates(keys, results)
+
+
+def cached_summaries(summarize: Callable[[List[str]], List[str]], model_id: str,
+                     texts: List[str]) -> List[str]:
+    """
+    summarize() avec cache : seuls les textes inconnus sont résumés.
+
+    Sert aux morceaux des longs articles (voir LLMProcessor) : quand un
+    article est mis à jour, seuls ses morceaux modifiés repassent par BART.
+    """
+    cache = inference_cache()
+    keys = [content_key(model_id, text) for text in texts]
+    known = cache.get_many(keys)
+    results = [known.get(key) for key in keys]
+    missing = _first_occurrences(keys, known)
+
+    entries: Dict[str, str] = {}
+    computed = summarize([texts[i] for i in missing]) if missing else []
+    for i, summary in zip(missing, computed):
+        results[i] = summary
+        if summary != "Non disponible":
+            entries[keys[i]] = summary
+    cache.set_many(entries)
+    return _fill_duplicates(keys, results)
@@ -0,0 +1,278 @@
+"""
+Serveur d'inférence local partagé par l'interface, le CLI et le job quotidien.
+
+Chaque point d'entrée chargeait sa propre copie de BERT, BART et SpaCy
+(plusieurs Go par processus) et payait leur démarrage à froid. Lancé une
+fois (`python -m src.services.inference_server` depuis backend/), ce
+démon garde une seule copie chaude des modèles et répond en HTTP sur
+localhost :
+
+- GET  /health    : identifiants de cache des modèles servis
+- POST /sentiment : {"texts": [...]} -> {"results": [[score, label], ...]}
+- POST /analyze   : {"texts": [...]} -> {"results": [analyse ou null, ...]}
+                    (résumé BART + entités SpaCy + fiabilité)
+
+Les requêtes simultanées de plusieurs clients sont regroupées (Batcher) :
+un lot part dès qu'il atteint MAX_BATCH textes ou après MAX_WAIT_MS.
+
+Côté client, le registre de modèles interroge /health au premier usage :
+si le serveur répond, SentimentAnalyzer et LLMProcessor sont remplacés par
+des doublures distantes de même interface ; sinon les modèles sont chargés
+dans le processus, comme avant. Si le serveur s'arrête en cours de route,
+les doublures utilisent un modèle local jusqu'à son retour.
+"""
+import os
+import json
+import errno
+import time
+import queue
+import logging
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SERVER_HOST = os.getenv("NEXIS_INFERENCE_HOST", "127.0.0.1")
+SERVER_PORT = int(os.getenv("NEXIS_INFERENCE_PORT", "8765"))
+# "auto" : utiliser le serveur s'il répond ; "off" : toujours charger les modèles ici
+SERVER_MODE = os.getenv("NEXIS_INFERENCE_SERVER", "auto")
+# Regroupement des requêtes : taille maximale d'un lot et attente maximale (ms)
+MAX_BATCH = int(os.getenv("NEXIS_INFERENCE_MAX_BATCH", "32"))
+MAX_WAIT_MS = float(os.getenv("NEXIS_INFERENCE_MAX_WAIT_MS", "20"))
+# Délai max (s) d'une réponse (un gros lot de résumés peut prendre plusieurs minutes)
+REQUEST_TIMEOUT = float(os.getenv("NEXIS_INFERENCE_TIMEOUT", "600"))
+HEALTH_TIMEOUT = 0.5
+# Délai (s) avant de réinterroger un serveur injoignable
+RETRY_AFTER = float(os.getenv("NEXIS_INFERENCE_RETRY_AFTER", "60"))
+
+
+class Batcher:
+    """
+    Regroupe les textes de requêtes concurrentes en un seul appel à `fn`.
+
+    Un thread unique appelle le modèle : les requêtes ne se disputent ni
+    le modèle ni son tokenizer.
+    """
+
+    def __init__(self, name: str, fn: Callable[[List[str]], list],
+                 max_batch: int = MAX_BATCH, max_wait_ms: float = MAX_WAIT_MS):
+        self.fn = fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        threading.Thread(target=self._run, name=f"nexis-batch-{name}", daemon=True).start()
+
+    def submit(self, texts: List[str]) -> list:
+        """Résultats de `texts`, dans l'ordre (bloque jusqu'au traitement du lot)"""
+        future = Future()
+        self._queue.put((texts, future))
+        return future.result()
+
+    def _run(self):
+        while True:
+            pending = [self._queue.get()]
+            size = len(pending[0][0])
+            deadline = time.monotonic() + self.max_wait
+            while size < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                pending.append(item)
+                size += len(item[0])
+
+            texts = [text for batch, _ in pending for text in batch]
+            try:
+                results = self.fn(texts)
+            except Exception as e:
+                for _, future in pending:
+                    future.set_exception(e)
+                continue
+
+            offset = 0
+            for batch, future in pending:
+                future.set_result(results[offset:offset + len(batch)])
+                offset += len(batch)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "NexisInference/1"
+
+    def do_GET(self):
+        if self.path != "/health":
+            return self._reply(404, {"error": "inconnu"})
+        self._reply(200, self.server.health)
+
+    def do_POST(self):
+        batcher = self.server.batchers.get(self.path)
+        if batcher is None:
+            return self._reply(404, {"error": "inconnu"})
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            texts = json.loads(self.rfile.read(length))["texts"]
+            self._reply(200, {"results": batcher.submit(texts)})
+        except Exception as e:
+            logger.error(f"Erreur d'inférence ({self.path}) : {e}")
+            self._reply(500, {"error": str(e)})
+
+    def _reply(self, status: int, payload: dict):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Une ligne par requête noierait les journaux
+        pass
+
+
+def create_server(host: str = SERVER_HOST, port: int = SERVER_PORT) -> ThreadingHTTPServer:
+    """Charge les modèles (dans ce processus ou le pool) et prépare le serveur"""
+    from src.services import model_registry
+
+    analyzer = model_registry.local_sentiment_analyzer()
+    llm_processor = model_registry.local_llm_processor()
+
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.health = {"sentiment": analyzer.cache_id, "llm": llm_processor.cache_id}
+    server.batchers = {
+        "/sentiment": Batcher("sentiment", lambda texts: [list(r) for r in analyzer.analyze_batch(texts)]),
+        "/analyze": Batcher("analyze", lambda texts: [
+            analysis.model_dump() if analysis else None
+            for analysis in llm_processor.analyze_many(texts)
+        ]),
+    }
+    return server
+
+
+def _post(path: str, texts: List[str]) -> list:
+    request = urllib.request.Request(
+        f"http://{SERVER_HOST}:{SERVER_PORT}{path}",
+        data=json.dumps({"texts": texts}).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT) as response:
+        return json.loads(response.read())["results"]
+
+
+def server_health() -> Optional[dict]:
+    """Réponse de /health, ou None si aucun serveur n'écoute (ou si désactivé)"""
+    if SERVER_MODE == "off":
+        return None
+    try:
+        url = f"http://{SERVER_HOST}:{SERVER_PORT}/health"
+        with urllib.request.urlopen(url, timeout=HEALTH_TIMEOUT) as response:
+            return json.loads(response.read())
+    except (OSError, ValueError):
+        return None
+
+
+def _unreachable(reason) -> bool:
+    """Vrai si aucun serveur n'écoute (refus de connexion, hôte ou réseau injoignable)"""
+    if isinstance(reason, ConnectionRefusedError):
+        return True
+    return isinstance(reason, OSError) and reason.errno in (errno.ENETUNREACH, errno.EHOSTUNREACH)
+
+
+class _RemoteModel:
+    """
+    Appels au serveur, avec repli sur un modèle local tant que le serveur est éteint.
+
+    Seul un serveur injoignable déclenche le repli : une erreur HTTP (lot
+    invalide, exception côté serveur) ou un délai dépassé remonte à
+    l'appelant, sans charger plusieurs Go de modèles dans ce processus.
+    Le serveur est réinterrogé toutes les RETRY_AFTER secondes ; dès qu'il
+    répond, le modèle local est libéré.
+    """
+
+    path = ""
+
+    def __init__(self, cache_id: str, local_factory: Callable[[], object]):
+        # Identifiant du modèle servi : le cache d'inférence reste cohérent avec le serveur
+        self.cache_id = cache_id
+        self._local_factory = local_factory
+        self._local = None
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+
+    def _call(self, texts: List[str]) -> Optional[list]:
+        """Résultats du serveur, ou None s'il est éteint (le modèle local prend le relais)"""
+        if time.monotonic() < self._retry_at:
+            return None
+        try:
+            results = _post(self.path, texts)
+        except urllib.error.URLError as e:
+            if isinstance(e, urllib.error.HTTPError) or not _unreachable(e.reason):
+                raise
+            print(f"⚠️ Serveur d'inférence injoignable ({e.reason}) : modèles locaux "
+                  f"pendant {RETRY_AFTER:g} s")
+            self._retry_at = time.monotonic() + RETRY_AFTER
+            return None
+
+        if self._local is not None:
+            with self._lock:
+                self._local = None
+            print("✅ Serveur d'inférence de retour : modèles locaux libérés")
+        return results
+
+    def _local_model(self):
+        with self._lock:
+            if self._local is None:
+                self._local = self._local_factory()
+            return self._local
+
+
+class RemoteSentimentAnalyzer(_RemoteModel):
+    """SentimentAnalyzer servi par le serveur d'inférence (même interface)"""
+
+    path = "/sentiment"
+
+    def analyze(self, text: str) -> tuple[float, str]:
+        return self.analyze_batch([text])[0]
+
+    def analyze_batch(self, texts: List[str], batch_size: int = None) -> List[tuple[float, str]]:
+        if not texts:
+            return []
+        results = self._call(texts)
+        if results is None:
+            return self._local_model().analyze_batch(texts)
+        return [(score, label) for score, label in results]
+
+
+class RemoteLLMProcessor(_RemoteModel):
+    """LLMProcessor servi par le serveur d'inférence (même interface)"""
+
+    path = "/analyze"
+
+    def analyze_content(self, text: str):
+        return self.analyze_many([text])[0]
+
+    def analyze_many(self, texts: List[str], batch_size: int = None, n_process: int = None) -> list:
+        if not texts:
+            return []
+        results = self._call(texts)
+        if results is None:
+            return self._local_model().analyze_many(texts)
+        from src.services.llm_processor import ArticleAnalysis
+        return [ArticleAnalysis(**result) if result else None for result in results]
+
+
+if __name__ == "__main__":
+    server = create_server()
+    print(f"✅ Serveur d'inférence prêt sur http://{SERVER_HOST}:{SERVER_PORT}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Arrêt du serveur d'inférence")
+    finally:
+        server.server_close()
@@ -1,11 +1,24 @@
+import os
 import logging
+import threading
 import spacy
 from typing import List, Optional
 from pydantic import BaseModel
-from transformers import pipeline
+from src.services.inference_backend import (
+    INFERENCE_BACKEND, cache_suffix, load_pipeline, split_by_tokens, token_budget, truncate_to_tokens,
+)
 
 logger = logging.getLogger(__name__)
 
+# Réglages du traitement par lots (surchargeables via le .env)
+SUMMARY_BATCH_SIZE = int(os.getenv("NEXIS_SUMMARY_BATCH_SIZE", "4"))
+NER_BATCH_SIZE = int(os.getenv("NEXIS_NER_BATCH_SIZE", "32"))
+NER_PROCESSES = int(os.getenv("NEXIS_NER_PROCESSES", "1"))
+# Textes trop longs pour BART : résumé de chaque morceau puis résumé des résumés
+CHUNKED_SUMMARY = os.getenv("NEXIS_CHUNKED_SUMMARY", "1") == "1"
+# Taille (tokens) des morceaux d'un long texte
+SUMMARY_CHUNK_TOKENS = int(os.getenv("NEXIS_SUMMARY_CHUNK_TOKENS", "900"))
+
 # --- MODÈLES DE DONNÉES ---
 class SourceEntity(BaseModel):
     name: str
@@ -18,44 +31,152 @@ class ArticleAnalysis(BaseModel):
     reliability_score: int
 
 class LLMProcessor:
-    def __init__(self):
+    SUMMARY_MODEL = "facebook/bart-large-cnn"
+    NER_MODEL = "fr_core_news_md"
+    # À incrémenter si le pré/post-traitement change (invalide le cache d'inférence)
+    MODEL_VERSION = "2"
+    # Moteur d'inférence de BART : torch (fp32), int8 ou onnx (voir inference_backend)
+    backend = INFERENCE_BACKEND
+
+    def __init__(self, backend: str = None):
         print("⏳ Chargement des modèles IA (ça peut être long au 1er lancement)...")
+        # Ni BART (et son tokenizer rapide) ni SpaCy ne sont thread-safe : une
+        # instance partagée (registre de modèles) sert un thread à la fois
+        self._lock = threading.RLock()
         
         # 1. Résumeur (Modèle Facebook BART)
         try:
-            self.summarizer = pipeline("summarization", model="facebook/bart-large-cnn")
+            self.summarizer, self.backend = load_pipeline("summarization", self.SUMMARY_MODEL, backend)
         except Exception as e:
             logger.error(f"Erreur summarizer: {e}")
             self.summarizer = None
 
         # 2. Analyseur de Sources (SpaCy)
         try:
-            self.nlp = spacy.load("fr_core_news_md")
+            self.nlp = spacy.load(self.NER_MODEL)
         except Exception as e:
             logger.error(f"Erreur SpaCy: {e}")
             self.nlp = None
 
+    @property
+    def cache_id(self) -> str:
+        """Identifiant modèles + version + moteur utilisé comme clé du cache d'inférence"""
+        return f"{self.SUMMARY_MODEL}+{self.NER_MODEL}@{self.MODEL_VERSION}{cache_suffix(self.backend)}"
+
     def analyze_content(self, text: str) -> Optional[ArticleAnalysis]:
-        if not text or len(text) < 200:
-            return None
+        return self.analyze_many([text])[0]
+
+    def analyze_many(
+        self,
+        texts: List[str],
+        batch_size: int = SUMMARY_BATCH_SIZE,
+        n_process: int = NER_PROCESSES,
+    ) -> List[Optional[ArticleAnalysis]]:
+        """
+        Analyse un lot de textes (résumé + sources) en un minimum de passes.
+
+        Args:
+            texts: Textes à analyser
+            batch_size: Nombre de textes par lot envoyé à BART
+            n_process: Nombre de processus SpaCy pour l'extraction d'entités
+
+        Returns:
+            Une analyse par texte, dans le même ordre (None si texte trop court)
+        """
+        results: List[Optional[ArticleAnalysis]] = [None] * len(texts)
+        indexes = [i for i, text in enumerate(texts) if text and len(text) >= 200]
+        if not indexes:
+            return results
+
+        with self._lock:
+            # A. GÉNÉRATION DES RÉSUMÉS
+            summaries = self._summarize_many([texts[i] for i in indexes], batch_size)
+
+            # B. EXTRACTION DES SOURCES (Source Pyramid)
+            if self.nlp:
+                # Seul le NER nous intéresse : on coupe le reste du pipeline
+                disabled = [name for name in self.nlp.pipe_names if name not in ("tok2vec", "ner")]
+                # nlp.pipe est paresseux : les documents sont produits sous le verrou
+                docs = list(self.nlp.pipe(
+                    (texts[i] for i in indexes),
+                    disable=disabled,
+                    batch_size=NER_BATCH_SIZE,
+                    n_process=n_process,
+                ))
+            else:
+                docs = [None] * len(indexes)
+
+        for i, summary_text, doc in zip(indexes, summaries, docs):
+            results[i] = self._build_analysis(summary_text, doc)
 
-        # A. GÉNÉRATION DU RÉSUMÉ
-        summary_text = "Non disponible"
-        if self.summarizer:
+        return results
+
+    def _summarize_many(self, texts: List[str], batch_size: int) -> List[str]:
+        """
+        Résume des textes, chacun limité à la longueur d'entrée réelle de BART.
+
+        En mode découpé (CHUNKED_SUMMARY), un texte trop long est coupé en
+        morceaux de SUMMARY_CHUNK_TOKENS tokens. Les morceaux de tous les
+        textes sont résumés en une passe (avec cache), puis chaque texte est
+        résumé à partir de la suite de ses résumés partiels, dans la même
+        passe que les textes courts.
+        """
+        if not self.summarizer:
+            return ["Non disponible"] * len(texts)
+
+        budget = token_budget(self.summarizer)
+        if not CHUNKED_SUMMARY:
+            return self._summarize_batch([truncate_to_tokens(self.summarizer, t, budget) for t in texts], batch_size)
+
+        chunk_tokens = min(SUMMARY_CHUNK_TOKENS, budget)
+        pieces = [split_by_tokens(self.summarizer, text, budget, chunk_tokens) for text in texts]
+        chunks = [chunk for parts in pieces if len(parts) > 1 for chunk in parts]
+        if chunks:
+            from src.services.inference_cache import cached_summaries
+            print(f"   ✂️ {len(chunks)} morceaux pour {sum(len(p) > 1 for p in pieces)} texte(s) trop long(s)")
+            partial = iter(cached_summaries(
+                lambda todo: self._summarize_batch(todo, batch_size), f"{self.cache_id}#morceau", chunks,
+            ))
+
+        inputs = []
+        for parts in pieces:
+            if len(parts) == 1:
+                inputs.append(parts[0])
+            else:
+                summaries = [next(partial) for _ in parts]
+                joined = " ".join(summary for summary in summaries if summary != "Non disponible")
+                # Aucun morceau résumé : on retombe sur le début du texte
+                inputs.append(truncate_to_tokens(self.summarizer, joined or parts[0], budget))
+        return self._summarize_batch(inputs, batch_size)
+
+    def _summarize_batch(self, texts: List[str], batch_size: int) -> List[str]:
+        """Résume des textes (déjà à la bonne longueur) par lots de longueurs proches"""
+        summaries = ["Non disponible"] * len(texts)
+
+        # Tri par longueur : chaque lot regroupe des textes de taille proche
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+
+        for start in range(0, len(order), batch_size):
+            bucket = order[start:start + batch_size]
             try:
-                # On coupe le texte pour ne pas saturer la mémoire
-                truncated = text[:3000]
-                res = self.summarizer(truncated, max_length=130, min_length=30, do_sample=False)
-                summary_text = res[0]['summary_text']
+                res = self.summarizer(
+                    [texts[i] for i in bucket],
+                    max_length=130, min_length=30, do_sample=False,
+                    batch_size=len(bucket), truncation=True,
+                )
+                for i, item in zip(bucket, res):
+                    summaries[i] = item['summary_text']
             except Exception as e:
-                logger.error(f"Erreur résumé : {e}")
+                logger.error(f"Erreur résumé (lot) : {e}")
+
+        return summaries
 
-        # B. EXTRACTION DES SOURCES (Source Pyramid)
+    def _build_analysis(self, summary_text: str, doc) -> ArticleAnalysis:
+        """Construit l'analyse à partir du résumé et du document SpaCy"""
         found_sources = []
         score = 50 
 
-        if self.nlp:
-            doc = self.nlp(text)
+        if doc is not None:
             entities = {}
             # On cherche les noms de personnes (PER) et organisations (ORG)
             for ent in doc.ents:
@@ -77,4 +198,4 @@ class LLMProcessor:
             summary=summary_text,
             sources=found_sources,
             reliability_score=score
-        )
\ No newline at end of file
+        )
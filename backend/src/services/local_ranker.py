@@ -0,0 +1,153 @@
+"""
+Classement local des articles par importance, sans appel réseau.
+
+Alternative déterministe à Gemini : chaque article reçoit un score linéaire
+calculé en une passe numpy sur tout le lot (quelques millisecondes pour une
+centaine d'articles). Caractéristiques, toutes ramenées entre 0 et 1 :
+
+- story      : nombre de médias reprenant l'histoire (source_count) et
+               d'articles d'autres sources très proches dans le lot
+- salience   : proximité TF-IDF avec le centre du corpus du jour
+               (l'article parle-t-il de ce dont tout le monde parle ?)
+- recency    : fraîcheur depuis la publication (demi-vie de RECENCY_HALF_LIFE_HOURS)
+- authority  : réputation de la source (SOURCE_AUTHORITY)
+- extremity  : intensité du sentiment, |sentiment_score|
+
+Le score de fiabilité n'en fait pas partie : il n'est calculé qu'au
+résumé (après le classement) et vaut donc toujours 50 ici.
+
+Le classement est utilisable comme classement principal (NEXIS_RANKER=local)
+ou comme repli de Gemini (par défaut). Voir backend/evaluate_ranker.py pour
+le comparer aux classements Gemini enregistrés.
+"""
+import os
+from datetime import datetime
+from typing import Dict, List
+import numpy as np
+from src.services.story_clustering import tokenize
+
+# Poids des caractéristiques dans le score final
+WEIGHTS: Dict[str, float] = {
+    "story": 0.30,
+    "salience": 0.25,
+    "recency": 0.15,
+    "authority": 0.20,
+    "extremity": 0.10,
+}
+FEATURES = list(WEIGHTS)
+
+# Cosinus TF-IDF au-delà duquel deux articles racontent la même histoire
+STORY_SIMILARITY = float(os.getenv("NEXIS_RANKER_STORY_SIMILARITY", "0.35"))
+RECENCY_HALF_LIFE_HOURS = float(os.getenv("NEXIS_RANKER_HALF_LIFE_HOURS", "24"))
+
+# Autorité des sources (nom NewsAPI en minuscules) ; les autres valent DEFAULT_AUTHORITY
+SOURCE_AUTHORITY: Dict[str, float] = {
+    "le monde": 1.0,
+    "afp": 1.0,
+    "reuters": 1.0,
+    "les echos": 0.9,
+    "le figaro": 0.9,
+    "franceinfo": 0.9,
+    "france info": 0.9,
+    "libération": 0.85,
+    "liberation": 0.85,
+    "la tribune": 0.8,
+    "le parisien": 0.75,
+    "ouest-france": 0.75,
+    "l'equipe": 0.75,
+    "l'express": 0.7,
+    "le point": 0.7,
+    "20 minutes": 0.65,
+    "bfmtv": 0.65,
+    "rfi": 0.85,
+    "france 24": 0.85,
+}
+DEFAULT_AUTHORITY = 0.5
+
+
+def _text(art) -> str:
+    return f"{art.title or ''} {(art.content or '')[:300]}"
+
+
+def _tfidf(texts: List[str]) -> np.ndarray:
+    """Matrice TF-IDF (une ligne normalisée par texte)"""
+    docs = [tokenize(text) for text in texts]
+    vocabulary = {token: i for i, token in enumerate(sorted({t for doc in docs for t in doc}))}
+    counts = np.zeros((len(docs), max(len(vocabulary), 1)))
+    for row, doc in enumerate(docs):
+        for token in doc:
+            counts[row, vocabulary[token]] += 1
+
+    df = np.count_nonzero(counts, axis=0)
+    idf = np.log((1 + len(docs)) / (1 + df)) + 1
+    tfidf = np.log1p(counts) * idf
+    norms = np.linalg.norm(tfidf, axis=1, keepdims=True)
+    return tfidf / np.where(norms == 0, 1, norms)
+
+
+def _age_hours(art, now: datetime) -> float:
+    published = getattr(art, "published_date", None) or getattr(art, "created_at", None) or now
+    return max((now - published.replace(tzinfo=None)).total_seconds() / 3600, 0)
+
+
+def _minmax(column: np.ndarray) -> np.ndarray:
+    span = column.max() - column.min()
+    return (column - column.min()) / span if span > 0 else np.zeros_like(column)
+
+
+class LocalRanker:
+    """Classe les articles par importance avec un score numpy, sans réseau"""
+
+    def __init__(self, weights: Dict[str, float] = None):
+        self.weights = np.array([(weights or WEIGHTS)[name] for name in FEATURES])
+
+    def features(self, articles: list, now: datetime = None) -> np.ndarray:
+        """Matrice (articles × FEATURES) des caractéristiques normalisées"""
+        now = now or datetime.now()
+        n = len(articles)
+
+        vectors = _tfidf([_text(art) for art in articles])
+        similarity = vectors @ vectors.T
+        sources = np.array([(art.source or "").lower() for art in articles])
+        other_source = sources[:, None] != sources[None, :]
+        echoes = ((similarity >= STORY_SIMILARITY) & other_source).sum(axis=1)
+        source_count = np.array([max(art.source_count or 1, 1) for art in articles], dtype=float)
+        story = np.log1p(source_count - 1 + echoes)
+
+        centroid = vectors.mean(axis=0)
+        salience = vectors @ centroid
+
+        ages = np.array([_age_hours(art, now) for art in articles])
+        recency = 0.5 ** (ages / RECENCY_HALF_LIFE_HOURS)
+
+        authority = np.array([SOURCE_AUTHORITY.get(source, DEFAULT_AUTHORITY) for source in sources])
+        extremity = np.abs(np.array([art.sentiment_score or 0.0 for art in articles]))
+
+        matrix = np.column_stack([story, salience, recency, authority, extremity])
+        # story et salience n'ont de sens que relativement au lot
+        matrix[:, 0] = _minmax(matrix[:, 0])
+        matrix[:, 1] = _minmax(matrix[:, 1])
+        return matrix.reshape(n, len(FEATURES))
+
+    def score(self, articles: list, now: datetime = None) -> np.ndarray:
+        """Score d'importance de chaque article (plus haut = plus important)"""
+        if not articles:
+            return np.zeros(0)
+        return self.features(articles, now) @ self.weights
+
+    def rank_articles(self, articles: list, top_n: int = 10, now: datetime = None) -> list:
+        """
+        Classe les articles par importance (même interface qu'ImportanceRanker)
+
+        Returns:
+            Liste des top_n articles les plus importants
+        """
+        if len(articles) <= 1:
+            return articles[:top_n]
+        # Tri stable : à score égal, l'ordre d'arrivée est conservé
+        order = np.argsort(-self.score(articles, now), kind="stable")
+        return [articles[i] for i in order[:top_n]]
+
+    def rank_topics(self, candidates: Dict[str, list], top_n: int = 10) -> Dict[str, list]:
+        """Classe chaque sujet séparément (même interface qu'ImportanceRanker)"""
+        return {topic: self.rank_articles(articles, top_n) for topic, articles in candidates.items()}
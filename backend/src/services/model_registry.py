@@ -0,0 +1,154 @@
+"""
+Registre des modèles partagés par tout le processus.
+
+Chaque service lourd (BERT, BART + SpaCy, clients NewsAPI et Gemini) n'est
+chargé qu'une seule fois, au premier usage, puis réutilisé par tous les
+RSSScraper : une recherche Gradio ne paie plus que l'inférence.
+Avec NEXIS_WORKER_PROCESSES > 0, BERT et BART + SpaCy tournent dans un
+pool de processus (voir worker_pool). Si le serveur d'inférence local
+répond (voir inference_server), ils ne sont pas chargés du tout : tous les
+points d'entrée partagent la copie du serveur.
+"""
+import os
+import logging
+import threading
+from typing import Callable, Dict, Iterable
+
+logger = logging.getLogger(__name__)
+
+# Classement principal : "gemini" (repli local si NEXIS_RANKER_FALLBACK=local) ou "local"
+RANKER = os.getenv("NEXIS_RANKER", "gemini")
+RANKER_FALLBACK = os.getenv("NEXIS_RANKER_FALLBACK", "local")
+
+_instances: Dict[str, object] = {}
+_locks: Dict[str, threading.Lock] = {}
+_registry_lock = threading.Lock()
+
+
+def local_sentiment_analyzer():
+    """BERT chargé dans ce processus, ou réparti dans le pool de processus"""
+    from src.services import worker_pool
+    if worker_pool.WORKER_PROCESSES > 0:
+        return worker_pool.PooledSentimentAnalyzer()
+    from src.services.sentiment_analyzer import SentimentAnalyzer
+    return SentimentAnalyzer()
+
+
+def local_llm_processor():
+    """BART + SpaCy chargés dans ce processus, ou répartis dans le pool de processus"""
+    from src.services import worker_pool
+    if worker_pool.WORKER_PROCESSES > 0:
+        return worker_pool.PooledLLMProcessor()
+    from src.services.llm_processor import LLMProcessor
+    return LLMProcessor()
+
+
+def _sentiment_analyzer():
+    from src.services import inference_server
+    from src.services.sentiment_cascade import SENTIMENT_CASCADE, CascadeSentimentAnalyzer
+    health = inference_server.server_health()
+    if health:
+        analyzer = inference_server.RemoteSentimentAnalyzer(health["sentiment"], local_sentiment_analyzer)
+    else:
+        analyzer = local_sentiment_analyzer()
+    # Le lexique tranche les textes évidents, BERT (local, pool ou serveur) les autres
+    return CascadeSentimentAnalyzer(analyzer) if SENTIMENT_CASCADE else analyzer
+
+
+def _llm_processor():
+    from src.services import inference_server
+    health = inference_server.server_health()
+    if health:
+        return inference_server.RemoteLLMProcessor(health["llm"], local_llm_processor)
+    return local_llm_processor()
+
+
+def _news_api():
+    from src.services.news_api_service import NewsAPIService
+    return NewsAPIService()
+
+
+def _ranker():
+    from src.services.local_ranker import LocalRanker
+    if RANKER == "local":
+        return LocalRanker()
+    from src.services.importance_ranker import ImportanceRanker
+    return ImportanceRanker(fallback=LocalRanker() if RANKER_FALLBACK == "local" else None)
+
+
+# Fabriques connues du registre (nom -> constructeur)
+FACTORIES: Dict[str, Callable[[], object]] = {
+    "sentiment": _sentiment_analyzer,
+    "llm": _llm_processor,
+    "news_api": _news_api,
+    "ranker": _ranker,
+}
+
+
+def get(name: str):
+    """
+    Retourne l'instance partagée `name`, en la créant au premier appel.
+
+    Le verrou est propre à chaque modèle : deux threads qui demandent BERT
+    attendent le même chargement, sans bloquer celui qui demande BART.
+    L'inférence est ensuite sérialisée par le verrou de chaque instance
+    (SentimentAnalyzer, LLMProcessor) : ni les pipelines Hugging Face, ni
+    leurs tokenizers rapides, ni SpaCy ne supportent deux threads à la fois.
+    """
+    instance = _instances.get(name)
+    if instance is not None:
+        return instance
+
+    with _registry_lock:
+        lock = _locks.setdefault(name, threading.Lock())
+
+    with lock:
+        # Double vérification : un autre thread a pu charger entre-temps
+        if name not in _instances:
+            _instances[name] = FACTORIES[name]()
+        return _instances[name]
+
+
+def get_sentiment_analyzer():
+    return get("sentiment")
+
+
+def get_llm_processor():
+    return get("llm")
+
+
+def get_news_api():
+    return get("news_api")
+
+
+def get_ranker():
+    return get("ranker")
+
+
+def prewarm(names: Iterable[str] = None, background: bool = True):
+    """
+    Précharge les modèles pour que la première recherche ne les attende pas.
+
+    Args:
+        names: Modèles à charger (tous par défaut)
+        background: Si True, charge dans un thread démon et rend la main
+
+    Returns:
+        Le thread de chargement (ou None si chargement synchrone)
+    """
+    names = list(names or FACTORIES)
+
+    def _load():
+        for name in names:
+            try:
+                get(name)
+            except Exception as e:
+                logger.error(f"Préchargement de '{name}' impossible : {e}")
+
+    if not background:
+        _load()
+        return None
+
+    thread = threading.Thread(target=_load, name="nexis-prewarm", daemon=True)
+    thread.start()
+    return thread
@@ -4,6 +4,7 @@ from newsapi import NewsApiClient
 from datetime import datetime, timedelta
 from typing import List
 from dotenv import load_dotenv
+from src.services.disk_cache import DiskCache
 
 # Charger le .env depuis le dossier backend
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -11,6 +12,10 @@ backend_dir = os.path.dirname(os.path.dirname(current_dir))
 dotenv_path = os.path.join(backend_dir, '.env')
 load_dotenv(dotenv_path)
 
+# Cache des réponses NewsAPI : durée de vie (secondes) et nombre max d'entrées
+CACHE_TTL = float(os.getenv("NEXIS_NEWSAPI_CACHE_TTL", "1800"))
+CACHE_MAX_ENTRIES = int(os.getenv("NEXIS_NEWSAPI_CACHE_MAX_ENTRIES", "500"))
+
 class NewsAPIService:
     """Service pour interagir avec NewsAPI"""
     
@@ -22,6 +27,7 @@ class NewsAPIService:
         else:
             self.client = NewsApiClient(api_key=api_key)
             print("✅ NewsAPI initialisé")
+        self.cache = DiskCache("newsapi", ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES)
     
     def search_articles(self, query: str, max_results: int = 10) -> List[dict]:
         """Recherche d'articles via NewsAPI"""
@@ -31,17 +37,26 @@ class NewsAPIService:
         
         try:
             from_date = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
+            language = 'fr'
+            page_size = min(max_results, 100)
             
-            response = self.client.get_everything(
-                q=query,
-                language='fr',
-                from_param=from_date,
-                sort_by='relevancy',
-                page_size=min(max_results, 100)
-            )
+            # Une recherche identique récente ne repasse pas par le réseau
+            raw_articles = self.cache.get(query, language, from_date, page_size)
+            if raw_articles is None:
+                response = self.client.get_everything(
+                    q=query,
+                    language=language,
+                    from_param=from_date,
+                    sort_by='relevancy',
+                    page_size=page_size
+                )
+                raw_articles = response.get('articles', [])
+                self.cache.set(raw_articles, query, language, from_date, page_size)
+            else:
+                print(f"♻️ NewsAPI : réponse en cache pour '{query}'")
             
             articles = []
-            for art in response.get('articles', []):
+            for art in raw_articles:
                 title = art['title']
                 desc = art.get('description') or ''
                 
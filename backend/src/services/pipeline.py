@@ -0,0 +1,263 @@
+"""
+Pipeline d'ingestion par étapes (producteur / consommateur).
+
+Chaque étape a ses propres threads et lit une file bornée remplie par
+l'étape précédente : pendant que BART résume les articles d'un sujet,
+NewsAPI répond pour le suivant et BERT note le troisième. Une file pleine
+bloque l'étape en amont (contre-pression) plutôt que d'accumuler des
+articles en mémoire.
+
+    fetch -> dedup -> sentiment -> rank -> enrich -> persist
+
+- fetch     : appel NewsAPI (FETCH_CONCURRENCY threads, I/O)
+- dedup     : URLs déjà connues + regroupement des reprises (1 thread : il
+              partage l'ensemble des URLs vues entre sujets)
+- sentiment : BERT (SENTIMENT_WORKERS)
+- rank      : barrière — en mode multi-sujets, attend tous les sujets pour
+              un seul appel Gemini ; découpe ensuite les articles retenus en
+              paquets de ENRICH_CHUNK_SIZE
+- enrich    : BART + SpaCy (ENRICH_WORKERS)
+- persist   : sauvegarde SQLite (1 thread, un seul écrivain)
+
+L'arrêt est propagé par des sentinelles : quand le dernier thread d'une
+étape a vidé sa file, il réveille chacun des threads de l'étape suivante.
+"""
+import os
+import queue
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from src.services.article_record import ArticleRecord
+from src.services.story_clustering import StoryCluster, StoryIndex
+from src.services.worker_pool import WORKER_PROCESSES
+
+# Taille de chaque file entre deux étapes
+QUEUE_SIZE = int(os.getenv("NEXIS_PIPELINE_QUEUE_SIZE", "8"))
+# Nombre maximal d'appels NewsAPI simultanés (étape fetch) en mode multi-sujets
+FETCH_CONCURRENCY = int(os.getenv("NEXIS_FETCH_CONCURRENCY", "4"))
+# Avec un pool de processus d'inférence, un thread par processus pour l'alimenter
+_MODEL_WORKERS = str(max(1, WORKER_PROCESSES))
+SENTIMENT_WORKERS = int(os.getenv("NEXIS_PIPELINE_SENTIMENT_WORKERS", _MODEL_WORKERS))
+ENRICH_WORKERS = int(os.getenv("NEXIS_PIPELINE_ENRICH_WORKERS", _MODEL_WORKERS))
+# Articles retenus résumés ensemble par un thread d'enrichissement
+ENRICH_CHUNK_SIZE = int(os.getenv("NEXIS_PIPELINE_ENRICH_CHUNK", "4"))
+
+_STOP = object()
+
+
+@dataclass
+class PreparedTopic:
+    """Un sujet en cours d'ingestion"""
+    topic: str
+    clusters: List[StoryCluster]
+    story_index: StoryIndex
+    # Histoires nouvelles (un représentant chacune), avant le sentiment
+    stories: List[StoryCluster] = field(default_factory=list)
+    candidates: List[ArticleRecord] = field(default_factory=list)
+    selected: List[ArticleRecord] = field(default_factory=list)
+    pending_parts: int = 0
+
+
+@dataclass
+class TopicPart:
+    """Paquet d'articles d'un sujet en route vers la sauvegarde"""
+    prepared: PreparedTopic
+    records: List[ArticleRecord]
+    enrich: bool = False
+
+
+@dataclass
+class Stage:
+    """
+    Étape du pipeline : `fn` transforme un élément en zéro, un ou plusieurs
+    éléments pour l'étape suivante. `flush`, appelé une fois l'entrée
+    épuisée, permet à une étape barrière d'émettre ce qu'elle a accumulé.
+    """
+    name: str
+    fn: Callable[[object], Iterable]
+    workers: int = 1
+    flush: Optional[Callable[[], Iterable]] = None
+
+
+class Pipeline:
+    """Étapes reliées par des files bornées, chacune avec ses threads"""
+
+    def __init__(self, stages: List[Stage], queue_size: int = QUEUE_SIZE):
+        self.stages = stages
+        # La file de sortie n'est pas bornée : l'appelant ne la lit qu'à la fin
+        self.queues = [queue.Queue(maxsize=queue_size) for _ in stages] + [queue.Queue()]
+        self._remaining = [stage.workers for stage in stages]
+        self._lock = threading.Lock()
+        self._abort = threading.Event()
+
+    def run(self, items: Iterable) -> list:
+        """Fait passer `items` par toutes les étapes ; retourne les sorties de la dernière"""
+        threads = [
+            threading.Thread(target=self._work, args=(index,), name=f"nexis-{stage.name}-{n}", daemon=True)
+            for index, stage in enumerate(self.stages)
+            for n in range(stage.workers)
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            for item in items:
+                self.queues[0].put(item)
+        except BaseException:
+            # Interruption : les threads vident leurs files sans rien traiter
+            self._abort.set()
+            raise
+        finally:
+            for _ in range(self.stages[0].workers):
+                self.queues[0].put(_STOP)
+            try:
+                for thread in threads:
+                    thread.join()
+            except BaseException:
+                # Interruption pendant l'attente : même abandon que pendant l'envoi
+                self._abort.set()
+                raise
+
+        outputs = []
+        while (item := self.queues[-1].get()) is not _STOP:
+            outputs.append(item)
+        return outputs
+
+    def _work(self, index: int):
+        stage, inbox, outbox = self.stages[index], self.queues[index], self.queues[index + 1]
+        while (item := inbox.get()) is not _STOP:
+            if not self._abort.is_set():
+                self._emit(stage, outbox, lambda: stage.fn(item))
+
+        with self._lock:
+            self._remaining[index] -= 1
+            last = self._remaining[index] == 0
+        if not last:
+            return
+        if stage.flush and not self._abort.is_set():
+            self._emit(stage, outbox, stage.flush)
+        next_workers = self.stages[index + 1].workers if index + 1 < len(self.stages) else 1
+        for _ in range(next_workers):
+            outbox.put(_STOP)
+
+    def _emit(self, stage: Stage, outbox: queue.Queue, produce: Callable[[], Iterable]):
+        try:
+            outputs = list(produce() or ())
+        except Exception as e:
+            # Un élément en erreur n'arrête pas le pipeline
+            print(f"❌ Erreur à l'étape '{stage.name}' : {e}")
+            return
+        for output in outputs:
+            outbox.put(output)
+
+
+class IngestionPipeline:
+    """Ingestion NewsAPI -> base, étape par étape, pour un RSSScraper"""
+
+    def __init__(self, scraper, cross_topic: bool = True, fetch_workers: int = None):
+        self.scraper = scraper
+        self.cross_topic = cross_topic
+        self.fetch_workers = fetch_workers
+        self._seen_urls: Set[str] = set()
+        self._waiting: List[PreparedTopic] = []
+
+    def run(self, requests: List[Tuple[str, Optional[str]]]) -> Dict[str, List[ArticleRecord]]:
+        """
+        Args:
+            requests: (sujet, mot-clé ou None) à ingérer
+
+        Returns:
+            Dictionnaire sujet -> articles retenus (liste vide en cas d'erreur)
+        """
+        fetch_workers = self.fetch_workers or FETCH_CONCURRENCY
+        pipeline = Pipeline([
+            Stage("fetch", self._fetch, workers=max(1, min(fetch_workers, len(requests)))),
+            Stage("dedup", self._dedup),
+            Stage("sentiment", self._sentiment, workers=SENTIMENT_WORKERS),
+            Stage("rank", self._rank, flush=self._rank_waiting),
+            Stage("enrich", self._enrich, workers=ENRICH_WORKERS),
+            Stage("persist", self._persist),
+        ])
+        results = {topic: [] for topic, _ in requests}
+        for prepared in pipeline.run(requests):
+            results[prepared.topic] = prepared.selected
+        return results
+
+    def _fetch(self, request):
+        topic, query = request
+        return [(topic, self.scraper.fetch_topic(topic, query))]
+
+    def _dedup(self, fetched):
+        topic, api_articles = fetched
+        return [self.scraper.dedup_topic(topic, api_articles, self._seen_urls)]
+
+    def _sentiment(self, prepared: PreparedTopic):
+        return [self.scraper.score_topic(prepared)]
+
+    def _rank(self, prepared: PreparedTopic):
+        if self.cross_topic:
+            # Barrière : un seul classement quand tous les sujets sont prêts (flush)
+            self._waiting.append(prepared)
+            return []
+        return self._split(self._select([prepared]))
+
+    def _rank_waiting(self):
+        waiting, self._waiting = self._waiting, []
+        return self._split(self._select(waiting)) if waiting else []
+
+    def _select(self, batch: List[PreparedTopic]) -> List[PreparedTopic]:
+        top_n = self.scraper.max_articles_per_topic
+        to_rank = {p.topic: p.candidates for p in batch if len(p.candidates) > top_n}
+        if to_rank:
+            print(f"🤖 Sélection des {top_n} meilleurs articles pour {len(to_rank)} sujet(s)...")
+        selections = self.scraper.ranker.rank_topics(to_rank, top_n=top_n) if to_rank else {}
+        for prepared in batch:
+            prepared.selected = selections.get(prepared.topic, prepared.candidates)
+        return batch
+
+    def _split(self, batch: List[PreparedTopic]) -> List[TopicPart]:
+        """Découpe chaque sujet : paquets à résumer + reste à sauvegarder tel quel"""
+        parts = []
+        for prepared in batch:
+            chosen = {id(record) for record in prepared.selected}
+            rest = [record for record in prepared.candidates if id(record) not in chosen]
+            topic_parts = [
+                TopicPart(prepared, prepared.selected[i:i + ENRICH_CHUNK_SIZE], enrich=True)
+                for i in range(0, len(prepared.selected), ENRICH_CHUNK_SIZE)
+            ]
+            # Toujours au moins une part : la sauvegarde enregistre aussi les histoires
+            if rest or not topic_parts:
+                topic_parts.append(TopicPart(prepared, rest))
+            prepared.pending_parts = len(topic_parts)
+            parts.extend(topic_parts)
+        return parts
+
+    def _enrich(self, part: TopicPart):
+        if part.enrich and part.records:
+            try:
+                self.scraper.enrich(part.records)
+            except Exception as e:
+                # Les articles restent en attente d'enrichissement (summary à None)
+                print(f"❌ Erreur d'enrichissement ({part.prepared.topic}) : {e}")
+        return [part]
+
+    def _persist(self, part: TopicPart):
+        prepared = part.prepared
+        try:
+            if part.records:
+                saved = self.scraper.save_many([record.to_row() for record in part.records])
+                for record in part.records:
+                    record.id = saved.get(record.url)
+                print(f"   💾 {len(saved)}/{len(part.records)} articles sauvegardés ({prepared.topic})")
+        except Exception as e:
+            # Les articles de cette part restent sans id ; le sujet est tout de même terminé
+            print(f"❌ Erreur de sauvegarde ({prepared.topic}) : {e}")
+        finally:
+            # Toujours compter la part : sinon le sujet n'est jamais rendu
+            prepared.pending_parts -= 1
+
+        if prepared.pending_parts:
+            return []
+        prepared.story_index.record(prepared.clusters)
+        print(f"\n✅ {prepared.topic} : {len(prepared.selected)} articles retenus")
+        return [prepared]
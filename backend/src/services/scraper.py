@@ -6,55 +6,117 @@ if backend_dir not in sys.path:
     sys.path.append(backend_dir)
 
 import logging
-from typing import List
-from datetime import datetime
-from src.services.sentiment_analyzer import SentimentAnalyzer
-from src.services.llm_processor import LLMProcessor
-from src.services.news_api_service import NewsAPIService
-from src.services.importance_ranker import ImportanceRanker  
-from src.database import SessionLocal
+from typing import Dict, List, Set
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+from src.services import model_registry
+from src.services.enrichment_service import enrichment_values
+from src.services.inference_cache import cached_sentiments
+from src.services.sentiment_cascade import sentiment_text
+from src.services.story_clustering import StoryIndex
+from src.services.pipeline import FETCH_CONCURRENCY, IngestionPipeline, PreparedTopic
+from src.services.article_record import ArticleRecord
+from src.services.archive_service import archived_urls
+from src.database import session_scope
 from src.models import Article
 
 logger = logging.getLogger(__name__)
 
+# Classer tous les sujets en un seul appel Gemini (mode multi-sujets)
+RANKING_CROSS_TOPIC = os.getenv("NEXIS_RANKING_CROSS_TOPIC", "1") == "1"
+
+
 class RSSScraper:
     # 🗑️ SUPPRESSION DE RSS_FEEDS (plus de liens https en dur)
 
     def __init__(self, max_articles_per_topic: int = 10):
         self.max_articles_per_topic = max_articles_per_topic
-        self.analyzer = SentimentAnalyzer()
-        self.llm_processor = LLMProcessor()
-        self.db = SessionLocal()
-        self.news_api = NewsAPIService()
-        self.ranker = ImportanceRanker()  
+        # Modèles partagés : chargés une seule fois par processus
+        self.analyzer = model_registry.get_sentiment_analyzer()
+        self.llm_processor = model_registry.get_llm_processor()
+        self.news_api = model_registry.get_news_api()
+        self.ranker = model_registry.get_ranker()
 
     def article_exists(self, url: str) -> bool:
         """Vérifie si un article existe déjà en base de données"""
-        return self.db.query(Article).filter(Article.url == url).first() is not None
+        return bool(self.existing_urls([url]))
+
+    def existing_urls(self, urls: List[str]) -> Set[str]:
+        """Retourne les URLs déjà en base ou archivées (une requête IN (...) par table)"""
+        if not urls:
+            return set()
+        with session_scope() as db:
+            rows = db.query(Article.url).filter(Article.url.in_(set(urls))).all()
+            # Les articles déplacés dans les archives mensuelles comptent aussi
+            return {url for (url,) in rows} | archived_urls(db, urls)
 
     def save_to_db(self, data: dict):
         """Sauvegarde un article en base de données"""
-        try:
-            self.db.add(Article(**data))
-            self.db.commit()
-        except:
-            self.db.rollback()
+        self.save_many([data])
+
+    def save_many(self, rows: List[dict]) -> Dict[str, int]:
+        """
+        Insère un lot d'articles en une seule transaction.
 
-    def scrape_topic(self, topic: str, query: str = None) -> List[Article]:
+        Les URLs déjà présentes sont ignorées (ON CONFLICT(url) DO NOTHING).
+        Si le lot échoue, on réessaie ligne par ligne pour isoler et
+        signaler les articles fautifs sans perdre les autres.
+
+        Returns:
+            Dictionnaire url -> id des articles réellement insérés
+        """
+        if not rows:
+            return {}
+
+        stmt = (
+            sqlite_insert(Article.__table__)
+            .on_conflict_do_nothing(index_elements=["url"])
+            .returning(Article.__table__.c.id, Article.__table__.c.url)
+        )
+
+        with session_scope() as db:
+            try:
+                result = db.execute(stmt.values(rows))
+                saved = {url: article_id for article_id, url in result}
+                db.commit()
+                return saved
+            except SQLAlchemyError as e:
+                db.rollback()
+                logger.warning(f"Insertion groupée impossible ({getattr(e, 'orig', e)}), reprise ligne par ligne")
+
+            saved = {}
+            for data in rows:
+                try:
+                    result = db.execute(stmt.values(data))
+                    saved.update({url: article_id for article_id, url in result})
+                    db.commit()
+                except SQLAlchemyError as e:
+                    db.rollback()
+                    print(f"      ❌ Échec sauvegarde '{data.get('url')}' : {getattr(e, 'orig', e)}")
+            return saved
+
+    def scrape_topic(self, topic: str, query: str = None) -> List[ArticleRecord]:
         """
         Scrape les articles uniquement via NewsAPI.
         Si 'query' est vide, on utilise 'topic' comme mot-clé de recherche.
-        Les articles sont ensuite triés par importance avec Gemini AI.
+
+        Les articles sont d'abord classés par importance avec Gemini AI sur
+        les champs légers (titre, source, description). Seuls les gagnants
+        passent par BART + SpaCy ; les autres sont stockés "en attente
+        d'enrichissement" (summary à None) et résumés plus tard s'ils sont
+        affichés (voir enrichment_service).
         """
-        new_articles_found = []
-        
-        # Stratégie : Si pas de mot-clé précis, on cherche le sujet global
-        search_term = query if query else topic
-        
         if not self.news_api.client:
             print("❌ Erreur : NewsAPI n'est pas initialisé (Clé API manquante ?)")
             return []
 
+        return IngestionPipeline(self, cross_topic=False).run([(topic, query)])[topic]
+
+    def fetch_topic(self, topic: str, query: str = None) -> List[dict]:
+        """Partie réseau du scraping : interroge NewsAPI pour un sujet"""
+        # Stratégie : Si pas de mot-clé précis, on cherche le sujet global
+        search_term = query if query else topic
+
         print(f"   🔍 Recherche NewsAPI pour '{search_term}' (Sujet: {topic})...")
         
         # On récupère plus d'articles pour que Gemini ait le choix
@@ -62,77 +124,83 @@ class RSSScraper:
         api_articles = self.news_api.search_articles(search_term, max_results=max_fetch)
         
         print(f"📰 NewsAPI a retourné {len(api_articles)} articles")  # DEBUG
-        
-        for i, art_data in enumerate(api_articles, 1):
-            print(f"\n   [{i}/{len(api_articles)}] Traitement: {art_data['title'][:50]}...")  # DEBUG
-            
-            # Vérifier si l'article existe déjà
-            if self.article_exists(art_data['url']):
-                print(f"      ⏭️ Déjà en base, skip")  # DEBUG
-                continue
-            
-            try:
-                # 1. Analyse du sentiment (sur description ou titre)
-                text_to_analyze = art_data.get('description', '') or art_data['title']
-                print(f"      🔄 Analyse sentiment...")  # DEBUG
-                s_score, s_label = self.analyzer.analyze(text_to_analyze)
-                print(f"      ✅ Sentiment: {s_label} ({s_score:.2f})")  # DEBUG
-                
-                # 2. Analyse LLM (résumé + sources)
-                content = art_data.get('content', '') or art_data.get('description', '') or ""
-                ai_sum, rel, srcs = "Non disponible", 50, 0
-                
-                if len(content) > 200:
-                    print(f"      🔄 Analyse LLM...")  # DEBUG
-                    analysis = self.llm_processor.analyze_content(content)
-                    if analysis:
-                        ai_sum = analysis.summary
-                        rel = analysis.reliability_score
-                        srcs = len(analysis.sources)
-                        print(f"      ✅ Résumé généré")  # DEBUG
-                
-                # 3. Création de l'objet article
-                article_data = {
-                    "title": art_data['title'],
-                    "url": art_data['url'],
-                    "source": art_data['source'],
-                    "topic": topic,
-                    "published_date": datetime.now(),
-                    "content": content[:5000],
-                    "sentiment_score": s_score,
-                    "sentiment_label": s_label,
-                    "summary": ai_sum,
-                    "reliability_score": rel,
-                    "source_count": srcs
-                }
-                
-                # 4. Sauvegarde
-                print(f"      💾 Sauvegarde en DB...")  # DEBUG
-                self.save_to_db(article_data)
-                print(f"      ✅ Sauvegardé en DB")  # DEBUG
-                
-                new_articles_found.append(Article(**article_data))
-                print(f"      ➕ Ajouté à la liste (total: {len(new_articles_found)})")  # DEBUG
-                
-            except Exception as e:
-                print(f"      ❌ ERREUR: {e}")  # DEBUG
-                import traceback
-                traceback.print_exc()  # DEBUG
+        return api_articles
+
+    def dedup_topic(self, topic: str, api_articles: List[dict],
+                    seen_urls: Set[str] = None) -> PreparedTopic:
+        """
+        Dédoublonnage et regroupement des reprises. `seen_urls` (complété sur
+        place) écarte les URLs déjà retenues par un autre sujet du même cycle.
+        """
+        # Vérifier quels articles existent déjà (une seule requête pour tout le lot)
+        known_urls = self.existing_urls([art_data['url'] for art_data in api_articles])
+        fresh_articles = []
+        seen_urls = set() if seen_urls is None else seen_urls
+        for art_data in api_articles:
+            if art_data['url'] in known_urls or art_data['url'] in seen_urls:
+                print(f"      ⏭️ Déjà en base, skip : {art_data['title'][:50]}")  # DEBUG
                 continue
+            seen_urls.add(art_data['url'])
+            fresh_articles.append(art_data)
         
-        print(f"\n📊 Total articles collectés: {len(new_articles_found)}")  # DEBUG
+        # Quasi-doublons : un seul représentant par histoire passe par l'IA
+        story_index = StoryIndex()
+        clusters = story_index.cluster(fresh_articles)
+        return PreparedTopic(
+            topic=topic,
+            clusters=clusters,
+            story_index=story_index,
+            stories=[cluster for cluster in clusters if cluster.representative is not None],
+        )
+
+    def score_topic(self, prepared: PreparedTopic) -> PreparedTopic:
+        """Sentiment des histoires nouvelles et création des candidats au classement"""
+        if not prepared.stories:
+            return prepared
         
-        # SÉLECTION INTELLIGENTE avec Gemini
-        if len(new_articles_found) > self.max_articles_per_topic:
-            print(f"🤖 Gemini sélectionne les {self.max_articles_per_topic} meilleurs articles...")
-            print(f"   📥 Envoi de {len(new_articles_found)} articles à Gemini")  # DEBUG
-            
-            new_articles_found = self.ranker.rank_articles(
-                new_articles_found, 
-                top_n=self.max_articles_per_topic
-            )
-            
-            print(f"   📤 Gemini a retourné {len(new_articles_found)} articles")  # DEBUG
+        # Analyse du sentiment en lot (sur description ou titre)
+        print(f"   🔄 Analyse sentiment de {len(prepared.stories)} articles...")  # DEBUG
+        sentiments = cached_sentiments(self.analyzer, [
+            sentiment_text(cluster.representative) for cluster in prepared.stories
+        ])
         
-        print(f"\n✅ Retour final: {len(new_articles_found)} articles")  # DEBUG
-        return new_articles_found
\ No newline at end of file
+        # Création des articles, encore sans résumé
+        for cluster, (s_score, s_label) in zip(prepared.stories, sentiments):
+            # source_count = nombre de médias ayant repris l'histoire
+            record = ArticleRecord.from_api(cluster.representative, prepared.topic, source_count=cluster.size)
+            record.sentiment_score = s_score
+            record.sentiment_label = s_label
+            prepared.candidates.append(record)
+        return prepared
+
+    def scrape_topics(self, topics: List[str], max_workers: int = None,
+                      cross_topic: bool = None) -> Dict[str, List[ArticleRecord]]:
+        """
+        Scrape plusieurs sujets à travers le pipeline d'ingestion par étapes.
+
+        Les appels NewsAPI (au plus `max_workers` à la fois, par défaut
+        FETCH_CONCURRENCY), le sentiment, les résumés et la sauvegarde
+        s'exécutent en parallèle, chaque étape sur ses propres threads (voir
+        pipeline). Avec `cross_topic` (par
+        défaut, voir RANKING_CROSS_TOPIC), tous les sujets sont classés en un
+        seul appel Gemini ; sinon chaque sujet est classé dès qu'il est prêt.
+        Une erreur sur un sujet n'empêche pas le traitement des autres.
+
+        Returns:
+            Dictionnaire sujet -> articles retenus (liste vide en cas d'erreur)
+        """
+        if not self.news_api.client:
+            print("❌ Erreur : NewsAPI n'est pas initialisé (Clé API manquante ?)")
+            return {topic: [] for topic in topics}
+
+        cross_topic = RANKING_CROSS_TOPIC if cross_topic is None else cross_topic
+        pipeline = IngestionPipeline(self, cross_topic=cross_topic, fetch_workers=max_workers or FETCH_CONCURRENCY)
+        return pipeline.run([(topic, None) for topic in topics])
+
+    def enrich(self, articles: List[ArticleRecord]):
+        """Complète résumé et fiabilité, en un seul lot"""
+        print(f"   🔄 Analyse LLM de {len(articles)} articles...")  # DEBUG
+        texts = [record.content for record in articles]
+        for record, values in zip(articles, enrichment_values(texts, self.llm_processor)):
+            for key, value in values.items():
+                setattr(record, key, value)
@@ -0,0 +1,137 @@
+"""
+Recherche plein texte dans les articles stockés (SQLite FTS5).
+
+L'index articles_fts couvre le titre, le résumé et le contenu. Il est
+synchronisé par des triggers SQLite : toute insertion ou mise à jour de la
+table articles, quel que soit le code qui la fait, est indexée. Les accents
+sont ignorés (« economie » trouve « économie ») et chaque mot est cherché
+comme préfixe (« retrait » trouve « retraites »).
+
+L'index ne garde pas la position des mots (detail=column) : il pèse un
+tiers de moins. La recherche n'utilise ni expressions ni NEAR, et bm25 garde
+le poids de chaque colonne.
+
+L'index reste hors de la base versionnée : le script quotidien, qui ne
+cherche rien, le supprime (drop_search_index) et l'interface le reconstruit
+à son premier lancement après récupération de la base.
+"""
+import re
+from typing import List
+from sqlalchemy import text
+from src.models import Article
+from src.services.article_queries import list_view
+
+# Poids bm25 des colonnes (titre, résumé, contenu) : un mot du titre compte plus
+BM25_WEIGHTS = (10.0, 3.0, 1.0)
+
+FTS_STATEMENTS = [
+    # Le résumé et le contenu sont stockés compressés : l'index lit leur texte
+    # décompressé à travers cette vue (nexis_inflate, voir src/compression.py)
+    """
+    CREATE VIEW IF NOT EXISTS articles_fts_source AS
+    SELECT id, title, nexis_inflate(summary) AS summary, nexis_inflate(content) AS content
+    FROM articles
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+        title, summary, content,
+        content='articles_fts_source', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        detail=column
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+        INSERT INTO articles_fts(rowid, title, summary, content)
+        VALUES (new.id, new.title, nexis_inflate(new.summary), nexis_inflate(new.content));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+        INSERT INTO articles_fts(articles_fts, rowid, title, summary, content)
+        VALUES ('delete', old.id, old.title, nexis_inflate(old.summary), nexis_inflate(old.content));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_fts_update
+    AFTER UPDATE OF title, summary, content ON articles BEGIN
+        INSERT INTO articles_fts(articles_fts, rowid, title, summary, content)
+        VALUES ('delete', old.id, old.title, nexis_inflate(old.summary), nexis_inflate(old.content));
+        INSERT INTO articles_fts(rowid, title, summary, content)
+        VALUES (new.id, new.title, nexis_inflate(new.summary), nexis_inflate(new.content));
+    END
+    """,
+]
+
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def ensure_search_index(bind):
+    """Crée l'index FTS5 et ses triggers, puis indexe l'existant à la création"""
+    with bind.begin() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'")
+        ).first()
+        for statement in FTS_STATEMENTS:
+            conn.execute(text(statement))
+        if not exists:
+            conn.execute(text("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')"))
+            print("🔎 Index de recherche plein texte créé")
+
+
+def drop_search_index(bind) -> bool:
+    """
+    Supprime l'index FTS5, ses triggers et sa vue source.
+
+    Returns:
+        Vrai si l'index existait (la place libérée demande un VACUUM)
+    """
+    with bind.begin() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'")
+        ).first()
+        for trigger in ("articles_fts_insert", "articles_fts_delete", "articles_fts_update"):
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+        conn.execute(text("DROP TABLE IF EXISTS articles_fts"))
+        conn.execute(text("DROP VIEW IF EXISTS articles_fts_source"))
+    return exists is not None
+
+
+def build_match_query(query: str) -> str:
+    """
+    Transforme la saisie utilisateur en requête FTS5 sûre.
+
+    Chaque mot est mis entre guillemets (pas d'opérateurs FTS5 injectés par
+    l'utilisateur) et suffixé par * pour la recherche par préfixe ; tous les
+    mots doivent être présents.
+    """
+    return " ".join(f'"{word}"*' for word in WORD_RE.findall(query or ""))
+
+
+def search_articles(db, query: str, limit: int = 10) -> List[Article]:
+    """
+    Recherche les articles correspondant à `query`, classés par pertinence bm25.
+
+    Returns:
+        Les articles trouvés, du plus pertinent au moins pertinent
+    """
+    match = build_match_query(query)
+    if not match:
+        return []
+
+    rows = db.execute(
+        text(
+            "SELECT rowid FROM articles_fts WHERE articles_fts MATCH :match "
+            f"ORDER BY bm25(articles_fts, {', '.join(map(str, BM25_WEIGHTS))}) LIMIT :limit"
+        ),
+        {"match": match, "limit": limit},
+    ).all()
+    ids = [row[0] for row in rows]
+    if not ids:
+        return []
+
+    by_id = {
+        art.id: art
+        for art in db.query(Article).options(list_view()).filter(Article.id.in_(ids)).all()
+    }
+    return [by_id[article_id] for article_id in ids if article_id in by_id]
@@ -2,24 +2,43 @@
 Module d'analyse de sentiment basé sur Hugging Face Transformers (BERT).
 Plus lent que TextBlob, mais beaucoup plus intelligent pour le contexte.
 """
-from transformers import pipeline
+import os
+import threading
+from typing import List
 import logging
+from src.services.inference_backend import (
+    INFERENCE_BACKEND, cache_suffix, load_pipeline, token_budget, truncate_to_tokens,
+)
 
 # On réduit le bruit des logs de transformers
 logging.getLogger("transformers").setLevel(logging.ERROR)
 
+# Taille des lots envoyés au modèle (réglable sans toucher au code)
+DEFAULT_BATCH_SIZE = int(os.getenv("NEXIS_SENTIMENT_BATCH_SIZE", "16"))
+
 class SentimentAnalyzer:
     """
     Utilise un modèle BERT multilingue pour classer le sentiment.
     Le modèle retourne un score en 'étoiles' (1 star à 5 stars).
     """
+
+    MODEL_NAME = "nlptown/bert-base-multilingual-uncased-sentiment"
+    # À incrémenter si le pré/post-traitement change (invalide le cache d'inférence)
+    MODEL_VERSION = "1"
+    # Moteur d'inférence : torch (fp32), int8 ou onnx (voir inference_backend)
+    backend = INFERENCE_BACKEND
     
-    def __init__(self):
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE, backend: str = None):
         print("Chargement du modèle neuronal (cela peut prendre quelques secondes)...")
         # On utilise un modèle spécialisé qui gère le français, l'anglais, etc.
         # Il va être téléchargé automatiquement au premier lancement.
-        model_name = "nlptown/bert-base-multilingual-uncased-sentiment"
-        self.pipe = pipeline("sentiment-analysis", model=model_name)
+        self.pipe, self.backend = load_pipeline("sentiment-analysis", self.MODEL_NAME, backend)
+        self.batch_size = batch_size
+        # Tokens de texte acceptés par le modèle (512 pour BERT, moins [CLS] et [SEP])
+        self.max_tokens = token_budget(self.pipe)
+        # Le modèle et son tokenizer rapide ne sont pas thread-safe : une
+        # instance partagée (registre de modèles) sert un thread à la fois
+        self._lock = threading.RLock()
 
     def analyze(self, text: str) -> tuple[float, str]:
         """
@@ -31,42 +50,103 @@ class SentimentAnalyzer:
             return 0.0, "neutre"
 
         try:
-            # Les modèles BERT ont une limite de longueur (souvent 512 tokens).
-            # On tronque le texte pour éviter les erreurs.
-            result = self.pipe(text[:512])[0]
-            
-            # Le résultat ressemble à : {'label': '1 star', 'score': 0.95}
-            label_star = result['label']  # ex: '1 star', '4 stars'
-            confidence = result['score']  # certitude de l'IA (0 à 1)
-
-            # --- CONVERSION DU SYSTÈME D'ÉTOILES EN POLARITÉ ---
-            # 1 star  = Très Négatif
-            # 2 stars = Négatif
-            # 3 stars = Neutre
-            # 4 stars = Positif
-            # 5 stars = Très Positif
-            
-            stars = int(label_star.split()[0]) # On récupère juste le chiffre
-            
-            # On mappe 1..5 vers -1..1
-            # 1 -> -1.0
-            # 2 -> -0.5
-            # 3 ->  0.0
-            # 4 -> +0.5
-            # 5 -> +1.0
-            normalized_score = (stars - 3) / 2.0
-
-            # Définition du label textuel pour ton interface
-            if stars <= 2:
-                final_label = "négatif"
-            elif stars == 3:
-                final_label = "neutre"
-            else:
-                final_label = "positif"
-
-            return normalized_score, final_label
+            # Les modèles BERT ont une limite de longueur (512 tokens) :
+            # on tronque au dernier token accepté plutôt qu'à un nombre de caractères.
+            with self._lock:
+                result = self.pipe(self._truncate(text))[0]
+            return self._to_polarity(result)
 
         except Exception as e:
             # En cas de pépin, on reste neutre
             print(f"Erreur analyse BERT : {e}")
-            return 0.0, "neutre"
\ No newline at end of file
+            return 0.0, "neutre"
+
+    def analyze_batch(self, texts: List[str], batch_size: int = None) -> List[tuple[float, str]]:
+        """
+        Analyse une liste de textes en lots (une passe du modèle par lot).
+
+        Les textes sont triés par longueur avant d'être découpés en lots :
+        un titre court n'est ainsi jamais complété (padding) jusqu'à la
+        taille d'une longue description.
+
+        Args:
+            texts: Textes à analyser
+            batch_size: Taille des lots (par défaut celle de l'instance)
+
+        Returns:
+            Liste de (score, label), dans le même ordre que `texts`
+        """
+        batch_size = batch_size or self.batch_size
+        results = [(0.0, "neutre")] * len(texts)
+
+        with self._lock:
+            # Les textes trop courts restent neutres, comme dans analyze()
+            todo = [
+                (i, self._truncate(text)) for i, text in enumerate(texts)
+                if text and len(text.strip()) >= 5
+            ]
+            if not todo:
+                return results
+
+            # Tri par longueur : chaque lot regroupe des textes de taille proche
+            todo.sort(key=lambda item: len(item[1]))
+
+            for start in range(0, len(todo), batch_size):
+                chunk = todo[start:start + batch_size]
+                try:
+                    outputs = self.pipe(
+                        [text for _, text in chunk],
+                        batch_size=len(chunk),
+                        padding=True,
+                        truncation=True,
+                    )
+                    for (i, _), result in zip(chunk, outputs):
+                        results[i] = self._to_polarity(result)
+                except Exception as e:
+                    # Un lot en erreur : on retombe sur l'analyse unitaire
+                    print(f"Erreur analyse BERT (lot) : {e}")
+                    for i, text in chunk:
+                        results[i] = self.analyze(text)
+
+            return results
+
+    def _truncate(self, text: str) -> str:
+        return truncate_to_tokens(self.pipe, text, self.max_tokens)
+
+    @property
+    def cache_id(self) -> str:
+        """Identifiant modèle + version + moteur utilisé comme clé du cache d'inférence"""
+        return f"{self.MODEL_NAME}@{self.MODEL_VERSION}{cache_suffix(self.backend)}"
+
+    @staticmethod
+    def _to_polarity(result: dict) -> tuple[float, str]:
+        """Convertit une sortie du modèle ('1 star'..'5 stars') en (score, label)"""
+        # Le résultat ressemble à : {'label': '1 star', 'score': 0.95}
+        label_star = result['label']  # ex: '1 star', '4 stars'
+
+        # --- CONVERSION DU SYSTÈME D'ÉTOILES EN POLARITÉ ---
+        # 1 star  = Très Négatif
+        # 2 stars = Négatif
+        # 3 stars = Neutre
+        # 4 stars = Positif
+        # 5 stars = Très Positif
+        
+        stars = int(label_star.split()[0]) # On récupère juste le chiffre
+        
+        # On mappe 1..5 vers -1..1
+        # 1 -> -1.0
+        # 2 -> -0.5
+        # 3 ->  0.0
+        # 4 -> +0.5
+        # 5 -> +1.0
+        normalized_score = (stars - 3) / 2.0
+
+        # Définition du label textuel pour ton interface
+        if stars <= 2:
+            final_label = "négatif"
+        elif stars == 3:
+            final_label = "neutre"
+        else:
+            final_label = "positif"
+
+        return normalized_score, final_label
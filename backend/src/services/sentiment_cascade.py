@@ -0,0 +1,203 @@
+"""
+Sentiment en cascade : lexique français d'abord, BERT seulement si besoin.
+
+La plupart des titres et chapôs sont franchement neutres ou franchement
+polarisés. Un score lexical (quelques microsecondes par texte) les tranche
+quand sa confiance atteint CASCADE_THRESHOLD ; seuls les textes ambigus
+passent par le modèle nlptown. Le contrat reste celui de SentimentAnalyzer :
+(score dans {-1, -0.5, 0, 0.5, 1}, label).
+
+Confiance du lexique :
+- mots polarisés : déséquilibre positif / négatif × quantité d'indices
+- aucun mot polarisé : confiance nulle (BERT tranche), sauf si
+  NEXIS_SENTIMENT_CASCADE_NEUTRAL=1. Le texte est alors neutre, d'autant
+  plus sûrement qu'il est court, à partir de NEUTRAL_MIN_TOKENS mots. Un
+  titre sans mot du lexique n'est pas forcément neutre pour BERT : n'activer
+  ce raccourci qu'après calibrate_sentiment.py, qui mesure son accord.
+
+Activée par NEXIS_SENTIMENT_CASCADE=1. Les compteurs `hits` (lexique /
+BERT) mesurent la part des appels évités ; backend/calibrate_sentiment.py
+choisit le seuil d'après les labels de BERT.
+"""
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter
+from typing import Dict, List, Tuple
+
+SENTIMENT_CASCADE = os.getenv("NEXIS_SENTIMENT_CASCADE", "0") == "1"
+# Confiance minimale du lexique pour se passer de BERT
+CASCADE_THRESHOLD = float(os.getenv("NEXIS_SENTIMENT_CASCADE_THRESHOLD", "0.7"))
+# Textes sans mot polarisé jugés neutres sans BERT (à calibrer avant d'activer)
+NEUTRAL_SHORTCUT = os.getenv("NEXIS_SENTIMENT_CASCADE_NEUTRAL", "0") == "1"
+# Au-delà de ce nombre de mots, un texte sans mot polarisé n'est plus sûrement neutre
+NEUTRAL_MAX_TOKENS = 40
+# En deçà, trop peu de mots pour conclure à l'absence de polarité
+NEUTRAL_MIN_TOKENS = 4
+
+# Radicaux sans accents -> poids ; un mot correspond s'il commence par le radical
+POSITIVE: Dict[str, float] = {
+    "victoire": 2, "vainqueur": 2, "gagne": 1, "remporte": 2, "triomph": 2, "champion": 1,
+    "medaille": 1, "reussi": 2, "record": 1, "hausse": 1, "progress": 1,
+    "amelior": 1, "croissance": 1, "benefice": 1, "rebond": 1, "excellent": 2,
+    "formidable": 2, "magnifique": 2, "superbe": 2, "heureu": 2, "joie": 2, "bonheur": 2,
+    "celebr": 1, "felicit": 2, "espoir": 1, "optimis": 1, "accord": 1, "paix": 2,
+    "innov": 1, "sauve": 1, "sauvetage": 1, "gueri": 2, "libere": 1, "liberation": 1,
+    "solidarit": 1, "favorable": 1, "salue": 1, "prometteu": 1,
+    "reconnaissance": 1, "inaugur": 1, "embauche": 1, "relance": 1, "soutien": 1,
+}
+NEGATIVE: Dict[str, float] = {
+    "mort": 2, "deces": 2, "decede": 2, "tue": 2, "meurtr": 2, "assassin": 2,
+    "attentat": 2, "terror": 2, "guerre": 2, "bombard": 2, "massacr": 2, "otage": 2,
+    "crise": 1, "chute": 1, "baisse": 1, "effondr": 2, "krach": 2, "recession": 2,
+    "faillite": 2, "deficit": 1, "chomage": 1, "licenci": 2, "inflation": 1, "penurie": 1,
+    "catastroph": 2, "drame": 2, "dramatique": 2, "tragedi": 2, "tragique": 2,
+    "violen": 2, "agress": 2, "accident": 2, "incendi": 1, "inond": 1, "seisme": 2,
+    "tempete": 1, "explos": 1, "blesse": 2, "victime": 2, "scandal": 2, "fraude": 2,
+    "corruption": 2, "condamn": 1, "arrest": 1, "sanction": 1, "denonc": 1,
+    "critiqu": 1, "polemiqu": 1, "greve": 1, "menace": 1, "danger": 1, "inquiet": 1,
+    "crainte": 1, "peur": 1, "colere": 1, "echec": 2, "defaite": 2, "perd": 1,
+    "perte": 1, "recul": 1, "alerte": 1, "urgence": 1, "conflit": 1, "tension": 1,
+    "pollu": 1, "penal": 1, "plainte": 1, "grave": 1,
+}
+# Mots isolés trop courts ou trop ambigus pour un radical
+# ("succes" comme radical couvrirait "succession", "exploit" "exploitation")
+POSITIVE_WORDS = {"succes": 2, "exploit": 1, "exploits": 1}
+NEGATIVE_WORDS = {"viol": 2, "mal": 1, "pire": 2}
+NEGATORS = {"ne", "n", "pas", "sans", "jamais", "aucun", "aucune", "ni", "non"}
+INTENSIFIERS = {"tres", "extremement", "totalement", "vraiment", "gravement", "massivement"}
+# Mots après une négation ou un intensifieur dont le poids est modifié
+SCOPE = 3
+
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+_MIN_STEM = min(len(stem) for stem in (*POSITIVE, *NEGATIVE))
+_MAX_STEM = max(len(stem) for stem in (*POSITIVE, *NEGATIVE))
+
+
+def sentiment_text(art_data: dict) -> str:
+    """Texte analysé pour un article NewsAPI : sa description, à défaut son titre"""
+    return art_data.get('description') or art_data.get('title') or ""
+
+
+def _words(text: str) -> List[str]:
+    text = unicodedata.normalize("NFKD", (text or "").lower())
+    return WORD_RE.findall("".join(c for c in text if not unicodedata.combining(c)))
+
+
+def _polarity(word: str) -> float:
+    """Poids signé d'un mot (positif, négatif ou 0)"""
+    if word in POSITIVE_WORDS:
+        return POSITIVE_WORDS[word]
+    if word in NEGATIVE_WORDS:
+        return -NEGATIVE_WORDS[word]
+    for length in range(min(len(word), _MAX_STEM), _MIN_STEM - 1, -1):
+        stem = word[:length]
+        if stem in POSITIVE:
+            return POSITIVE[stem]
+        if stem in NEGATIVE:
+            return -NEGATIVE[stem]
+    return 0.0
+
+
+def neutral_confidence(word_count: int) -> float:
+    """Confiance qu'un texte sans mot polarisé de `word_count` mots est neutre"""
+    if word_count < NEUTRAL_MIN_TOKENS:
+        return 0.0
+    return max(0.0, 1 - word_count / NEUTRAL_MAX_TOKENS)
+
+
+def lexicon_score(text: str, neutral_shortcut: bool = None) -> Tuple[float, str, float]:
+    """
+    Sentiment lexical d'un texte, sur l'échelle de SentimentAnalyzer.
+
+    Args:
+        neutral_shortcut: Confiance non nulle pour les textes sans mot
+            polarisé (NEUTRAL_SHORTCUT par défaut)
+
+    Returns:
+        (score, label, confiance entre 0 et 1)
+    """
+    words = _words(text)
+    positive = negative = 0.0
+    negated_until = intensified_until = -1
+    for i, word in enumerate(words):
+        if word in NEGATORS:
+            negated_until = i + SCOPE
+            continue
+        if word in INTENSIFIERS:
+            intensified_until = i + SCOPE
+            continue
+        weight = _polarity(word)
+        if not weight:
+            continue
+        if i <= intensified_until:
+            weight *= 1.5
+        if i <= negated_until:
+            # "pas de victoire" compte comme négatif, "sans danger" comme positif
+            weight = -weight
+        if weight > 0:
+            positive += weight
+        else:
+            negative -= weight
+
+    total = positive + negative
+    if not total:
+        if neutral_shortcut is None:
+            neutral_shortcut = NEUTRAL_SHORTCUT
+        return 0.0, "neutre", neutral_confidence(len(words)) if neutral_shortcut else 0.0
+
+    balance = (positive - negative) / total
+    if balance == 0:
+        return 0.0, "neutre", 0.0
+    confidence = abs(balance) * min(1.0, total / 2)
+    # Même échelle que le modèle : 2 ou 4 étoiles, 1 ou 5 si les indices abondent
+    strong = abs(positive - negative) >= 3
+    if balance > 0:
+        return (1.0 if strong else 0.5), "positif", confidence
+    return (-1.0 if strong else -0.5), "négatif", confidence
+
+
+class CascadeSentimentAnalyzer:
+    """Lexique puis BERT pour les textes ambigus (même interface que SentimentAnalyzer)"""
+
+    def __init__(self, analyzer, threshold: float = CASCADE_THRESHOLD, neutral_shortcut: bool = NEUTRAL_SHORTCUT):
+        self.analyzer = analyzer
+        self.threshold = threshold
+        self.neutral_shortcut = neutral_shortcut
+        self.hits = Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def cache_id(self) -> str:
+        return f"{self.analyzer.cache_id}+cascade{self.threshold:g}{'n' if self.neutral_shortcut else ''}"
+
+    def analyze(self, text: str) -> tuple[float, str]:
+        return self.analyze_batch([text])[0]
+
+    def analyze_batch(self, texts: List[str], batch_size: int = None) -> List[tuple[float, str]]:
+        results = []
+        uncertain = []
+        for i, text in enumerate(texts):
+            score, label, confidence = lexicon_score(text, self.neutral_shortcut)
+            results.append((score, label))
+            if confidence < self.threshold:
+                uncertain.append(i)
+
+        if uncertain:
+            computed = self.analyzer.analyze_batch([texts[i] for i in uncertain], batch_size)
+            for i, result in zip(uncertain, computed):
+                results[i] = result
+
+        with self._lock:
+            self.hits["lexique"] += len(texts) - len(uncertain)
+            self.hits["bert"] += len(uncertain)
+        if texts:
+            print(f"   ⚡ Cascade sentiment : {len(texts) - len(uncertain)}/{len(texts)} tranchés par le lexique")
+        return results
+
+    def hit_rate(self) -> float:
+        """Part des textes tranchés sans BERT depuis le démarrage"""
+        with self._lock:
+            total = sum(self.hits.values())
+            return self.hits["lexique"] / total if total else 0.0
@@ -0,0 +1,76 @@
+"""
+Statistiques des articles, calculées en SQL.
+
+Plutôt que de charger tous les articles (contenu compris) pour les compter
+en Python, on maintient la table article_stats : un compteur par jour ×
+sujet × sentiment × source, incrémenté par un trigger à chaque insertion
+dans articles. Les statistiques ne lisent plus que ce cumul, dont la taille
+ne dépend pas du nombre d'articles stockés.
+"""
+from typing import Dict, List, Tuple
+from sqlalchemy import func, text
+from src.models import ArticleStat
+
+STATS_TRIGGER = """
+CREATE TRIGGER IF NOT EXISTS article_stats_insert AFTER INSERT ON articles BEGIN
+    INSERT INTO article_stats(day, topic, sentiment_label, source, count)
+    VALUES (
+        date(coalesce(new.created_at, CURRENT_TIMESTAMP)),
+        coalesce(new.topic, ''),
+        lower(coalesce(new.sentiment_label, '')),
+        coalesce(new.source, ''),
+        1
+    )
+    ON CONFLICT(day, topic, sentiment_label, source) DO UPDATE SET count = count + 1;
+END
+"""
+
+BACKFILL = """
+INSERT INTO article_stats(day, topic, sentiment_label, source, count)
+SELECT date(coalesce(created_at, CURRENT_TIMESTAMP)), coalesce(topic, ''),
+       lower(coalesce(sentiment_label, '')), coalesce(source, ''), COUNT(*)
+FROM articles
+GROUP BY 1, 2, 3, 4
+"""
+
+
+def ensure_stats_rollup(bind):
+    """Crée le trigger de cumul et remplit article_stats à partir de l'existant"""
+    with bind.begin() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'article_stats_insert'")
+        ).first()
+        conn.execute(text(STATS_TRIGGER))
+        if not exists:
+            conn.execute(text("DELETE FROM article_stats"))
+            conn.execute(text(BACKFILL))
+            print("📊 Cumuls statistiques initialisés")
+
+
+def get_statistics(db, top_sources: int = 10) -> Dict:
+    """
+    Agrège les cumuls en SQL (GROUP BY) pour l'onglet Statistiques.
+
+    Returns:
+        {"total": int, "sentiments": {label: nb}, "sources": [(source, nb), ...]}
+        avec les sources triées par nombre d'articles décroissant
+    """
+    sentiments = dict(
+        db.query(ArticleStat.sentiment_label, func.sum(ArticleStat.count))
+        .group_by(ArticleStat.sentiment_label)
+        .all()
+    )
+
+    sources: List[Tuple[str, int]] = (
+        db.query(ArticleStat.source, func.sum(ArticleStat.count).label("total"))
+        .group_by(ArticleStat.source)
+        .order_by(text("total DESC"))
+        .limit(top_sources)
+        .all()
+    )
+
+    return {
+        "total": sum(sentiments.values()),
+        "sentiments": sentiments,
+        "sources": [(source, total) for source, total in sources],
+    }
@@ -0,0 +1,206 @@
+"""
+Regroupement des quasi-doublons (SimHash) avant l'analyse IA.
+
+Cinq médias qui reprennent la même dépêche avec des titres légèrement
+différents ont des URLs distinctes : l'index unique sur Article.url ne les
+détecte pas. On calcule une empreinte SimHash 64 bits du titre + de la
+description ; deux articles à moins de SIMHASH_THRESHOLD bits d'écart
+racontent la même histoire. Un seul représentant par histoire passe par les
+modèles, et la taille du groupe devient son `source_count`.
+
+Les empreintes sont conservées dans la table story_signatures pour que les
+reprises publiées lors des exécutions suivantes rejoignent la même histoire.
+"""
+import os
+import re
+import hashlib
+import logging
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from sqlalchemy import func
+from sqlalchemy.exc import SQLAlchemyError
+from src.database import session_scope
+from src.models import Article, StorySignature
+
+logger = logging.getLogger(__name__)
+
+# Écart maximal (en bits sur 64) entre deux reprises d'une même histoire
+SIMHASH_THRESHOLD = int(os.getenv("NEXIS_SIMHASH_THRESHOLD", "12"))
+# Fenêtre (jours) pendant laquelle une histoire peut encore recevoir des reprises
+STORY_WINDOW_DAYS = int(os.getenv("NEXIS_STORY_WINDOW_DAYS", "7"))
+
+# Mots vides : ils rapprochent artificiellement des titres sans rapport
+STOPWORDS = {
+    "les", "des", "une", "est", "pour", "par", "sur", "dans", "avec", "aux", "qui",
+    "que", "pas", "plus", "son", "ses", "ont", "été", "ete", "cette", "mais", "comme",
+    "sont", "leur", "elle", "ils", "the", "and", "apres", "avant", "selon", "face",
+}
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+MASK_64 = (1 << 64) - 1
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Mots significatifs du texte (minuscules, sans accents).
+
+    Sur des textes aussi courts qu'un titre + chapô, les mots seuls séparent
+    mieux les reprises des autres histoires que les bigrammes, qui amplifient
+    la moindre reformulation.
+    """
+    text = unicodedata.normalize("NFKD", (text or "").lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return [w for w in WORD_RE.findall(text) if len(w) > 2 and w not in STOPWORDS]
+
+
+def simhash(text: str) -> int:
+    """Empreinte SimHash 64 bits (non signée) d'un texte"""
+    weights = [0] * 64
+    for token in tokenize(text):
+        h = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+
+def hamming(a: int, b: int) -> int:
+    """Nombre de bits différents entre deux empreintes"""
+    return bin((a ^ b) & MASK_64).count("1")
+
+
+def to_signed(value: int) -> int:
+    """SQLite ne stocke que des entiers signés 64 bits"""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def to_unsigned(value: int) -> int:
+    return value & MASK_64
+
+
+@dataclass
+class StoryCluster:
+    """Une histoire : son représentant et ses reprises trouvées dans ce lot"""
+    representative: dict
+    signature: int
+    members: List[dict] = field(default_factory=list)
+    member_signatures: List[int] = field(default_factory=list)
+    # Id de la signature représentante si l'histoire est déjà en base
+    existing_id: Optional[int] = None
+
+    @property
+    def size(self) -> int:
+        return 1 + len(self.members)
+
+
+def story_text(art_data: dict) -> str:
+    return f"{art_data.get('title') or ''} {art_data.get('description') or ''}"
+
+
+class StoryIndex:
+    """
+    Index persistant des empreintes.
+
+    Chaque opération ouvre sa propre session courte : aucune transaction
+    ne reste ouverte pendant l'analyse IA qui sépare cluster() de record().
+    """
+
+    def __init__(self, threshold: int = SIMHASH_THRESHOLD, window_days: int = STORY_WINDOW_DAYS):
+        self.threshold = threshold
+        self.window_days = window_days
+
+    def cluster(self, articles: List[dict]) -> List[StoryCluster]:
+        """
+        Regroupe les articles du lot entre eux et avec les histoires récentes.
+
+        Les URLs déjà indexées (reprises vues lors d'une exécution
+        précédente) sont ignorées.
+
+        Returns:
+            Les histoires, dans l'ordre d'apparition de leur premier article
+        """
+        urls = [art_data["url"] for art_data in articles]
+        with session_scope() as db:
+            indexed = {
+                url for (url,) in
+                db.query(StorySignature.url).filter(StorySignature.url.in_(set(urls))).all()
+            }
+
+            # Représentants des histoires récentes : (id, empreinte)
+            recent = [
+                (sig_id, to_unsigned(value))
+                for sig_id, value in db.query(StorySignature.id, StorySignature.simhash)
+                .filter(StorySignature.cluster_id.is_(None))
+                .filter(StorySignature.created_at >= func.datetime("now", f"-{self.window_days} days"))
+                .all()
+            ]
+
+        clusters: List[StoryCluster] = []
+        existing: Dict[int, StoryCluster] = {}
+        for art_data in articles:
+            if art_data["url"] in indexed:
+                continue
+            signature = simhash(story_text(art_data))
+
+            match = next((c for c in clusters if hamming(c.signature, signature) <= self.threshold), None)
+            if match is not None:
+                match.members.append(art_data)
+                match.member_signatures.append(signature)
+                continue
+
+            sig_id = next((i for i, value in recent if hamming(value, signature) <= self.threshold), None)
+            if sig_id is not None:
+                if sig_id not in existing:
+                    existing[sig_id] = StoryCluster(
+                        representative=None, signature=signature, existing_id=sig_id
+                    )
+                existing[sig_id].members.append(art_data)
+                existing[sig_id].member_signatures.append(signature)
+                continue
+
+            clusters.append(StoryCluster(representative=art_data, signature=signature))
+
+        grouped = sum(c.size - 1 for c in clusters) + sum(len(c.members) for c in existing.values())
+        if grouped:
+            print(f"   🧩 {grouped} reprise(s) d'une même histoire écartée(s) de l'analyse")
+        return clusters + list(existing.values())
+
+    def record(self, clusters: List[StoryCluster]):
+        """
+        Enregistre les empreintes du lot et met à jour `source_count` des
+        histoires déjà en base qui reçoivent de nouvelles reprises.
+        """
+        try:
+            with session_scope() as db:
+                self._record(db, clusters)
+        except SQLAlchemyError as e:
+            logger.error(f"Erreur d'enregistrement des empreintes : {getattr(e, 'orig', e)}")
+
+    def _record(self, db, clusters: List[StoryCluster]):
+        for cluster in clusters:
+            root_id = cluster.existing_id
+            if cluster.representative is not None:
+                root = StorySignature(
+                    url=cluster.representative["url"], simhash=to_signed(cluster.signature)
+                )
+                db.add(root)
+                db.flush()
+                root_id = root.id
+
+            for member, signature in zip(cluster.members, cluster.member_signatures):
+                db.add(StorySignature(
+                    url=member["url"], simhash=to_signed(signature), cluster_id=root_id
+                ))
+
+            if cluster.existing_id is not None and cluster.members:
+                root_url = db.query(StorySignature.url).filter(
+                    StorySignature.id == cluster.existing_id
+                ).scalar()
+                db.query(Article).filter(Article.url == root_url).update(
+                    {"source_count": func.coalesce(Article.source_count, 1) + len(cluster.members)},
+                    synchronize_session=False,
+                )
+
+        # Les histoires trop anciennes ne peuvent plus recevoir de reprises
+        db.query(StorySignature).filter(
+            StorySignature.created_at < func.datetime("now", f"-{self.window_days} days")
+        ).delete(synchronize_session=False)
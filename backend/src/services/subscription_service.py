@@ -2,7 +2,7 @@ import os
 import resend
 from datetime import datetime
 from dotenv import load_dotenv
-from src.database import SessionLocal
+from src.database import session_scope
 from src.models import Subscriber
 
 load_dotenv()
@@ -11,39 +11,34 @@ resend.api_key = os.getenv("RESEND_API_KEY")
 class SubscriptionService:
     """Gestion des abonnements à la newsletter"""
     
-    def __init__(self):
-        self.db = SessionLocal()
-    
     def subscribe(self, email: str) -> dict:
         """Abonner un email et envoyer confirmation"""
         
-        # Vérifier si déjà abonné
-        existing = self.db.query(Subscriber).filter(Subscriber.email == email).first()
-        
-        if existing:
-            if existing.is_active:
+        with session_scope() as db:
+            # Vérifier si déjà abonné
+            existing = db.query(Subscriber).filter(Subscriber.email == email).first()
+            
+            if existing and existing.is_active:
                 return {
                     "success": False,
                     "message": f"✅ {email} est déjà abonné !"
                 }
-            else:
+            
+            if existing:
                 # Réactiver l'abonnement
                 existing.is_active = 1
-                self.db.commit()
-                self.send_confirmation_email(email)
-                return {
-                    "success": True,
-                    "message": f"✅ Abonnement réactivé pour {email} !"
-                }
-        
-        # Créer nouvel abonné
-        new_subscriber = Subscriber(email=email)
-        self.db.add(new_subscriber)
-        self.db.commit()
+            else:
+                # Créer nouvel abonné
+                db.add(Subscriber(email=email))
         
-        # Envoyer email de confirmation
+        # Envoyer email de confirmation (une fois l'abonnement enregistré)
         self.send_confirmation_email(email)
         
+        if existing:
+            return {
+                "success": True,
+                "message": f"✅ Abonnement réactivé pour {email} !"
+            }
         return {
             "success": True,
             "message": f"✅ Abonnement confirmé pour {email} !\n\n📧 Un email de bienvenue a été envoyé."
@@ -51,19 +46,20 @@ class SubscriptionService:
     
     def unsubscribe(self, email: str) -> dict:
         """Désabonner un email"""
-        subscriber = self.db.query(Subscriber).filter(Subscriber.email == email).first()
-        
-        if not subscriber:
-            return {"success": False, "message": "Email non trouvé"}
-        
-        subscriber.is_active = 0
-        self.db.commit()
+        with session_scope() as db:
+            subscriber = db.query(Subscriber).filter(Subscriber.email == email).first()
+            
+            if not subscriber:
+                return {"success": False, "message": "Email non trouvé"}
+            
+            subscriber.is_active = 0
         
         return {"success": True, "message": f"Désabonnement effectué pour {email}"}
     
     def get_active_subscribers(self):
         """Récupérer tous les abonnés actifs"""
-        return self.db.query(Subscriber).filter(Subscriber.is_active == 1).all()
+        with session_scope() as db:
+            return db.query(Subscriber).filter(Subscriber.is_active == 1).all()
     
     def send_confirmation_email(self, email: str):
         """Envoyer l'email de confirmation d'abonnement"""
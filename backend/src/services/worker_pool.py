@@ -0,0 +1,167 @@
+"""
+Exécution de BERT, BART et SpaCy dans un pool de processus.
+
+Dans un seul processus, le GIL et les threads internes de PyTorch laissent
+la plupart des cœurs inoccupés. Avec NEXIS_WORKER_PROCESSES > 0, le
+registre de modèles fournit à la place de SentimentAnalyzer et
+LLMProcessor des doublures de même interface qui découpent chaque lot de
+textes en paquets de WORKER_BATCH_SIZE et les répartissent entre les
+processus :
+
+- chaque processus charge une seule fois SentimentAnalyzer et LLMProcessor
+  (initialiseur du pool) puis traite les paquets qu'il reçoit ;
+- PyTorch y est limité à WORKER_TORCH_THREADS threads (par défaut les
+  cœurs divisés par le nombre de processus) pour ne pas surcharger la
+  machine ;
+- les résultats sont les mêmes que dans le processus principal (tuples de
+  sentiment, objets ArticleAnalysis) et partagent le même cache
+  d'inférence. Le cache_id est lu dans un processus de travail, comme
+  celui du serveur d'inférence dans /health : si le moteur int8 ou onnx
+  y est retombé sur torch, les résultats fp32 ne sont pas mis en cache
+  sous le nom du moteur demandé.
+
+Les processus sont démarrés en mode "spawn" (un fork après le chargement
+de PyTorch peut bloquer) au premier lot, puis gardés jusqu'à la fin du
+programme. Chacun réimporte le script principal : un point d'entrée ne doit
+rien lancer hors de `if __name__ == "__main__"` (voir
+send_daily_newsletter.py et interface.py).
+"""
+import os
+import atexit
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import List, Optional
+
+# Nombre de processus d'inférence (0 : modèles chargés dans le processus principal)
+WORKER_PROCESSES = int(os.getenv("NEXIS_WORKER_PROCESSES", "0"))
+# Threads PyTorch par processus (0 : cœurs disponibles / nombre de processus)
+WORKER_TORCH_THREADS = int(os.getenv("NEXIS_WORKER_TORCH_THREADS", "0"))
+# Textes envoyés ensemble à un processus
+WORKER_BATCH_SIZE = int(os.getenv("NEXIS_WORKER_BATCH_SIZE", "8"))
+# Un fork après le chargement de PyTorch peut bloquer : processus neufs
+START_METHOD = "spawn"
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+# Modèles du processus de travail (chargés par _init_worker)
+_analyzer = None
+_llm_processor = None
+# cache_id (sentiment, résumés) des modèles chargés dans les processus
+_cache_ids: Optional[tuple[str, str]] = None
+
+
+def torch_threads(processes: int) -> int:
+    """Threads PyTorch par processus, pour que l'ensemble n'excède pas les cœurs"""
+    if WORKER_TORCH_THREADS > 0:
+        return WORKER_TORCH_THREADS
+    return max(1, (os.cpu_count() or 1) // max(processes, 1))
+
+
+def _init_worker(threads: int):
+    """Initialiseur d'un processus : bride PyTorch puis charge les modèles une fois"""
+    global _analyzer, _llm_processor
+    # Lu par les bibliothèques de calcul (OpenMP, MKL) à leur chargement
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+    os.environ["MKL_NUM_THREADS"] = str(threads)
+    import torch
+    torch.set_num_threads(threads)
+    torch.set_num_interop_threads(1)
+
+    from src.services.sentiment_analyzer import SentimentAnalyzer
+    from src.services.llm_processor import LLMProcessor
+    _analyzer = SentimentAnalyzer()
+    _llm_processor = LLMProcessor()
+
+
+def _worker_cache_ids() -> tuple[str, str]:
+    """cache_id des modèles réellement chargés (moteur après un éventuel repli)"""
+    return _analyzer.cache_id, _llm_processor.cache_id
+
+
+def _sentiment_batch(texts: List[str]) -> List[tuple[float, str]]:
+    return _analyzer.analyze_batch(texts)
+
+
+def _analysis_batch(texts: List[str]):
+    # Un seul processus SpaCy : le parallélisme vient déjà du pool
+    return _llm_processor.analyze_many(texts, n_process=1)
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """Pool partagé, démarré au premier appel"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            processes = max(WORKER_PROCESSES, 1)
+            threads = torch_threads(processes)
+            print(f"⏳ Démarrage de {processes} processus d'inférence ({threads} thread(s) PyTorch chacun)...")
+            _pool = ProcessPoolExecutor(
+                max_workers=processes,
+                mp_context=get_context(START_METHOD),
+                initializer=_init_worker,
+                initargs=(threads,),
+            )
+            atexit.register(shutdown)
+        return _pool
+
+
+def shutdown():
+    """Arrête les processus d'inférence (appelé automatiquement en fin de programme)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
+
+def worker_cache_ids() -> tuple[str, str]:
+    """cache_id (sentiment, résumés) des processus d'inférence, demandés une fois au pool"""
+    global _cache_ids
+    if _cache_ids is None:
+        # Tous les processus chargent les mêmes modèles avec le même moteur
+        _cache_ids = get_pool().submit(_worker_cache_ids).result()
+    return _cache_ids
+
+
+def _map(fn, texts: List[str], batch_size: int) -> list:
+    """Répartit `texts` par paquets entre les processus ; résultats dans l'ordre"""
+    if not texts:
+        return []
+    chunks = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    return [result for chunk in get_pool().map(fn, chunks) for result in chunk]
+
+
+class PooledSentimentAnalyzer:
+    """SentimentAnalyzer exécuté dans le pool de processus (même interface)"""
+
+    def __init__(self, batch_size: int = WORKER_BATCH_SIZE):
+        self.batch_size = batch_size
+
+    @property
+    def cache_id(self) -> str:
+        return worker_cache_ids()[0]
+
+    def analyze(self, text: str) -> tuple[float, str]:
+        return self.analyze_batch([text])[0]
+
+    def analyze_batch(self, texts: List[str], batch_size: int = None) -> List[tuple[float, str]]:
+        return _map(_sentiment_batch, texts, batch_size or self.batch_size)
+
+
+class PooledLLMProcessor:
+    """LLMProcessor exécuté dans le pool de processus (même interface)"""
+
+    def __init__(self, batch_size: int = WORKER_BATCH_SIZE):
+        self.batch_size = batch_size
+
+    @property
+    def cache_id(self) -> str:
+        return worker_cache_ids()[1]
+
+    def analyze_content(self, text: str):
+        return self.analyze_many([text])[0]
+
+    def analyze_many(self, texts: List[str], batch_size: int = None, n_process: int = None) -> list:
+        return _map(_analysis_batch, texts, batch_size or self.batch_size)
@@ -0,0 +1,36 @@
+"""Compression des textes stockés : relecture avec chaque dictionnaire, entraînement"""
+import zlib
+import pytest
+from src.compression import (
+    CURRENT_DICTIONARY, DICTIONARIES, MAGIC, compress_text, decompress_text, train_dictionary,
+)
+
+TEXT = ("Le gouvernement a annoncé mardi une réforme des retraites, selon l'Agence "
+        "France-Presse, alors que l'opposition dénonce un passage en force.")
+
+
+@pytest.mark.parametrize("version", sorted(DICTIONARIES))
+def test_rows_written_with_any_dictionary_stay_readable(version):
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=DICTIONARIES[version])
+    stored = MAGIC + bytes([version]) + compressor.compress(TEXT.encode("utf-8")) + compressor.flush()
+    assert decompress_text(stored) == TEXT
+
+
+def test_new_rows_use_the_current_dictionary():
+    stored = compress_text(TEXT)
+    assert stored[len(MAGIC)] == CURRENT_DICTIONARY
+    assert decompress_text(stored) == TEXT
+    assert compress_text("court") == "court"
+
+
+def test_trained_dictionary_keeps_shared_phrases_last():
+    texts = [f"Article {i} : la réforme des retraites au Sénat, selon l'AFP." for i in range(5)]
+    base = b"BASE" * 100
+    zdict = train_dictionary(texts + ["Texte isolé sans rapport"], size=200, base=base)
+    trained = train_dictionary(texts, size=200)
+    # Suites communes à tous les textes, la plus rentable en dernier
+    assert trained.endswith("retraites au Sénat, selon".encode("utf-8"))
+    assert "isolé".encode("utf-8") not in zdict
+    # La place restante est complétée par la fin du dictionnaire précédent
+    assert len(zdict) == 200
+    assert zdict == base[-(200 - len(trained)):] + trained
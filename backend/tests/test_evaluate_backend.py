@@ -0,0 +1,21 @@
+"""Le moteur int8 reste dans les tolérances de parité face à fp32 sur le corpus versionné"""
+import pytest
+
+pytest.importorskip("transformers")
+pytest.importorskip("torch")
+pytest.importorskip("optimum")
+
+from evaluate_backend import (  # noqa: E402
+    DEFAULT_CORPUS, MIN_LABEL_AGREEMENT, MIN_SUMMARY_ROUGE, compare, in_process, load_corpus,
+)
+
+
+def test_int8_matches_fp32_on_evaluation_corpus():
+    texts = load_corpus(DEFAULT_CORPUS)
+    reference = in_process("torch", texts)
+    candidate = in_process("int8", texts)
+    assert candidate["backend"] == "int8", "moteur int8 indisponible (repli sur fp32)"
+
+    results = compare(reference, candidate)
+    assert results["label_agreement"] >= MIN_LABEL_AGREEMENT, results
+    assert results["summary_rouge1"] >= MIN_SUMMARY_ROUGE, results
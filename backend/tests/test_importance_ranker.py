@@ -0,0 +1,61 @@
+"""Seuls les classements Gemini complets sont mis en cache ; les sujets manquants sont redemandés"""
+import json
+import pytest
+
+pytest.importorskip("google.generativeai")
+
+from src.services.article_record import ArticleRecord  # noqa: E402
+from src.services.disk_cache import DiskCache  # noqa: E402
+from src.services.importance_ranker import ImportanceRanker  # noqa: E402
+
+TOP_N = 2
+
+
+class FakeGemini:
+    """Répond avec les classements donnés et garde les sujets demandés à chaque appel"""
+
+    def __init__(self, replies):
+        self.replies = replies
+        self.requested = []
+
+    def __call__(self, prompt, json_output=False):
+        topics = [line[4:] for line in prompt.splitlines() if line.startswith("### ")]
+        self.requested.append(topics)
+        return json.dumps({topic: self.replies[topic] for topic in topics if topic in self.replies})
+
+
+@pytest.fixture
+def ranker(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.services.importance_ranker.RANKING_LOG_PATH", "")
+    ranker = ImportanceRanker()
+    ranker.model = object()
+    ranker.cache = DiskCache("gemini_rankings", ttl=3600, max_entries=100, path=str(tmp_path / "cache.db"))
+    return ranker
+
+
+def _candidates():
+    return {
+        topic: [ArticleRecord(title=f"{topic} {i}", url=f"https://exemple.fr/{topic}/{i}", source="AFP",
+                              topic=topic) for i in range(4)]
+        for topic in ("sport", "tech", "politique")
+    }
+
+
+def test_only_complete_topics_are_cached_and_missing_ones_requested_again(ranker):
+    # tech est incomplet (1 numéro sur 2), politique absent de la réponse
+    ranker.generate = FakeGemini({"sport": [3, 1], "tech": [2]})
+    results = ranker.rank_topics(_candidates(), top_n=TOP_N)
+    assert [art.title for art in results["sport"]] == ["sport 2", "sport 0"]
+    # Le classement incomplet est complété par l'ordre d'arrivée (pas de repli configuré)
+    assert [art.title for art in results["tech"]] == ["tech 1", "tech 0"]
+    assert [art.title for art in results["politique"]] == ["politique 0", "politique 1"]
+
+    ranker.generate = gemini = FakeGemini({"tech": [4, 3], "politique": [1, 2]})
+    results = ranker.rank_topics(_candidates(), top_n=TOP_N)
+    assert gemini.requested == [["tech", "politique"]]
+    assert [art.title for art in results["sport"]] == ["sport 2", "sport 0"]
+    assert [art.title for art in results["tech"]] == ["tech 3", "tech 2"]
+
+    ranker.generate = gemini = FakeGemini({})
+    ranker.rank_topics(_candidates(), top_n=TOP_N)
+    assert gemini.requested == []
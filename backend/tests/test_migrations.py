@@ -0,0 +1,82 @@
+"""Les migrations amènent une base existante au schéma courant, avec ses index de lecture"""
+import pytest
+from sqlalchemy import text
+from src.compression import compress_text
+from src.database import create_db_engine
+from src.migrations import MIGRATIONS, READ_PATHS, current_version, migrate, query_plan, verify_query_plans
+
+# Schéma d'origine, tel que create_all le créait avant toute migration
+ORIGINAL_SCHEMA = [
+    """
+    CREATE TABLE articles (
+        id INTEGER PRIMARY KEY, title VARCHAR NOT NULL, url VARCHAR, source VARCHAR,
+        topic VARCHAR, published_date DATETIME, content TEXT, sentiment_score FLOAT,
+        sentiment_label VARCHAR, summary TEXT, reliability_score INTEGER,
+        source_count INTEGER, created_at DATETIME DEFAULT (CURRENT_TIMESTAMP)
+    )
+    """,
+    "CREATE INDEX ix_articles_id ON articles (id)",
+    "CREATE UNIQUE INDEX ix_articles_url ON articles (url)",
+    """
+    CREATE TABLE subscribers (
+        id INTEGER PRIMARY KEY, email VARCHAR NOT NULL, subscribed_at DATETIME,
+        is_active INTEGER
+    )
+    """,
+    "CREATE INDEX ix_subscribers_id ON subscribers (id)",
+    "CREATE UNIQUE INDEX ix_subscribers_email ON subscribers (email)",
+]
+
+
+@pytest.fixture
+def legacy_engine(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'nexis.db'}", pool_size=1, max_overflow=0)
+    with engine.begin() as conn:
+        for statement in ORIGINAL_SCHEMA:
+            conn.execute(text(statement))
+        for i in range(200):
+            conn.execute(
+                text(
+                    "INSERT INTO articles (title, url, topic, content, summary, sentiment_label) "
+                    "VALUES (:title, :url, :topic, :content, :summary, :label)"
+                ),
+                {
+                    "title": f"Article {i}", "url": f"https://exemple.fr/{i}",
+                    "topic": ("sport", "tech", "politique")[i % 3],
+                    "content": f"Contenu de l'article {i}. " * 10, "summary": f"Résumé {i}",
+                    "label": ("positif", "neutre", "négatif")[i % 3],
+                },
+            )
+        conn.execute(text("INSERT INTO subscribers (email, is_active) VALUES ('a@exemple.fr', 1)"))
+    yield engine
+    engine.dispose()
+
+
+def test_legacy_schema_scans_articles(legacy_engine):
+    # Sans migration, la vérification doit bien repérer les parcours complets
+    failures = verify_query_plans(legacy_engine)
+    assert "derniers articles" in failures
+    assert any(detail.startswith("SCAN articles") for detail in failures["derniers articles"])
+
+
+def test_migrate_brings_legacy_database_to_current_version(legacy_engine):
+    assert migrate(legacy_engine) == len(MIGRATIONS)
+    with legacy_engine.connect() as conn:
+        assert current_version(conn) == MIGRATIONS[-1][0]
+        # Contenu compressé par la migration 2, relu tel quel par nexis_inflate
+        stored, = conn.execute(text("SELECT content FROM articles WHERE url = 'https://exemple.fr/0'")).one()
+        assert stored == compress_text("Contenu de l'article 0. " * 10)
+        tables = {name for name, in conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'"))}
+        assert "inference_cache" not in tables
+    # Rejouer les migrations ne fait rien
+    assert migrate(legacy_engine) == 0
+
+
+@pytest.mark.parametrize("name", list(READ_PATHS))
+def test_hot_queries_use_an_index_after_migration(legacy_engine, name):
+    migrate(legacy_engine)
+    with legacy_engine.connect() as conn:
+        plan = query_plan(conn, READ_PATHS[name])
+    assert not any(detail.startswith(("SCAN articles", "SCAN subscribers")) and "INDEX" not in detail
+                   for detail in plan), plan
+    assert not any("TEMP B-TREE" in detail for detail in plan), plan
@@ -0,0 +1,30 @@
+"""Les fichiers de données sont les mêmes, qu'on lance depuis la racine ou depuis backend/"""
+import os
+import subprocess
+import sys
+import pytest
+from conftest import BACKEND_DIR
+
+ROOT_DIR = os.path.dirname(BACKEND_DIR)
+
+PRINT_PATHS = (
+    "from src.database import DATABASE_URL\n"
+    "from src.services.disk_cache import CACHE_PATH\n"
+    "print(DATABASE_URL)\n"
+    "print(CACHE_PATH)\n"
+)
+
+
+def _paths_from(cwd):
+    env = {k: v for k, v in os.environ.items() if not k.startswith("NEXIS_")}
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [BACKEND_DIR, env.get("PYTHONPATH")]))
+    output = subprocess.run([sys.executable, "-c", PRINT_PATHS], cwd=cwd, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return output.splitlines()
+
+
+@pytest.mark.parametrize("cwd", [ROOT_DIR, BACKEND_DIR])
+def test_default_paths_point_at_repository_root(cwd):
+    database_url, cache_path = _paths_from(cwd)
+    assert database_url == f"sqlite:///{os.path.join(ROOT_DIR, 'nexis.db')}"
+    assert cache_path == os.path.join(ROOT_DIR, "nexis_cache.db")
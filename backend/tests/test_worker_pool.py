@@ -0,0 +1,67 @@
+"""Les processus d'inférence (spawn) réimportent le script principal sans le relancer"""
+import os
+import sys
+import subprocess
+import textwrap
+import importlib.util
+import pytest
+from conftest import BACKEND_DIR
+
+ROOT_DIR = os.path.dirname(BACKEND_DIR)
+
+
+def _run(code: str, cwd, env: dict = None) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-c", code], cwd=cwd, capture_output=True, text=True, timeout=120,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [BACKEND_DIR, os.getenv("PYTHONPATH")])),
+             **(env or {})},
+    )
+
+
+def test_spawned_worker_only_reruns_unguarded_code(tmp_path):
+    marker = tmp_path / "marker.txt"
+    script = tmp_path / "entry.py"
+    script.write_text(textwrap.dedent(f"""
+        from concurrent.futures import ProcessPoolExecutor
+        from multiprocessing import get_context
+        from src.services import worker_pool
+
+        with open({str(marker)!r}, "a") as f:
+            f.write("import\\n")
+
+        def main():
+            with open({str(marker)!r}, "a") as f:
+                f.write("main\\n")
+            with ProcessPoolExecutor(1, mp_context=get_context(worker_pool.START_METHOD)) as pool:
+                pool.submit(abs, -1).result()
+
+        if __name__ == "__main__":
+            main()
+    """))
+    result = subprocess.run(
+        [sys.executable, str(script)], cwd=tmp_path, capture_output=True, text=True, timeout=120,
+        env={**os.environ, "PYTHONPATH": BACKEND_DIR},
+    )
+    assert result.returncode == 0, result.stderr
+    lines = marker.read_text().split()
+    # Le module est importé deux fois (parent + processus), main() une seule
+    assert lines.count("import") == 2
+    assert lines.count("main") == 1
+
+
+@pytest.mark.parametrize("entry_point, modules", [
+    ("send_daily_newsletter.py", ["resend"]),
+    ("interface.py", ["gradio", "plotly", "pandas", "dotenv"]),
+])
+def test_entry_point_import_has_no_side_effects(tmp_path, entry_point, modules):
+    for module in modules:
+        if importlib.util.find_spec(module) is None:
+            pytest.skip(f"{module} non installé")
+    database = tmp_path / "nexis.db"
+    # Ce que fait un processus spawn : exécuter le script sous le nom __mp_main__
+    code = f"import runpy; runpy.run_path({os.path.join(ROOT_DIR, entry_point)!r}, run_name='__mp_main__')"
+    result = _run(code, tmp_path, {"NEXIS_DATABASE_URL": f"sqlite:///{database}"})
+    assert result.returncode == 0, result.stderr
+    # Ni init_db, ni scraping, ni envoi : la base n'a jamais été ouverte
+    assert not database.exists()
+    assert "NEXUS" not in result.stdout
@@ -0,0 +1,68 @@
+"""
+Entraînement d'un nouveau dictionnaire de compression sur les articles stockés.
+
+Lit le titre, le contenu et le résumé des articles de nexis.db, construit un
+dictionnaire (src.compression.train_dictionary) et l'écrit sous le numéro
+suivant dans src/dictionaries/ : toutes les écritures suivantes l'utilisent,
+les lignes déjà compressées restent lisibles avec leur ancien dictionnaire.
+
+Les articles sont découpés en deux moitiés : le dictionnaire est entraîné
+sur la première, le gain affiché est mesuré sur la seconde (articles jamais
+vus), puis le dictionnaire écrit est entraîné sur l'ensemble. Il est
+complété par le dictionnaire courant tant qu'il reste de la place.
+
+Usage (depuis backend/) : python train_dictionary.py
+"""
+import os
+import zlib
+from src.compression import (
+    CURRENT_DICTIONARY, DICTIONARIES, DICTIONARY_DIR, MIN_LENGTH, train_dictionary,
+)
+
+
+def load_articles() -> list:
+    """Textes compressibles de chaque article (titre, contenu, résumé)"""
+    from src.database import session_scope
+    from src.models import Article
+    with session_scope() as db:
+        rows = db.query(Article.title, Article.content, Article.summary).order_by(Article.id).all()
+    return [[text for text in row if text and len(text.encode("utf-8")) >= MIN_LENGTH] for row in rows]
+
+
+def compressed_size(texts: list, zdict: bytes) -> int:
+    total = 0
+    for text in texts:
+        compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=zdict)
+        total += len(compressor.compress(text.encode("utf-8")) + compressor.flush())
+    return total
+
+
+def main():
+    articles = load_articles()
+    if len(articles) < 10:
+        print(f"❌ Trop peu d'articles pour entraîner un dictionnaire ({len(articles)})")
+        return
+
+    # Le contenu et le résumé d'un article se recoupent : on sépare par article
+    train = [text for row in articles[::2] for text in row]
+    held_out = [text for row in articles[1::2] for text in row]
+    base = DICTIONARIES[CURRENT_DICTIONARY]
+    raw = sum(len(text.encode("utf-8")) for text in held_out)
+    current = compressed_size(held_out, base)
+    trained = compressed_size(held_out, train_dictionary(train, base=base))
+    print(f"📊 {len(held_out)} textes de test, {raw} octets bruts")
+    print(f"   dictionnaire n°{CURRENT_DICTIONARY} : {current} octets ({current / raw:.0%})")
+    print(f"   dictionnaire entraîné : {trained} octets ({trained / raw:.0%})")
+
+    texts = [text for row in articles for text in row]
+    zdict = train_dictionary(texts, base=base)
+    version = CURRENT_DICTIONARY + 1
+    os.makedirs(DICTIONARY_DIR, exist_ok=True)
+    path = os.path.join(DICTIONARY_DIR, f"nexis-{version}.zdict")
+    with open(path, "wb") as f:
+        f.write(zdict)
+    print(f"✅ Dictionnaire n°{version} ({len(zdict)} octets, {len(texts)} textes) écrit dans {path}")
+
+
+if __name__ == "__main__":
+    main()
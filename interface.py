@@ -14,15 +14,16 @@ from dotenv import load_dotenv
 from src.services.scraper import RSSScraper
 from src.services.email_service import EmailService
 from src.services.subscription_service import SubscriptionService
-from src.database import SessionLocal, init_db
-from src.models import Article
+from src.services import model_registry
+from src.services import search_service
+from src.services import stats_service
+from src.services import article_queries
+from src.services import archive_service
+from src.database import session_scope, init_db
 
 # Charger les variables d'environnement
 load_dotenv('backend/.env')
 
-# Initialiser la base de données
-init_db()
-
 # Variables globales
 LAST_SEARCH_RESULTS = []
 
@@ -40,6 +41,13 @@ def search_articles(query: str) -> str:
     try:
         scraper = RSSScraper(max_articles_per_topic=10)
         articles = scraper.scrape_topic("sport", query=query.strip())
+        header = f"**{len(articles)} articles trouvés pour '{query}'**\n\n"
+        
+        # Si aucun nouvel article, recherche plein texte dans la base
+        if not articles:
+            with session_scope() as db:
+                articles = search_service.search_articles(db, query.strip(), limit=10)
+            header = f"**{len(articles)} article(s) trouvé(s) en base pour '{query}'**\n\n"
         
         LAST_SEARCH_RESULTS = articles
         
@@ -47,7 +55,7 @@ def search_articles(query: str) -> str:
             return f"Aucun article trouvé pour '{query}'"
         
         # Formatage des résultats
-        result = f"**{len(articles)} articles trouvés pour '{query}'**\n\n"
+        result = header
         
         for i, art in enumerate(articles, 1):
             emoji = {"positif": "😊", "négatif": "😞", "neutre": "😐"}.get(art.sentiment_label.lower(), "📰")
@@ -107,9 +115,8 @@ def send_newsletter() -> str:
         if LAST_SEARCH_RESULTS:
             articles = LAST_SEARCH_RESULTS
         else:
-            db = SessionLocal()
-            articles = db.query(Article).order_by(Article.created_at.desc()).limit(10).all()
-            db.close()
+            with session_scope() as db:
+                articles = article_queries.latest_articles(db, limit=10)
         
         if not articles:
             return "Aucun article disponible à envoyer"
@@ -137,9 +144,17 @@ Abonnés qui ont reçu la newsletter:
 def get_latest_articles(limit: int = 10) -> str:
     """Récupère les derniers articles stockés"""
     try:
-        db = SessionLocal()
-        articles = db.query(Article).order_by(Article.created_at.desc()).limit(limit).all()
-        db.close()
+        limit = int(limit)
+        with session_scope() as db:
+            articles = article_queries.latest_articles(db, limit=limit)
+
+        # Base chaude trop courte (anciens articles archivés) : on complète avec les archives
+        months = archive_service.archive_months()
+        if len(articles) < limit and months:
+            oldest = min((art.created_at for art in articles), default=datetime.now())
+            articles += archive_service.articles_between(
+                datetime.strptime(months[0], "%Y-%m"), oldest, limit=limit - len(articles), hot=False
+            )
         
         if not articles:
             return "Aucun article en base de données\nFaites une recherche pour commencer"
@@ -160,22 +175,17 @@ def get_latest_articles(limit: int = 10) -> str:
 def get_statistics() -> tuple:
     """Génère les statistiques et graphiques"""
     try:
-        db = SessionLocal()
-        articles = db.query(Article).all()
-        db.close()
+        # Agrégats calculés en SQL sur la table de cumuls
+        with session_scope() as db:
+            stats = stats_service.get_statistics(db, top_sources=10)
         
-        if not articles:
+        total = stats["total"]
+        if not total:
             return "Aucune donnée disponible", None, None
         
         # Stats textuelles
-        total = len(articles)
-        sentiments = {}
-        sources = {}
-        
-        for art in articles:
-            sent = art.sentiment_label.lower()
-            sentiments[sent] = sentiments.get(sent, 0) + 1
-            sources[art.source] = sources.get(art.source, 0) + 1
+        sentiments = stats["sentiments"]
+        top_sources = stats["sources"]
         
         stats_text = f"**STATISTIQUES NEXUS**\n\n"
         stats_text += f"Total articles: **{total}**\n\n"
@@ -184,7 +194,7 @@ def get_statistics() -> tuple:
         stats_text += f"Neutre: {sentiments.get('neutre', 0)} ({sentiments.get('neutre', 0)/total*100:.1f}%)\n"
         stats_text += f"Négatif: {sentiments.get('négatif', 0)} ({sentiments.get('négatif', 0)/total*100:.1f}%)\n\n"
         stats_text += f"**Top 5 sources:**\n"
-        for source, count in sorted(sources.items(), key=lambda x: x[1], reverse=True)[:5]:
+        for source, count in top_sources[:5]:
             stats_text += f"{source}: {count} articles\n"
         
         # Graphique sentiments
@@ -200,7 +210,6 @@ def get_statistics() -> tuple:
         )
         
         # Graphique sources
-        top_sources = sorted(sources.items(), key=lambda x: x[1], reverse=True)[:10]
         fig_sources = go.Figure(data=[go.Bar(
             x=[s[0] for s in top_sources],
             y=[s[1] for s in top_sources],
@@ -455,6 +464,12 @@ def create_interface():
 # ═══════════════════════════════════════════════════════════════
 
 if __name__ == "__main__":
+    # Démarrage sous __main__ seulement : les processus d'inférence (mode
+    # "spawn", voir worker_pool) réimportent ce module sans rien lancer
+    init_db()
+    # Charger BERT, BART et SpaCy en arrière-plan pendant que l'interface démarre
+    model_registry.prewarm()
+
     print("Lancement de l'interface Nexus...")
     print(f"NewsAPI: {'Configuré' if os.getenv('NEWSAPI_KEY') else 'Non configuré'}")
     print(f"Resend: {'Configuré' if os.getenv('RESEND_API_KEY') else 'Non configuré'}")
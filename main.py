@@ -11,8 +11,10 @@ load_dotenv('backend/.env')
 
 from src.services.scraper import RSSScraper
 from src.services.email_service import EmailService
-from src.database import init_db, SessionLocal
-from src.models import Article
+from src.services import model_registry
+from src.services.enrichment_service import enrich_pending
+from src.services import search_service
+from src.database import init_db, session_scope
 
 from rich.console import Console
 from rich.panel import Panel
@@ -79,17 +81,13 @@ def run_search(query: str):
     # 2. Si aucun nouveau, chercher dans la base
     if not new_articles:
         print("📭 Aucun nouvel article, recherche dans la base...")
-        db = SessionLocal()
-        
-        # Recherche en base avec le mot-clé
-        existing_articles = db.query(Article).filter(
-            Article.title.contains(query) | Article.content.contains(query)
-        ).order_by(Article.created_at.desc()).limit(10).all()
-        
-        db.close()
+        with session_scope() as db:
+            # Recherche plein texte en base (FTS5, classée par pertinence)
+            existing_articles = search_service.search_articles(db, query, limit=10)
         
         if existing_articles:
             print(f"📚 {len(existing_articles)} article(s) trouvé(s) en base\n")
+            enrich_pending(existing_articles)
             display_articles(existing_articles)
             LAST_SEARCH_RESULTS = existing_articles  # ← Plus de global ici
             return
@@ -137,9 +135,10 @@ def run_full_cycle():
     topics = ["économie", "climat", "politique", "géopolitique", "sport"]
     all_articles = []
     
-    for topic in topics:
-        console.print(f"   📡 {topic}...")
-        arts = scraper.scrape_topic(topic)
+    # Tous les sujets sont interrogés en parallèle, analysés à l'arrivée
+    console.print(f"   📡 {', '.join(topics)}...")
+    for topic, arts in scraper.scrape_topics(topics).items():
+        console.print(f"   ✅ {topic} : {len(arts)} article(s)")
         all_articles.extend(arts)
     
     LAST_SEARCH_RESULTS = all_articles
@@ -148,6 +147,8 @@ def run_full_cycle():
 def main():
     print_banner()
     init_db()
+    # Les modèles se chargent pendant que l'utilisateur tape sa commande
+    model_registry.prewarm()
     
     while True:
         console.print("\n[bold cyan]Nexus >[/bold cyan] ", end="")
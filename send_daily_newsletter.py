@@ -6,6 +6,7 @@ Script pour envoyer la newsletter quotidienne à tous les abonnés
 
 import sys
 import os
+import atexit
 
 # Ajout du chemin backend
 sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
@@ -13,92 +14,114 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'backend'))
 from src.services.subscription_service import SubscriptionService
 from src.services.email_service import EmailService
 from src.services.scraper import RSSScraper
-from src.database import SessionLocal
-from src.models import Article
-
-print("=" * 60)
-print("🤖 NEXUS - Envoi quotidien de la newsletter")
-print("=" * 60)
-print()
-
-# ═══════════════════════════════════════════════════════════════
-# 1. RÉCUPÉRER LES ABONNÉS
-# ═══════════════════════════════════════════════════════════════
-print("📧 Récupération des abonnés...")
-sub_service = SubscriptionService()
-subscribers = sub_service.get_active_subscribers()
-
-if not subscribers:
-    print("❌ Aucun abonné actif")
-    print("✅ Script terminé")
-    sys.exit(0)
-
-print(f"✅ {len(subscribers)} abonné(s) actif(s) :")
-for sub in subscribers:
-    print(f"   📧 {sub.email}")
-print()
-
-# ═══════════════════════════════════════════════════════════════
-# 2. SCRAPER LES DERNIERS ARTICLES
-# ═══════════════════════════════════════════════════════════════
-print("🔍 Scraping des derniers articles...")
-scraper = RSSScraper(max_articles_per_topic=10)
-
-topics = ["économie", "politique", "sport", "climat"]
-all_articles = []
-
-for topic in topics:
-    try:
-        print(f"   📰 {topic}...", end=" ")
-        articles = scraper.scrape_topic(topic)
-        all_articles.extend(articles)
-        print(f"✅ {len(articles)} trouvé(s)")
-    except Exception as e:
-        print(f"❌ Erreur: {e}")
-
-print(f"📊 Total brut : {len(all_articles)} articles")
-print()
-
-# ═══════════════════════════════════════════════════════════════
-# 3. FALLBACK : SI PEU D'ARTICLES, PRENDRE DEPUIS LA DB
-# ═══════════════════════════════════════════════════════════════
-if len(all_articles) < 5:
-    print("⚠️ Peu d'articles scrapés, récupération depuis la DB...")
-    db = SessionLocal()
-    all_articles = db.query(Article).order_by(Article.created_at.desc()).limit(10).all()
-    db.close()
-    print(f"✅ {len(all_articles)} articles récupérés depuis la DB")
-    print()
+from src.services.article_queries import latest_articles
+from src.services.archive_service import archive_old_articles
+from src.database import session_scope, init_db, close_db
 
-# ═══════════════════════════════════════════════════════════════
-# 4. ENVOYER À TOUS LES ABONNÉS
-# ═══════════════════════════════════════════════════════════════
-print("📧 Envoi de la newsletter...")
-email_service = EmailService()
-destinataires = [sub.email for sub in subscribers]
-
-try:
-    email_service.send_daily_newsletter(
-        destinataires=destinataires,
-        specific_articles=all_articles
-    )
-    
-    print()
+
+def main():
+    """
+    Flux quotidien complet. Appelé uniquement sous `__main__` : les
+    processus d'inférence (mode "spawn", voir worker_pool) réimportent ce
+    script et ne doivent ni scraper ni envoyer d'emails.
+    """
     print("=" * 60)
-    print("✅ NEWSLETTER ENVOYÉE AVEC SUCCÈS !")
+    print("🤖 NEXUS - Envoi quotidien de la newsletter")
     print("=" * 60)
     print()
-    print(f"📧 {len(destinataires)} destinataire(s) :")
-    for email in destinataires:
-        print(f"   ✉️  {email}")
-    print()
-    print(f"📰 {len(all_articles)} article(s) inclus")
+
+    # Crée les tables manquantes et applique les migrations de la base versionnée,
+    # sans l'index plein texte (reconstruit par l'interface)
+    init_db(search_index=False)
+    # En fin de script (même sur sys.exit), le journal WAL est reporté dans
+    # nexis.db, seul fichier versionné par le workflow
+    atexit.register(close_db)
+
+    # ═══════════════════════════════════════════════════════════════
+    # 1. RÉCUPÉRER LES ABONNÉS
+    # ═══════════════════════════════════════════════════════════════
+    print("📧 Récupération des abonnés...")
+    sub_service = SubscriptionService()
+    subscribers = sub_service.get_active_subscribers()
+
+    if not subscribers:
+        print("❌ Aucun abonné actif")
+        print("✅ Script terminé")
+        sys.exit(0)
+
+    print(f"✅ {len(subscribers)} abonné(s) actif(s) :")
+    for sub in subscribers:
+        print(f"   📧 {sub.email}")
     print()
-    
-except Exception as e:
+
+    # ═══════════════════════════════════════════════════════════════
+    # 2. SCRAPER LES DERNIERS ARTICLES
+    # ═══════════════════════════════════════════════════════════════
+    print("🔍 Scraping des derniers articles...")
+    scraper = RSSScraper(max_articles_per_topic=10)
+
+    topics = ["économie", "politique", "sport", "climat"]
+    all_articles = []
+
+    # Appels NewsAPI en parallèle ; une erreur sur un sujet n'arrête pas les autres
+    for topic, articles in scraper.scrape_topics(topics).items():
+        print(f"   📰 {topic}... ✅ {len(articles)} trouvé(s)")
+        all_articles.extend(articles)
+
+    print(f"📊 Total brut : {len(all_articles)} articles")
+    # Cascade de sentiment (NEXIS_SENTIMENT_CASCADE=1) : part des appels BERT évités
+    if hasattr(scraper.analyzer, "hit_rate"):
+        print(f"⚡ Cascade sentiment : {scraper.analyzer.hit_rate():.0%} des textes tranchés par le lexique")
     print()
-    print("=" * 60)
-    print("❌ ERREUR LORS DE L'ENVOI")
-    print("=" * 60)
-    print(f"Erreur : {e}")
-    sys.exit(1)
+
+    # ═══════════════════════════════════════════════════════════════
+    # 3. FALLBACK : SI PEU D'ARTICLES, PRENDRE DEPUIS LA DB
+    # ═══════════════════════════════════════════════════════════════
+    if len(all_articles) < 5:
+        print("⚠️ Peu d'articles scrapés, récupération depuis la DB...")
+        with session_scope() as db:
+            all_articles = latest_articles(db, limit=10)
+        print(f"✅ {len(all_articles)} articles récupérés depuis la DB")
+        print()
+
+    # ═══════════════════════════════════════════════════════════════
+    # 4. ENVOYER À TOUS LES ABONNÉS
+    # ═══════════════════════════════════════════════════════════════
+    print("📧 Envoi de la newsletter...")
+    email_service = EmailService()
+    destinataires = [sub.email for sub in subscribers]
+
+    try:
+        email_service.send_daily_newsletter(
+            destinataires=destinataires,
+            specific_articles=all_articles
+        )
+
+        print()
+        print("=" * 60)
+        print("✅ NEWSLETTER ENVOYÉE AVEC SUCCÈS !")
+        print("=" * 60)
+        print()
+        print(f"📧 {len(destinataires)} destinataire(s) :")
+        for email in destinataires:
+            print(f"   ✉️  {email}")
+        print()
+        print(f"📰 {len(all_articles)} article(s) inclus")
+        print()
+
+    except Exception as e:
+        print()
+        print("=" * 60)
+        print("❌ ERREUR LORS DE L'ENVOI")
+        print("=" * 60)
+        print(f"Erreur : {e}")
+        sys.exit(1)
+
+    # ═══════════════════════════════════════════════════════════════
+    # 5. ARCHIVER LES ANCIENS ARTICLES (garde nexis.db petite)
+    # ═══════════════════════════════════════════════════════════════
+    archive_old_articles()
+
+
+if __name__ == "__main__":
+    main()